@@ -2,7 +2,12 @@
 from flask import Flask
 from app.config import config
 # Importamos desde extensiones (NO CREAR AQUÍ)
-from app.extensions import db, migrate, ma, cors
+from app.extensions import db, migrate, ma, cors, cache, replicas, cache_dni, mapa_distritos
+from app.utils.json_provider import FastJSONProvider
+from app.utils.compression import registrar_compresion
+from app.utils.profiling import registrar_profiling
+from app.utils.metrics import registrar_metricas
+from app.utils.slow_queries import registrar_queries_lentas
 
 def create_app(config_name='default'):
     app = Flask(__name__)
@@ -11,17 +16,40 @@ def create_app(config_name='default'):
     app.config.from_object(config[config_name])
     config[config_name].init_app(app)
     
+    # Encoder JSON rápido (orjson/ujson si están instalados)
+    app.json = FastJSONProvider(app)
+    
+    # Perfilado por request (Server-Timing + log + /api/debug/slow) si PROFILING_ENABLED
+    # Va ANTES de la compresión: su after_request corre al final y ve el tamaño real
+    registrar_profiling(app)
+    
+    # Radar de queries lentas (+ EXPLAIN opcional), consultable en /api/admin/slow-queries
+    registrar_queries_lentas(app)
+    
+    # Métricas Prometheus: conteo y latencia por ruta (expuestas en /metrics)
+    registrar_metricas(app)
+    
+    # Compresión gzip/br + ETag/304 para las respuestas repetidas del Frontend
+    registrar_compresion(app)
+    
     # 2. Inicializar Extensiones
     db.init_app(app)
     migrate.init_app(app, db)
     ma.init_app(app)
     cors.init_app(app)
+    cache.init_app(app)
+    replicas.init_app(app)
+    cache_dni.init_app(app)
+    mapa_distritos.init_app(app)
     
     # 3. Registrar Rutas
     try:
         from app.routes.health import health_bp
         app.register_blueprint(health_bp, url_prefix='/api')
         
+        from app.routes.metrics import metrics_bp
+        app.register_blueprint(metrics_bp)
+        
         from app.routes.pacientes import pacientes_bp
         app.register_blueprint(pacientes_bp, url_prefix='/api/v1')
         
@@ -34,9 +62,25 @@ def create_app(config_name='default'):
         from app.routes.consultas import consultas_bp
         app.register_blueprint(consultas_bp, url_prefix='/api/v1')
         
+        from app.routes.stats import stats_bp
+        app.register_blueprint(stats_bp, url_prefix='/api/v1')
+        
+        # Sin autenticación: solo en DEBUG
+        if app.config.get('SLOW_QUERY_ENABLED') and app.debug:
+            from app.routes.admin import admin_bp
+            app.register_blueprint(admin_bp, url_prefix='/api/admin')
+        
+        if app.config.get('PROFILING_ENABLED'):
+            from app.routes.debug import debug_bp
+            app.register_blueprint(debug_bp, url_prefix='/api')
+        
     except Exception as e:
         print(f"⚠️ Error cargando rutas: {e}")
 
+    # 4. Registrar Comandos CLI (Trabajos Programados)
+    from app.commands import register_commands
+    register_commands(app)
+
     # ¡¡¡ AQUÍ NO DEBE HABER NADA MÁS !!! 
     # NADA DE app.schemas = ...
     # NADA DE import schemas...
@@ -0,0 +1,291 @@
+# src/clinica_backend/app/asgi.py
+"""
+CAPA ASYNC DE LECTURAS (La Ventanilla Rápida)
+
+Con gunicorn cada worker síncrono atiende UN request a la vez: en hora pico
+los GET del catálogo, el buscador de pacientes y el Kardex se quedan en cola
+esperando a la base de datos.
+
+Esta app ASGI atiende esas lecturas con `async/await` (asyncpg + pool async):
+mientras una espera a PostgreSQL, el mismo proceso sigue atendiendo otras.
+TODO lo demás (escrituras, admin, /metrics, exportaciones) pasa tal cual a la
+app Flask de siempre a través de `WsgiToAsgi`.
+
+    uvicorn asgi:app --workers 4           (ver asgi.py en la raíz)
+
+Rutas async (mismo JSON que sus gemelas Flask, mismos schemas y Services):
+    GET /api/health, /api/health/db
+    GET /api/v1/marcas, /api/v1/productos, /api/v1/servicios
+    GET /api/v1/pacientes
+    GET /api/v1/kardex/<id_producto>/rango
+
+Diferencias con el camino Flask:
+    - Sin compresión ni ETag (si hacen falta, los pone el proxy: nginx gzip).
+    - Si el cliente trae la cookie `leer_primario` (acaba de escribir), su GET
+      se manda a Flask para leer del primario (ver app/utils/replicas.py);
+      importa cuando ASYNC_DATABASE_URL apunta a una réplica.
+    - El mapa de distritos (app/utils/distritos.py) se carga en el arranque, y
+      cuando vence (TTL, invalidación o id desconocido) el listado de pacientes
+      lo recarga en un hilo: la query síncrona nunca corre en el event loop.
+"""
+
+import asyncio
+import logging
+from datetime import date
+from urllib.parse import parse_qsl
+
+from asgiref.wsgi import WsgiToAsgi
+from werkzeug.datastructures import MultiDict
+from werkzeug.exceptions import HTTPException
+from werkzeug.http import parse_cookie
+from werkzeug.routing import Map, Rule
+
+from app.extensions import cache, mapa_distritos, replicas
+from app.routes.pacientes import leer_filtros_listado
+from app.schemas.catalogo_schema import MarcaSchema, ProductoSchema, ServicioSchema
+from app.schemas.inventario_schema import MovimientoKardexSchema
+from app.schemas.paciente_schema import PacienteListadoSerializer
+from app.services.catalogo_service import CatalogoService
+from app.services.lecturas_async import LecturasAsyncService
+from app.utils.async_db import BaseDatosAsync
+from app.utils.metrics import contar_error
+from app.utils.replicas import COOKIE_PRIMARIO
+
+logger = logging.getLogger('app.asgi')
+
+# Mismas instancias que usan las rutas Flask
+marcas_list_schema = MarcaSchema(many=True)
+productos_list_schema = ProductoSchema(many=True)
+servicios_list_schema = ServicioSchema(many=True)
+kardex_list_schema = MovimientoKardexSchema(many=True)
+
+RUTAS_ASYNC = Map([
+    Rule('/api/health', endpoint='health', methods=['GET']),
+    Rule('/api/health/db', endpoint='health_db', methods=['GET']),
+    Rule('/api/v1/marcas', endpoint='marcas', methods=['GET']),
+    Rule('/api/v1/productos', endpoint='productos', methods=['GET']),
+    Rule('/api/v1/servicios', endpoint='servicios', methods=['GET']),
+    Rule('/api/v1/pacientes', endpoint='pacientes', methods=['GET']),
+    Rule('/api/v1/kardex/<int:id_producto>/rango', endpoint='kardex_rango', methods=['GET']),
+])
+
+
+class ErrorAPI(Exception):
+    """Error con el formato de APIResponse.error."""
+
+    def __init__(self, message, status_code=400, code="GENERIC_ERROR"):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+        self.code = code
+
+
+# ============================================================================
+# HANDLERS (equivalentes async de las rutas GET)
+# ============================================================================
+
+async def _health(api, args, sesion):
+    return {'status': 'healthy', 'service': "Clinica Prime API", 'version': '1.0.0'}
+
+
+async def _health_db(api, args, sesion):
+    try:
+        await api.db.ping()
+    except Exception as e:
+        raise ErrorAPI(str(e), 503, "DB_CONNECTION_ERROR")
+    return {
+        'status': 'healthy',
+        'database': 'connected',
+        'replicas': replicas.estado(),
+        'mapa_distritos': mapa_distritos.estado(),
+        'pool_async': api.db.engine.pool.status()
+    }
+
+
+async def _marcas(api, args, sesion):
+    # Misma clave que la ruta Flask: un POST en Flask invalida ambos caminos
+    async def fabrica():
+        return marcas_list_schema.dump(await LecturasAsyncService.listar_marcas(sesion))
+    return await cache.get_or_set_async(CatalogoService.CACHE_MARCAS, fabrica)
+
+
+async def _productos(api, args, sesion):
+    async def fabrica():
+        return productos_list_schema.dump(await LecturasAsyncService.listar_productos(sesion))
+    return await cache.get_or_set_async(CatalogoService.CACHE_PRODUCTOS, fabrica)
+
+
+async def _servicios(api, args, sesion):
+    async def fabrica():
+        return servicios_list_schema.dump(await LecturasAsyncService.listar_servicios(sesion))
+    return await cache.get_or_set_async(CatalogoService.CACHE_SERVICIOS, fabrica)
+
+
+async def _pacientes(api, args, sesion):
+    try:
+        resultado = await LecturasAsyncService.listar_pacientes_filas(
+            sesion,
+            page=args.get('page', 1, type=int),
+            per_page=args.get('per_page', 20, type=int),
+            orden=args.get('orden', 'nombre', type=str),
+            **leer_filtros_listado(args)
+        )
+    except ValueError as e:
+        # Orden o alerta desconocidos
+        raise ErrorAPI(str(e), 400)
+
+    # Mapa de distritos vencido → se recarga en un hilo (la lectura es síncrona)
+    if mapa_distritos.necesita_recarga(PacienteListadoSerializer.ids_distrito(resultado['items'])):
+        nombres = await asyncio.to_thread(mapa_distritos.recargar)
+    else:
+        nombres = mapa_distritos.datos
+    return {
+        'items': PacienteListadoSerializer.dump(resultado['items'], nombres),
+        'pagination': {
+            'total': resultado['total'],
+            'page': resultado['page'],
+            'pages': resultado['pages'],
+            'per_page': resultado['per_page']
+        }
+    }
+
+
+async def _kardex_rango(api, args, sesion, id_producto):
+    try:
+        producto = await LecturasAsyncService.obtener_resumen_producto(sesion, id_producto)
+        resultado = await LecturasAsyncService.obtener_kardex_rango(
+            sesion,
+            id_producto,
+            desde=args.get('desde', None, type=date.fromisoformat),
+            hasta=args.get('hasta', None, type=date.fromisoformat),
+            cursor=args.get('cursor', None, type=str),
+            limit=max(1, min(args.get('limit', 50, type=int), 500))
+        )
+    except ValueError as e:
+        # Producto inexistente o cursor manipulado
+        raise ErrorAPI(str(e), 400)
+    return {
+        'producto': producto,
+        'items': kardex_list_schema.dump(resultado['items']),
+        'pagination': {
+            'next_cursor': resultado['next_cursor'],
+            'limit': resultado['limit']
+        }
+    }
+
+
+HANDLERS = {
+    'health': _health,
+    'health_db': _health_db,
+    'marcas': _marcas,
+    'productos': _productos,
+    'servicios': _servicios,
+    'pacientes': _pacientes,
+    'kardex_rango': _kardex_rango,
+}
+
+# Estas no tocan la BD (o la tocan sin sesión ORM)
+SIN_SESION = {'health', 'health_db'}
+
+
+# ============================================================================
+# APP ASGI
+# ============================================================================
+
+class AsyncAPI:
+    """Atiende las lecturas de RUTAS_ASYNC; delega todo lo demás a Flask."""
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.wsgi = WsgiToAsgi(flask_app)
+        self.db = BaseDatosAsync()
+        self.rutas = RUTAS_ASYNC.bind('localhost')
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self._lifespan(receive, send)
+
+        if scope['type'] == 'http' and scope['method'] == 'GET':
+            ruta = self._resolver(scope)
+            if ruta is not None:
+                return await self._atender(scope, send, *ruta)
+
+        return await self.wsgi(scope, receive, send)
+
+    def _resolver(self, scope):
+        try:
+            endpoint, kwargs = self.rutas.match(scope['path'], method='GET')
+        except HTTPException:
+            return None
+        if self._pide_primario(scope):
+            return None
+        return endpoint, kwargs
+
+    @staticmethod
+    def _pide_primario(scope):
+        for nombre, valor in scope.get('headers', ()):
+            if nombre == b'cookie' and COOKIE_PRIMARIO in parse_cookie(valor.decode('latin-1')):
+                return True
+        return False
+
+    async def _atender(self, scope, send, endpoint, kwargs):
+        if not self.db.activa:
+            # Servidor sin soporte de lifespan: iniciamos en el primer request
+            self.db.iniciar(self.flask_app.config)
+
+        args = MultiDict(parse_qsl(scope.get('query_string', b'').decode('latin-1'), keep_blank_values=True))
+        handler = HANDLERS[endpoint]
+
+        try:
+            if endpoint in SIN_SESION:
+                data = await handler(self, args, None, **kwargs)
+            else:
+                async with self.db.sesiones() as sesion:
+                    data = await handler(self, args, sesion, **kwargs)
+            cuerpo, status = {"success": True, "message": "Successful operation", "data": data}, 200
+        except ErrorAPI as e:
+            cuerpo, status = self._error(e.message, e.status_code, e.code)
+        except Exception as e:
+            logger.exception(f"Error en ruta async {endpoint}")
+            cuerpo, status = self._error(str(e), 500, "GENERIC_ERROR")
+
+        await self._responder(send, cuerpo, status)
+
+    @staticmethod
+    def _error(message, status_code, code):
+        # Mismo formato y mismo contador que APIResponse.error
+        contar_error(code, status_code)
+        return {"success": False, "error": {"code": code, "message": message}}, status_code
+
+    async def _responder(self, send, cuerpo, status):
+        datos = self.flask_app.json.dumps(cuerpo).encode()
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [
+                (b'content-type', b'application/json'),
+                (b'content-length', str(len(datos)).encode()),
+            ]
+        })
+        await send({'type': 'http.response.body', 'body': datos})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            mensaje = await receive()
+            if mensaje['type'] == 'lifespan.startup':
+                try:
+                    self.db.iniciar(self.flask_app.config)
+                    mapa_distritos.recargar()
+                except Exception as e:
+                    await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                    return
+                await send({'type': 'lifespan.startup.complete'})
+            elif mensaje['type'] == 'lifespan.shutdown':
+                await self.db.cerrar()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+def crear_asgi(flask_app):
+    """Envuelve la app Flask (ya creada con create_app) en la capa async."""
+    return AsyncAPI(flask_app)
@@ -0,0 +1,50 @@
+# src/clinica_backend/app/commands.py
+"""
+COMANDOS CLI (Los Trabajos Programados)
+
+Se ejecutan con el CLI de Flask, fuera del ciclo Request/Response:
+    flask --app run inventario snapshots
+
+Pensados para correr desde cron (o cualquier scheduler), por ejemplo cada noche:
+    0 3 * * *  cd /srv/clinica_backend && flask --app run inventario snapshots
+    */15 * * * *  cd /srv/clinica_backend && flask --app run stats refrescar
+"""
+
+import click
+from flask.cli import AppGroup
+
+from app.services.inventario_service import InventarioService
+from app.services.stats_service import StatsService
+
+# Grupo `flask inventario ...`
+inventario_cli = AppGroup('inventario', help='Tareas de mantenimiento del Inventario.')
+
+
+@inventario_cli.command('snapshots')
+def generar_snapshots():
+    """Compacta el Kardex: crea un snapshot por producto con movimientos nuevos."""
+    creados = InventarioService.generar_snapshots()
+    click.echo(f"Snapshots de stock creados: {creados}")
+
+
+# Grupo `flask stats ...`
+stats_cli = AppGroup('stats', help='Vistas materializadas del dashboard.')
+
+
+@stats_cli.command('refrescar')
+@click.option('--forzar', is_flag=True, help='Refresca todas aunque sus tablas no hayan cambiado.')
+@click.option('--max-edad-horas', default=24, show_default=True,
+              help='Refresca igual las vistas más viejas que esto.')
+def refrescar_estadisticas(forzar, max_edad_horas):
+    """Refresca las vistas de /api/v1/stats cuyas tablas fuente cambiaron."""
+    for fila in StatsService.refrescar(forzar=forzar, max_edad_horas=max_edad_horas):
+        if fila['refrescada']:
+            click.echo(f"{fila['vista']}: refrescada en {fila['duracion_ms']} ms")
+        else:
+            click.echo(f"{fila['vista']}: sin cambios")
+
+
+def register_commands(app):
+    """Registra todos los grupos de comandos en la app (lo llama create_app)."""
+    app.cli.add_command(inventario_cli)
+    app.cli.add_command(stats_cli)
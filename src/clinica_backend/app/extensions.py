@@ -12,10 +12,16 @@ from flask_marshmallow import Marshmallow
 from flask_migrate import Migrate
 from flask_cors import CORS
 
+from app.utils.cache import Cache
+from app.utils.dni_cache import CacheDNI
+from app.utils.distritos import MapaDistritos
+from app.utils.replicas import EnrutadorReplicas, RoutingSession
+
 # 1. EL GESTOR DE BASE DE DATOS (SQLAlchemy)
 # Es el traductor. Tú hablas Python, la base de datos habla SQL.
 # Él traduce tus objetos (Pacientes) a tablas y filas.
-db = SQLAlchemy()
+# Usa RoutingSession: las rutas GET marcadas con @usar_replica leen de una réplica
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 # 2. EL TRADUCTOR DE JSON (Marshmallow)
 # Es el "Portero".
@@ -32,4 +38,24 @@ migrate = Migrate()
 # Cross-Origin Resource Sharing.
 # Por defecto, los navegadores bloquean que una web (React) hable con un servidor (Flask)
 # si están en puertos diferentes. Esto da permiso para que hablen.
-cors = CORS()
\ No newline at end of file
+cors = CORS()
+
+# 5. LA MEMORIA DE CORTO PLAZO (Caché)
+# Guarda lecturas que casi no cambian (el catálogo) para no ir a la BD en cada request.
+# Backend en memoria por defecto; Redis si CACHE_BACKEND = 'redis'.
+cache = Cache()
+
+# 6. EL DESVÍO DE TRÁFICO (Réplicas de lectura)
+# Reparte las lecturas entre las réplicas configuradas (REPLICA_DATABASE_URLS).
+# Sin réplicas no hace nada: todo va al primario.
+replicas = EnrutadorReplicas()
+
+# 7. EL PADRÓN DE LA RECEPCIÓN (Caché de DNIs)
+# Recuerda qué DNIs existen (y cuáles NO) para no consultar la BD en cada registro.
+# Lo mantienen al día los hooks del modelo Paciente (app/models/paciente.py).
+cache_dni = CacheDNI()
+
+# 8. LA GUÍA DE CALLES (Mapa de distritos en memoria)
+# Copia versionada de la tabla `distritos`: validar y serializar sin ir a la BD.
+# Se recarga cuando cambia (hooks en app/models/distrito.py) o al vencer DISTRITOS_TTL.
+mapa_distritos = MapaDistritos()
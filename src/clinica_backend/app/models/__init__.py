@@ -22,4 +22,5 @@ from .paciente import Paciente
 from .marca import Marca
 from .producto import Producto
 from .servicio import Servicio
-from .consulta import Consulta, ConsultaServicio, ConsumoProducto
\ No newline at end of file
+from .consulta import Consulta, ConsultaServicio, ConsumoProducto
+from .inventario import MovimientoStock, SnapshotStock
\ No newline at end of file
@@ -7,8 +7,20 @@ Proporciona Métodos y Atributos Comunees de Serialización, Validación, etc.
 
 from app.extensions import db
 from datetime import datetime
+from functools import lru_cache
+from operator import attrgetter
+from flask import current_app
+from sqlalchemy import delete, event
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import SQLAlchemyError
 
+
+@lru_cache(maxsize=1024)
+def _camel(key):
+    """'nombre_completo' -> 'nombreCompleto' (se calcula UNA vez por key)."""
+    components = key.split('_')
+    return components[0] + ''.join(x.title() for x in components[1:])
+
 class BaseModel(db.Model):
     """
     Clase Abstracta base para todos los Modelos
@@ -56,6 +68,158 @@ class BaseModel(db.Model):
             db.session.rollback()
             raise e
     
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # CRUD EN LOTE (Cargas del ETL: pacientes, productos, catálogo)
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # `save()`/`delete()` hacen UN commit por fila: 10,000 filas = 10,000 transacciones.
+    # Estos métodos trabajan por bloques de `chunk_size` dentro de UNA sola transacción:
+    # si un bloque falla, se revierte TODO (Todo o Nada).
+    # Son SQL directo: no invalidan la caché del catálogo (eso lo hace el Service que los llame).
+    # `bulk_upsert`/`bulk_delete` tampoco disparan los hooks after_insert/update/delete del
+    # mapper: en su lugar llaman a `_tras_bulk` con las filas del RETURNING.
+    
+    # Columnas extra que `bulk_upsert`/`bulk_delete` devuelven para `_tras_bulk`
+    _retorno_bulk = ()
+    
+    @classmethod
+    def _tras_bulk(cls, operacion, filas):
+        """
+        Equivalente de los hooks del mapper para las sentencias Core de este bloque.
+        Los modelos con cachés en memoria (Paciente, Distrito) lo sobrescriben.
+        
+        Args:
+            operacion (str): 'upsert' o 'delete'
+            filas (list[Row]): (pk, *_retorno_bulk) de cada fila afectada
+        """
+    
+    @classmethod
+    def _pk(cls):
+        """Columna de la clave primaria (los modelos de la clínica usan una sola)."""
+        return cls.__mapper__.primary_key[0]
+    
+    @staticmethod
+    def _bloques(items, chunk_size=None):
+        tamano = chunk_size or current_app.config.get('BULK_CHUNK_SIZE', 1000)
+        items = list(items)
+        for inicio in range(0, len(items), tamano):
+            yield items[inicio:inicio + tamano]
+    
+    @classmethod
+    def bulk_save(cls, instances, chunk_size=None, commit=True):
+        """
+        Inserta/actualiza muchas instancias en una sola transacción.
+        
+        Un `flush()` por bloque: SQLAlchemy agrupa los INSERT en sentencias
+        multi-fila con RETURNING, así los IDs llegan sin un viaje por fila.
+        
+        Args:
+            instances (iterable): Objetos de esta clase (nuevos o existentes)
+            chunk_size (int): Filas por flush (None = BULK_CHUNK_SIZE)
+            commit (bool): False = el llamador confirma (para combinar con otras operaciones)
+        
+        Returns:
+            list: Claves primarias, en el mismo orden que `instances`
+        
+        Ejemplo:
+            ids = Paciente.bulk_save([Paciente(dni='12345678', ...), ...])
+        """
+        pk = cls._pk().key
+        ids = []
+        try:
+            for bloque in cls._bloques(instances, chunk_size):
+                db.session.add_all(bloque)
+                db.session.flush()
+                ids.extend(getattr(obj, pk) for obj in bloque)
+            if commit:
+                db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+        return ids
+    
+    @classmethod
+    def bulk_upsert(cls, rows, conflict_keys, update_columns=None, chunk_size=None, commit=True):
+        """
+        INSERT ... ON CONFLICT (conflict_keys) DO UPDATE, por bloques (solo PostgreSQL).
+        
+        Args:
+            rows (list[dict]): Filas con nombres de columna, ej: [{'dni': '123', 'telefono': '999'}]
+            conflict_keys (list[str]): Columnas con índice UNIQUE, ej: ['dni']
+            update_columns (list[str]): Columnas a sobrescribir si ya existe
+                (None = todas las de la fila menos conflict_keys y la PK;
+                 [] = DO NOTHING: las existentes no se tocan)
+            chunk_size (int): Filas por sentencia (None = BULK_CHUNK_SIZE)
+            commit (bool): False = el llamador confirma
+        
+        Returns:
+            list: Claves primarias de las filas insertadas o actualizadas
+                  (con DO NOTHING, solo las insertadas)
+        
+        Si la misma clave de conflicto viene repetida en `rows`, gana la ÚLTIMA
+        (PostgreSQL no deja que un ON CONFLICT DO UPDATE toque una fila dos veces).
+        
+        Ejemplo:
+            Producto.bulk_upsert(filas_etl, conflict_keys=['nombre_producto'])
+        """
+        pk = cls._pk()
+        retorno = [pk, *(cls.__table__.c[c] for c in cls._retorno_bulk)]
+        unicas = {tuple(fila[k] for k in conflict_keys): fila for fila in rows}
+        ids = []
+        try:
+            for bloque in cls._bloques(unicas.values(), chunk_size):
+                stmt = pg_insert(cls.__table__).values(bloque)
+                
+                columnas = update_columns
+                if columnas is None:
+                    excluir = set(conflict_keys) | {pk.name}
+                    columnas = [c for c in bloque[0] if c not in excluir]
+                
+                if columnas:
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=conflict_keys,
+                        set_={c: stmt.excluded[c] for c in columnas}
+                    )
+                else:
+                    stmt = stmt.on_conflict_do_nothing(index_elements=conflict_keys)
+                
+                filas = db.session.execute(stmt.returning(*retorno)).all()
+                ids.extend(fila[0] for fila in filas)
+                cls._tras_bulk('upsert', filas)
+            if commit:
+                db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+        return ids
+    
+    @classmethod
+    def bulk_delete(cls, ids, chunk_size=None, commit=True):
+        """
+        DELETE ... WHERE pk IN (...) por bloques, en una sola transacción.
+        
+        Returns:
+            list: Claves primarias realmente eliminadas (las inexistentes se ignoran)
+        """
+        pk = cls._pk()
+        retorno = [pk, *(cls.__table__.c[c] for c in cls._retorno_bulk)]
+        eliminados = []
+        try:
+            for bloque in cls._bloques(ids, chunk_size):
+                stmt = (
+                    delete(cls.__table__)
+                    .where(pk.in_(bloque))
+                    .returning(*retorno)
+                )
+                filas = db.session.execute(stmt).all()
+                eliminados.extend(fila[0] for fila in filas)
+                cls._tras_bulk('delete', filas)
+            if commit:
+                db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+        return eliminados
+    
     # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
     # METODOS DE FABRICA (El Gerente de Fabrica)
     # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -99,12 +263,48 @@ class BaseModel(db.Model):
             # {'id_paciente': 1, 'dni': '12345678', 'nombre_completo': 'Juan', ...}
         
         """
-        return {
-            c.key : getattr(self, c.key) for c in db.inspect(self).mapper.column_attrs
-        }
-        # `db.inspect(self)` -> Obtiene metadata del modelo actual
-        # `.mapper.column_attrs` -> Lista de atributos de columna del modelo
-        # `getattr(self, c.key)` -> Obtiene el valor del atributo de la columna actual  
+        claves, leer = type(self)._metadatos_columnas()
+        return dict(zip(claves, leer(self)))
+        # Las claves y el lector se calculan UNA vez por clase (ver `_metadatos_columnas`):
+        # antes cada llamada hacía `db.inspect(self).mapper.column_attrs` y recorría la lista
+    
+    @classmethod
+    def to_dicts(cls, instances, camel=False):
+        """
+        Serializa MUCHAS instancias de la misma clase con el mínimo trabajo por fila.
+        
+        Args:
+            instances (iterable): Objetos de esta clase
+            camel (bool): True = keys en camelCase (como `_to_camel_case`)
+        
+        Returns:
+            list[dict]: Igual que `[obj.to_dict() for obj in instances]`
+        
+        Ejemplo:
+            Paciente.to_dicts(pacientes, camel=True)
+            # [{'idPaciente': 1, 'dni': '12345678', ...}, ...]
+        """
+        claves, leer = cls._metadatos_columnas()
+        if camel:
+            claves = cls.__dict__['_columnas_camel']
+        return [dict(zip(claves, leer(obj))) for obj in instances]
+    
+    @classmethod
+    def _metadatos_columnas(cls):
+        """
+        (claves, lector) de las columnas de ESTA clase, cacheados en la clase.
+        
+        - claves: tupla con el `key` de cada columna mapeada
+        - lector: `attrgetter(*claves)` → tupla de valores en una sola llamada en C
+        
+        Se llenan en el evento `mapper_configured`; si se pide antes, se calculan aquí.
+        Se lee `cls.__dict__` (no herencia) para que cada modelo tenga los suyos.
+        """
+        metadatos = cls.__dict__.get('_columnas')
+        if metadatos is None:
+            _cachear_metadatos(db.inspect(cls), cls)
+            metadatos = cls.__dict__['_columnas']
+        return metadatos
         
     def update(self, data):
         """
@@ -154,10 +354,22 @@ class BaseModel(db.Model):
         
         Promovido a BaseModel para que TODOS los modelos lo hereden (DRY).
         """
-        camel_data = {}
-        for key, value in snake_case_dict.items():
-            components = key.split('_')
-            camel_key = components[0] + ''.join(x.title() for x in components[1:])
-            camel_data[camel_key] = value
-        
-        return camel_data
\ No newline at end of file
+        return {_camel(key): value for key, value in snake_case_dict.items()}
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# CACHÉ DE METADATOS POR CLASE
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def _cachear_metadatos(mapper, cls):
+    claves = tuple(attr.key for attr in mapper.column_attrs)
+    lector = attrgetter(*claves)
+    if len(claves) == 1:
+        # attrgetter con una sola clave devuelve el valor suelto, no una tupla
+        lector = lambda obj, _leer=lector: (_leer(obj),)
+    cls._columnas = (claves, lector)
+    cls._columnas_camel = tuple(_camel(k) for k in claves)
+
+
+# propagate=True: aplica a todos los modelos que heredan de BaseModel
+event.listen(BaseModel, 'mapper_configured', _cachear_metadatos, propagate=True)
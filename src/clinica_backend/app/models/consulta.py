@@ -25,7 +25,7 @@ class Consulta(BaseModel):
     # Relacion con Paciente
     id_paciente = db.Column(
         db.Integer,
-        db.ForeignKey('pacinetes.id_paciente'),
+        db.ForeignKey('pacientes.id_paciente'),
         nullable = False
     )
     
@@ -79,7 +79,7 @@ class ConsultaServicio(BaseModel):
     
     id_servicio = db.Column(
         db.Integer,
-        db.relationship('servicios_catalogo.id_servicio'),
+        db.ForeignKey('servicios_catalogo.id_servicio'),
         nullable = False
     )
     
@@ -6,7 +6,10 @@ Representa la Tabla de distritos en la base de datos
 Representa las zonas geográficas donde viven los pacientes
 """
 
-from app.extensions import db
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app.extensions import db, mapa_distritos
 from app.models.base import BaseModel
 
 class Distrito(BaseModel):
@@ -72,6 +75,12 @@ class Distrito(BaseModel):
         lazy='dynamic'
         )
     
+    @classmethod
+    def _tras_bulk(cls, operacion, filas):
+        # bulk_upsert/bulk_delete son SQL directo: sin hooks del mapper (ver BaseModel._tras_bulk)
+        if filas:
+            _marcar_distritos(db.session)
+    
     def __repr__(self):
         """
         Representacion en String del Objeto (Para Debugging)
@@ -96,6 +105,33 @@ class Distrito(BaseModel):
             str: Representación legible del objeto
         """
         return f'<Distrito {self.id_distrito}: {self.nombre_distrito}>'
-        
-        
-        
\ No newline at end of file
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# HOOKS DEL MAPA DE DISTRITOS (ver app/utils/distritos.py)
+# Un flush (o un bulk_upsert/bulk_delete) que toca `distritos` marca la
+# sesión; recién en el COMMIT se vence el mapa del proceso (un rollback no lo toca).
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def _marcar_distritos(sesion):
+    if sesion is not None:
+        sesion.info['_distritos_cambiaron'] = True
+
+
+@event.listens_for(Distrito, 'after_insert')
+@event.listens_for(Distrito, 'after_update')
+@event.listens_for(Distrito, 'after_delete')
+def _distrito_cambiado(mapper, connection, target):
+    _marcar_distritos(object_session(target))
+
+
+
+@event.listens_for(Session, 'after_commit')
+def _vencer_mapa_distritos(sesion):
+    if sesion.info.pop('_distritos_cambiaron', False):
+        mapa_distritos.invalidar()
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _descartar_cambios_distritos(sesion, transaccion_previa):
+    sesion.info.pop('_distritos_cambiaron', None)
@@ -40,7 +40,7 @@ class MovimientoStock(BaseModel):
     # Check Constraint esta en DB ('ENTRADA', 'SALIDA')
     tipo_movimiento = db.Column(
         db.String(10),
-        nullalble = False
+        nullable = False
     )
     
     cantidad = db.Column(
@@ -66,5 +66,45 @@ class MovimientoStock(BaseModel):
     
     def __repr__(self):
         return f'<Movimientqo {self.tipo_movimiento} x {self.cantidad}>'
+
+
+class SnapshotStock(BaseModel):
+    """
+    FOTOGRAFIA DEL KARDEX (Compactacion del Libro Mayor)
+    - La genera el trabajo programado `sp_generar_snapshots_stock()` (ver `flask inventario snapshots`)
+    - Saldo real = saldo del ultimo snapshot + movimientos con id_movimiento > id_ultimo_movimiento
+    - Python NUNCA escribe aqui: solo lee
+    """
+    
+    __tablename__ = 'snapshots_stock'
     
-    
\ No newline at end of file
+    id_snapshot = db.Column(
+        db.Integer,
+        primary_key = True,
+        autoincrement = True
+    )
+    
+    id_producto = db.Column(
+        db.Integer,
+        db.ForeignKey('productos_catalogo.id_producto'),
+        nullable = False
+    )
+    
+    fecha_corte = db.Column(
+        db.DateTime(timezone=True),
+        server_default = func.now()
+    )
+    
+    # Limite del snapshot: el ultimo movimiento incluido en `saldo`
+    id_ultimo_movimiento = db.Column(
+        db.Integer,
+        nullable = False
+    )
+    
+    saldo = db.Column(
+        db.Numeric(12,2),
+        nullable = False
+    )
+    
+    def __repr__(self):
+        return f'<Snapshot Producto {self.id_producto} = {self.saldo} (hasta mov. {self.id_ultimo_movimiento})>'
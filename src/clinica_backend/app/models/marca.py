@@ -19,6 +19,8 @@ class Marca(BaseModel):
         autoincrement = True
     )
     
+    nombre_marca = db.Column(db.String(150), unique = True, nullable = False)
+    
     # Relacion 1-A-Muchos
     # Una Marca tiene muchos Productores.
     
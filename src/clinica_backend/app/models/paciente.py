@@ -3,11 +3,125 @@
 Modelo Paciente - Entidad central del negocio
 """
 
-from app.extensions import db # Instancia de SQLAlchemy
+from app.extensions import db, cache_dni, mapa_distritos # SQLAlchemy + caché de DNIs + mapa de distritos
 from app.models.base import BaseModel # Clase base para todos los modelos
 from datetime import datetime, date  # Fechas y horas
 import pytz # Manejo de zonas horarias
 from flask import current_app
+from sqlalchemy import Integer, and_, case, cast, event, extract, func, inspect, not_, or_, select, tuple_
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import Session, object_session
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# REGLAS CALCULADAS (Funciones Puras)
+# Viven fuera de la clase para que las usen por igual las @property del
+# modelo y el serializador rápido de listados (que trabaja con filas
+# sueltas, sin instanciar objetos ORM).
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def calcular_edad(year, month, day, hoy=None):
+    """Edad en años a partir de la fecha de nacimiento (posiblemente parcial)."""
+    if not year:
+        return None
+    
+    hoy = hoy or date.today()
+    edad_base = hoy.year - year
+    
+    # Ajustar si aún no ha cumplido años este año
+    if month and day:
+        try:
+            if (hoy.month, hoy.day) < (month, day):
+                edad_base -= 1
+        except TypeError:
+            # En caso de mes/día inválido (ej. 0)
+            pass
+    
+    return edad_base
+
+
+def calcular_fecha_nacimiento(year, month, day):
+    """'date object' si la fecha de nacimiento es completa y válida, si no None."""
+    if not all([year, month, day]):
+        return None
+    
+    try:
+        return date(year, month, day)
+    except ValueError:
+        # Fecha inválida (ej: 31 de febrero)
+        return None
+
+
+def calcular_alertas(year, month, day, telefono, id_distrito):
+    """Lista de alertas sobre datos incompletos del paciente."""
+    alertas = []
+    
+    if not year:
+        alertas.append('falta_anio_nacimiento')
+    elif not month or not day:
+        alertas.append('falta_mes_dia_nacimiento')
+    
+    if year and not calcular_fecha_nacimiento(year, month, day):
+        alertas.append('fecha_nacimiento_invalida')
+    
+    if not telefono:
+        alertas.append('sin_telefono')
+    
+    if not id_distrito:
+        alertas.append('sin_distrito')
+    
+    return alertas
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# LAS MISMAS REGLAS EN SQL (para filtrar/ordenar/agregar en PostgreSQL)
+# Cada función replica EXACTAMENTE su gemela de Python de arriba.
+# "Vacío" en Python (`not x`) = NULL o 0 / '' en SQL.
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+# Orden en que aparecen en `alertas` (mismo que `calcular_alertas`)
+ALERTAS = (
+    'falta_anio_nacimiento',
+    'falta_mes_dia_nacimiento',
+    'fecha_nacimiento_invalida',
+    'sin_telefono',
+    'sin_distrito'
+)
+
+
+def _vacio_sql(columna, cero=0):
+    return func.coalesce(columna, cero) == cero
+
+
+def fecha_valida_sql(year, month, day):
+    """
+    TRUE si (year, month, day) forma una fecha real. Solo aritmética:
+    `make_date()` lanzaría error con un 31 de febrero en vez de devolver FALSE.
+    """
+    bisiesto = or_(and_(year % 4 == 0, year % 100 != 0), year % 400 == 0)
+    dias_mes = case(
+        (month == 2, case((bisiesto, 29), else_=28)),
+        (month.in_((4, 6, 9, 11)), 30),
+        else_=31
+    )
+    # FALSE AND NULL = FALSE: con cualquier parte NULL el resultado es FALSE (nunca NULL)
+    return and_(
+        year.is_not(None), month.is_not(None), day.is_not(None),
+        year.between(1, 9999), month.between(1, 12), day.between(1, dias_mes)
+    )
+
+
+def edad_sql(year, month, day):
+    """Edad en años calculada por PostgreSQL con CURRENT_DATE (NULL sin año)."""
+    hoy = func.current_date()
+    no_cumplio = and_(
+        not_(_vacio_sql(month)), not_(_vacio_sql(day)),
+        tuple_(extract('month', hoy), extract('day', hoy)) < tuple_(month, day)
+    )
+    return case(
+        (_vacio_sql(year), None),
+        else_=cast(extract('year', hoy) - year - case((no_cumplio, 1), else_=0), Integer)
+    )
 
 
 class Paciente(BaseModel):
@@ -99,7 +213,9 @@ class Paciente(BaseModel):
         # 'select' (default): Se dispara un query CUANDO pides paciente.distrito
         # 'joined': SQLAlchemy hace un JOIN automático en la query original
         # 'dynamic': Devuelve un OBJETO QUERY (ideal para 1-a-Muchos)
-        lazy='joined' # 'joined' es ideal para N-a-1 (siempre querrás el distrito)
+        # 'select': el nombre del distrito sale del mapa en memoria (app/utils/distritos.py),
+        # así que un JOIN en CADA query de pacientes ya no aporta nada
+        lazy='select'
     )
     
     
@@ -111,46 +227,27 @@ class Paciente(BaseModel):
     # PROPIEDADES CALCULADAS (El Medidor Mágico ⛽)
     # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
     
-    @property
+    # `@hybrid_property`: en una INSTANCIA se calcula en Python (paciente.edad);
+    # en la CLASE es una expresión SQL (Paciente.edad >= 60) para WHERE / ORDER BY / GROUP BY.
+    
+    @hybrid_property
     def edad(self):
         """
         Calcula la edad del paciente dinámicamente.
-        Se accede como 'paciente.edad' (gracias a @property)
+        Se accede como 'paciente.edad' (gracias a @hybrid_property)
         """
-        if not self.nacimiento_year:
-            return None
-        
-        hoy = date.today()
-        edad_base = hoy.year - self.nacimiento_year
-        
-        # Ajustar si aún no ha cumplido años este año
-        if self.nacimiento_month and self.nacimiento_day:
-            try:
-                if (hoy.month, hoy.day) < (self.nacimiento_month, self.nacimiento_day):
-                    edad_base -= 1
-            except TypeError:
-                # En caso de mes/día inválido (ej. 0)
-                pass 
-                
-        return edad_base
+        return calcular_edad(self.nacimiento_year, self.nacimiento_month, self.nacimiento_day)
+    
+    @edad.expression
+    def edad(cls):
+        return edad_sql(cls.nacimiento_year, cls.nacimiento_month, cls.nacimiento_day)
     
     @property # `@property` convierte el método en atributo calculado
     def fecha_nacimiento_completa(self):
         """
         Retorna fecha de nacimiento como 'date object' si es válida.
         """
-        if not all([self.nacimiento_year, self.nacimiento_month, self.nacimiento_day]):
-            return None
-        
-        try:
-            return date(
-                self.nacimiento_year,
-                self.nacimiento_month,
-                self.nacimiento_day
-            )
-        except ValueError:
-            # Fecha inválida (ej: 31 de febrero)
-            return None
+        return calcular_fecha_nacimiento(self.nacimiento_year, self.nacimiento_month, self.nacimiento_day)
     
     @property
     def alertas(self):
@@ -158,23 +255,71 @@ class Paciente(BaseModel):
         Genera lista de alertas sobre datos incompletos.
         Lógica de negocio VIVA dentro del modelo.
         """
-        alertas = []
-        
-        if not self.nacimiento_year:
-            alertas.append('falta_anio_nacimiento')
-        elif not self.nacimiento_month or not self.nacimiento_day:
-            alertas.append('falta_mes_dia_nacimiento')
-        
-        if self.nacimiento_year and not self.fecha_nacimiento_completa:
-             alertas.append('fecha_nacimiento_invalida')
-        
-        if not self.telefono:
-            alertas.append('sin_telefono')
-        
-        if not self.id_distrito:
-            alertas.append('sin_distrito')
-        
-        return alertas
+        return calcular_alertas(
+            self.nacimiento_year,
+            self.nacimiento_month,
+            self.nacimiento_day,
+            self.telefono,
+            self.id_distrito
+        )
+    
+    # --- Una bandera por alerta (mismos nombres que en `alertas`) ---
+    # Ej: Paciente.query.filter(Paciente.sin_telefono)
+    
+    @hybrid_property
+    def falta_anio_nacimiento(self):
+        return not self.nacimiento_year
+    
+    @falta_anio_nacimiento.expression
+    def falta_anio_nacimiento(cls):
+        return _vacio_sql(cls.nacimiento_year)
+    
+    @hybrid_property
+    def falta_mes_dia_nacimiento(self):
+        return bool(self.nacimiento_year) and (not self.nacimiento_month or not self.nacimiento_day)
+    
+    @falta_mes_dia_nacimiento.expression
+    def falta_mes_dia_nacimiento(cls):
+        return and_(
+            not_(_vacio_sql(cls.nacimiento_year)),
+            or_(_vacio_sql(cls.nacimiento_month), _vacio_sql(cls.nacimiento_day))
+        )
+    
+    @hybrid_property
+    def fecha_nacimiento_invalida(self):
+        return bool(self.nacimiento_year) and self.fecha_nacimiento_completa is None
+    
+    @fecha_nacimiento_invalida.expression
+    def fecha_nacimiento_invalida(cls):
+        return and_(
+            not_(_vacio_sql(cls.nacimiento_year)),
+            not_(fecha_valida_sql(cls.nacimiento_year, cls.nacimiento_month, cls.nacimiento_day))
+        )
+    
+    @hybrid_property
+    def sin_telefono(self):
+        return not self.telefono
+    
+    @sin_telefono.expression
+    def sin_telefono(cls):
+        return _vacio_sql(cls.telefono, '')
+    
+    @hybrid_property
+    def sin_distrito(self):
+        return not self.id_distrito
+    
+    @sin_distrito.expression
+    def sin_distrito(cls):
+        return _vacio_sql(cls.id_distrito)
+    
+    @hybrid_property
+    def cantidad_alertas(self):
+        """Para ORDENAR por "pacientes con más datos pendientes"."""
+        return len(self.alertas)
+    
+    @cantidad_alertas.expression
+    def cantidad_alertas(cls):
+        return sum(case((getattr(cls, codigo), 1), else_=0) for codigo in ALERTAS)
     
     # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
     # MÉTODOS DE SERIALIZACIÓN Y DE FÁBRICA
@@ -200,14 +345,8 @@ class Paciente(BaseModel):
         else:
             data['fecha_nacimiento'] = None
         
-        # 4. Incluir datos del distrito (de la relación)
-        if self.distrito:
-            data['distrito'] = {
-                'id_distrito': self.distrito.id_distrito,
-                'nombre_distrito': self.distrito.nombre_distrito
-            }
-        else:
-            data['distrito'] = None
+        # 4. Incluir datos del distrito (del mapa en memoria, sin tocar la relación)
+        data['distrito'] = mapa_distritos.como_dict(self.id_distrito)
         
         # 5. Convertir a camelCase para el Frontend
         return self._to_camel_case(data)
@@ -224,6 +363,32 @@ class Paciente(BaseModel):
         """
         return cls.query.filter_by(dni=dni).first()
     
+    @classmethod
+    def buscar_por_dnis(cls, dnis, tamano_lote=1000):
+        """
+        ¿Cuáles de estos DNIs ya están registrados?
+        Una query por cada `tamano_lote` DNIs que el caché no sabe ausentes
+        (0 si todos son DNIs nuevos ya vistos). Un DNI existente siempre se
+        confirma contra la BD: ver app/utils/dni_cache.py.
+        
+        Returns:
+            set: DNIs existentes
+        
+        Ejemplo:
+            Paciente.buscar_por_dnis(['12345678', '87654321'])  # {'12345678'}
+        """
+        dnis = list({dni for dni in dnis if dni})
+        existentes = set()
+        desconocidos = cache_dni.consultar(dnis)
+        
+        for inicio in range(0, len(desconocidos), tamano_lote):
+            bloque = desconocidos[inicio:inicio + tamano_lote]
+            encontrados = set(db.session.scalars(select(cls.dni).where(cls.dni.in_(bloque))))
+            existentes |= encontrados
+            cache_dni.marcar(set(bloque) - encontrados, False)
+        
+        return existentes
+    
     @classmethod
     def buscar_por_nombre(cls, nombre, limit=20):
         """
@@ -233,4 +398,55 @@ class Paciente(BaseModel):
         # 'ilike' es como LIKE pero Case-Insensitive
         return cls.query.filter(
             cls.nombre_completo.ilike(f'%{nombre}%')
-        ).limit(limit).all()
\ No newline at end of file
+        ).limit(limit).all()
+    
+    # bulk_upsert/bulk_delete son SQL directo (sin hooks del mapper):
+    # avisan al caché de DNIs por aquí (ver BaseModel._tras_bulk)
+    _retorno_bulk = ('dni',)
+    
+    @classmethod
+    def _tras_bulk(cls, operacion, filas):
+        for _, dni in filas:
+            _anotar_dni(db.session, dni, operacion == 'upsert')
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# HOOKS DEL CACHÉ DE DNIs (ver app/utils/dni_cache.py)
+# Durante el flush anotamos los cambios en la sesión; se aplican al caché
+# recién en el COMMIT. Si hay rollback, se descartan.
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def _anotar_dni(sesion, dni, existe):
+    if sesion is not None and dni:
+        sesion.info.setdefault('_dnis_pendientes', []).append((dni, existe))
+
+
+@event.listens_for(Paciente, 'after_insert')
+def _dni_insertado(mapper, connection, target):
+    _anotar_dni(object_session(target), target.dni, True)
+
+
+@event.listens_for(Paciente, 'after_update')
+def _dni_actualizado(mapper, connection, target):
+    historial = inspect(target).attrs.dni.history
+    if historial.has_changes():
+        sesion = object_session(target)
+        for anterior in historial.deleted:
+            _anotar_dni(sesion, anterior, False)
+        _anotar_dni(sesion, target.dni, True)
+
+
+@event.listens_for(Paciente, 'after_delete')
+def _dni_eliminado(mapper, connection, target):
+    _anotar_dni(object_session(target), target.dni, False)
+
+
+@event.listens_for(Session, 'after_commit')
+def _aplicar_dnis(sesion):
+    for dni, existe in sesion.info.pop('_dnis_pendientes', ()):
+        cache_dni.marcar((dni,), existe)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _descartar_dnis(sesion, transaccion_previa):
+    sesion.info.pop('_dnis_pendientes', None)
@@ -0,0 +1,33 @@
+# src/clinica_backend/app/routes/admin.py
+"""
+Endpoints de administración (diagnóstico de base de datos).
+"""
+
+from flask import Blueprint, request
+
+from app.utils.slow_queries import almacen_lentas
+from app.utils.response import APIResponse
+
+admin_bp = Blueprint('admin', __name__)
+
+
+@admin_bp.route('/slow-queries', methods=['GET'])
+def listar_queries_lentas():
+    """
+    Query params:
+        limit (int): Máximo de registros (default 50)
+        min_ms (float): Solo las que tardaron al menos esto
+        agrupar (bool): `1` = una fila por sentencia (veces, max_ms, avg_ms)
+    """
+    if request.args.get('agrupar', '').lower() in ('1', 'true', 'yes'):
+        return APIResponse.success(almacen_lentas.agrupar())
+
+    limit = request.args.get('limit', 50, type=int)
+    min_ms = request.args.get('min_ms', 0, type=float)
+    return APIResponse.success(almacen_lentas.listar(limit=max(limit, 0), min_ms=min_ms))
+
+
+@admin_bp.route('/slow-queries', methods=['DELETE'])
+def limpiar_queries_lentas():
+    almacen_lentas.limpiar()
+    return APIResponse.success(message="Registro de queries lentas vaciado")
@@ -34,6 +34,12 @@ from app.schemas.catalogo_schema import MarcaSchema, ProductoSchema, ProductoCre
 
 from app.utils.response import APIResponse
     # Encapsula la repsuesta con el formato Estandar 
+
+from app.extensions import cache
+    # Cache de lecturas: el catalogo casi no cambia y se pide en cada formulario
+
+from app.utils.replicas import usar_replica
+    # Los listados GET (en un MISS de cache) leen de una replica si esta configurada
     
 # ================================================================================
 
@@ -95,7 +101,7 @@ def crear_marca():
         #   - Service Layer: Verifica Duplicado, Creo Objetp (Marca(**data)), lo agrega a la session, commit, retorna el objeto con el id designado
         #   -  NO debe tener(no SQL, no acceso directo a BD)
         #   -  SI dehe tener(Reglas de Negocio, validaciones internas, interaccion con ORM, commit, rollback)
-        return APIResponse.succes(marca_schema.dump(nueva_marca), 201)
+        return APIResponse.success(marca_schema.dump(nueva_marca), "Marca Creada", 201)
         # Serializar el Objeto Marca a JSON para: 
         #   - Evitar exponer atributos internos
         #   - Evitar Devolver objetos Python no Serializables
@@ -109,10 +115,15 @@ def crear_marca():
         return APIResponse.error(str(e), 500)
     
 @catalogo_bp.route('/marcas', methods = ['GET'])
+@usar_replica
 def listar_marcas():
     try:
-        marcas  = CatalogoService.listar_marcas()
-        return APIResponse.success(marcas_list_schema.dump(marcas))
+        # Guardamos el JSON ya serializado: un HIT no toca la BD ni Marshmallow
+        marcas = cache.get_or_set(
+            CatalogoService.CACHE_MARCAS,
+            lambda: marcas_list_schema.dump(CatalogoService.listar_marcas())
+        )
+        return APIResponse.success(marcas)
     except Exception as e:
         return APIResponse.error(str(e), 500)
 # ==================================================================================
@@ -121,7 +132,7 @@ def listar_marcas():
 # ENDPOINT - RUTAS - PRODUCTOS
 # ==================================================================================    
 
-@catalogo_bp.routes('/productos', methods = ['POST'])
+@catalogo_bp.route('/productos', methods = ['POST'])
 def crear_productos():
     json_data = request.get_json()
     if not json_data:
@@ -129,7 +140,7 @@ def crear_productos():
     
     try:
         #Usamos el Schema CREATE (que exige id_marca)
-        data = producto_schema.load(json_data)
+        data = producto_create_schema.load(json_data)
         nuevo_prod = CatalogoService.crear_producto(data)
         return APIResponse.success(producto_schema.dump(nuevo_prod), "Producto Creado", 201)
     
@@ -142,10 +153,14 @@ def crear_productos():
         return APIResponse.error(str(e), 500)
     
 @catalogo_bp.route('/productos', methods = ['GET'])
+@usar_replica
 def listar_productos():
     try:
-        productos = CatalogoService.listar_productos()
-        return APIResponse.sucess(productos_list_schema.dump(productos))
+        productos = cache.get_or_set(
+            CatalogoService.CACHE_PRODUCTOS,
+            lambda: productos_list_schema.dump(CatalogoService.listar_productos())
+        )
+        return APIResponse.success(productos)
     except Exception as e:
         return APIResponse.error(str(e), 500)
     
@@ -174,9 +189,19 @@ def crear_servicios():
         return APIResponse.error(str(e), 500)
 
 @catalogo_bp.route('/servicios', methods = ['GET'])
+@usar_replica
 def listar_servicios():
     try:
-        servicios = CatalogoService.listar_servicios()
-        return APIResponse.success(servicio_list_schema.dump(servicios))
+        servicios = cache.get_or_set(
+            CatalogoService.CACHE_SERVICIOS,
+            lambda: servicio_list_schema.dump(CatalogoService.listar_servicios())
+        )
+        return APIResponse.success(servicios)
     except Exception as e:
-        return APIResponse.error(str(e), 500)
\ No newline at end of file
+        return APIResponse.error(str(e), 500)
+
+
+@catalogo_bp.route('/catalogo/cache/stats', methods = ['GET'])
+def estadisticas_cache():
+    # Contadores hit/miss del proceso que atiende el request
+    return APIResponse.success(cache.stats())
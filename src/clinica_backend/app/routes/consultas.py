@@ -2,10 +2,18 @@ from flask import Blueprint, request
 """
 `Blueprint`: Permite crear un Modulo dentro de Flask - Permite Organizar las Rutas  en archivos Separadosen lugar de Tener Todo en un app.py 
 """
+from datetime import date
+
 from marshmallow import ValidationError
 from app.services.consulta_service import ConsultaService
-from app.schemas.consulta_schema import ConsultaCreateSchema, ConsultaResponseSchema 
+from app.schemas.consulta_schema import (
+    ConsultaCreateSchema,
+    ConsultaResponseSchema,
+    ConsultaResumenSchema,
+    HistorialPacienteResumenSchema
+)
 from app.utils.response import APIResponse
+from app.utils.replicas import usar_replica
 
 consultas_bp = Blueprint('consultas', __name__)
 
@@ -14,6 +22,9 @@ create_schema = ConsultaCreateSchema()
     # `create_schema`: es estricto. Revisa que vengan los Datos Obligaotrios para CREAR
 response_schema = ConsultaResponseSchema()
     # `response_schema`: Es Selectivo. Formatea lo que el Usuario debe ver al Final
+resumen_list_schema = ConsultaResumenSchema(many = True)
+    # `resumen_list_schema`: Filas de listado (totales ya calculados por SQL)
+historial_resumen_schema = HistorialPacienteResumenSchema()
 
 @consultas_bp.route('/consultas', methods = ['POST'])
 def registrar_consulta(): 
@@ -69,4 +80,82 @@ def registrar_consulta():
     except Exception as e:
         # Errores INesperados de Servidor 
         return APIResponse.error("Error interno del servidor", 500, details = str(e))
-    
\ No newline at end of file
+    
+@consultas_bp.route('/consultas/<int:id_consulta>', methods = ['GET'])
+def obtener_consulta(id_consulta):
+    """
+    DETALLE DE UNA CONSULTA (Servicios + Consumos + Productos)
+    Carga anticipada: 5 queries fijas (ver benchmarks/check_queries.py), sin importar cuantos servicios o consumos tenga.
+    """
+    try:
+        consulta = ConsultaService.obtener_consulta(id_consulta)
+        if not consulta:
+            return APIResponse.error("Consulta no encontrada", 404)
+        
+        return APIResponse.success(data = response_schema.dump(consulta))
+    
+    except Exception as e:
+        return APIResponse.error("Error interno del servidor", 500, details = str(e))
+
+
+def _params_listado():
+    """Lee los Query Params comunes a los listados de consultas."""
+    return {
+        'desde': request.args.get('desde', None, type=date.fromisoformat),
+        'hasta': request.args.get('hasta', None, type=date.fromisoformat),
+        'cursor': request.args.get('cursor', None, type=str),
+        'limit': max(1, min(request.args.get('limit', 50, type=int), 200))
+    }
+
+
+@consultas_bp.route('/consultas', methods = ['GET'])
+@usar_replica
+def listar_consultas():
+    """
+    LISTADO DE CONSULTAS (Mas recientes primero)
+    Params URL: ?desde=2025-01-01&hasta=2025-01-31&limit=50&cursor=<next_cursor>
+    """
+    try:
+        resultado = ConsultaService.listar_consultas(**_params_listado())
+        return APIResponse.success(data = {
+            'items': resumen_list_schema.dump(resultado['items']),
+            'pagination': {
+                'next_cursor': resultado['next_cursor'],
+                'limit': resultado['limit']
+            }
+        })
+    
+    except ValueError as e:
+        # Cursor manipulado
+        return APIResponse.error(str(e), 400)
+    except Exception as e:
+        return APIResponse.error("Error interno del servidor", 500, details = str(e))
+
+
+@consultas_bp.route('/pacientes/<int:id_paciente>/consultas', methods = ['GET'])
+@usar_replica
+def historial_paciente(id_paciente):
+    """
+    HISTORIA DEL PACIENTE: Resumen global + consultas paginadas
+    Params URL: ?desde=2025-01-01&hasta=2025-12-31&limit=50&cursor=<next_cursor>
+    """
+    try:
+        resultado = ConsultaService.historial_paciente(id_paciente, **_params_listado())
+        if resultado is None:
+            return APIResponse.error(f"Paciente con ID {id_paciente} no encontrado", 404)
+        
+        return APIResponse.success(data = {
+            'resumen': historial_resumen_schema.dump(resultado['resumen']),
+            'items': resumen_list_schema.dump(resultado['items']),
+            'pagination': {
+                'next_cursor': resultado['next_cursor'],
+                'limit': resultado['limit']
+            }
+        })
+    
+    except ValueError as e:
+        # Cursor manipulado
+        return APIResponse.error(str(e), 400)
+    except Exception as e:
+        return APIResponse.error("Error interno del servidor", 500, details = str(e))
+
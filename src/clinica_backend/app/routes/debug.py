@@ -0,0 +1,30 @@
+# src/clinica_backend/app/routes/debug.py
+"""
+Endpoints de diagnóstico (solo se registran con PROFILING_ENABLED = True).
+"""
+
+from flask import Blueprint, request
+
+from app.utils.profiling import registro_lentos
+from app.utils.response import APIResponse
+
+debug_bp = Blueprint('debug', __name__)
+
+
+@debug_bp.route('/debug/slow', methods=['GET'])
+def requests_lentos():
+    """
+    Requests recientes que superaron PROFILING_SLOW_MS, del más lento al más rápido,
+    con las sentencias SQL que ejecutaron.
+    
+    Query params:
+        limit (int): Cuántos devolver (default 20)
+    """
+    limit = request.args.get('limit', 20, type=int)
+    return APIResponse.success(registro_lentos.listar()[:max(limit, 0)])
+
+
+@debug_bp.route('/debug/slow', methods=['DELETE'])
+def limpiar_requests_lentos():
+    registro_lentos.limpiar()
+    return APIResponse.success(message="Registro de requests lentos vaciado")
@@ -7,7 +7,7 @@ from flask import Blueprint
 # 🔴 ANTES DECÍA: from app.utils.response import success_response (ESTO YA NO EXISTE)
 # 🟢 AHORA DEBE DECIR:
 from app.utils.response import APIResponse
-from app.extensions import db
+from app.extensions import db, mapa_distritos, replicas
 from sqlalchemy import text
 
 health_bp = Blueprint('health', __name__)
@@ -32,7 +32,9 @@ def health_check_db():
         return APIResponse.success(
             data={
                 'status': 'healthy',
-                'database': 'connected'
+                'database': 'connected',
+                'replicas': replicas.estado(),
+                'mapa_distritos': mapa_distritos.estado()
             }
         )
     except Exception as e:
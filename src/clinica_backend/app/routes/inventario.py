@@ -1,11 +1,15 @@
 # src/clinica_backend/app/routers/inventario.py
 
-from flask import Blueprint, request
+import csv
+import io
+from datetime import date
+
+from flask import Blueprint, Response, current_app, request, stream_with_context
 from marshmallow import ValidationError
 from app.services.inventario_service import InventarioService
-from app.schemas.inventario_schema import InventarioService 
-from app.schemas.inventario_schema import MovimientoStockSchema, MovimientoResponseSchema
+from app.schemas.inventario_schema import MovimientoStockSchema, MovimientoResponseSchema, MovimientoBulkSchema, SnapshotStockSchema, MovimientoKardexSchema
 from app.utils.response import APIResponse
+from app.utils.replicas import usar_replica
 
 # Creacion del BluePrint
 inventario_bp = Blueprint('inventario', __name__)
@@ -14,6 +18,9 @@ inventario_bp = Blueprint('inventario', __name__)
 entrada_schema = MovimientoStockSchema()
 response_schema = MovimientoResponseSchema()
 list_schema = MovimientoResponseSchema(many =True)
+bulk_schema = MovimientoBulkSchema()
+snapshot_schema = SnapshotStockSchema()
+kardex_list_schema = MovimientoKardexSchema(many = True)
 
 @inventario_bp.route('/movimientos', methods = ['POST'])
 def crear_movimiento():
@@ -47,11 +54,144 @@ def crear_movimiento():
     except Exception as e:
         return APIResponse.error("Error interno del servidor", 500, details=str(e))
     
+@inventario_bp.route('/movimientos/bulk', methods = ['POST'])
+def crear_movimientos_bulk():
+    """
+    Registra una Recepcion de Compra (Muchas lineas, UNA transaccion)
+    JSON: {"movimientos": [{"id_producto": 1, "tipo_movimiento": "ENTRADA", "cantidad": 20}, ...]}
+    """
+    json_data = request.get_json()
+    if not json_data:
+        return APIResponse.error("Sin Datos JSON", 400)
+    
+    try:
+        # 1. Validacion de Formato (Todas las lineas antes de tocar la DB)
+        data = bulk_schema.load(json_data)
+        
+        # 2. Ejecucion de Logica (3 queries sin importar el numero de lineas)
+        resultado = InventarioService.registrar_movimientos_bulk(data['movimientos'])
+        
+        # 3. Respuesta con el Stock Resultante de cada producto
+        return APIResponse.success(
+            data = resultado,
+            message = f"{len(resultado['ids_movimientos'])} movimientos registrados exitosamente.",
+            status_code = 201
+        )
+        
+    except ValidationError as e:
+        return APIResponse.error("Datos Invalidos", 400, details = e.messages)
+    except ValueError as e:
+        # Errores de lógica (ej: Producto inexistente, Stock insuficiente)
+        return APIResponse.error(str(e), 400)
+    except Exception as e:
+        return APIResponse.error("Error interno del servidor", 500, details=str(e))
+    
 @inventario_bp.route('/kardex/<int:id_producto>',methods = ['GET'])
+@usar_replica
 def ver_kardex(id_producto):
-    """Ver historial de un producto específico"""
+    """Ver Kardex compactado: ultimo snapshot + movimientos posteriores"""
     try:
-        historial = InventarioService.obtener_kardex(id_producto)
-        return APIResponse.success(list_schema.dump(historial))
+        producto = InventarioService.obtener_resumen_producto(id_producto)
+        kardex = InventarioService.obtener_kardex(id_producto)
+        return APIResponse.success({
+            'producto': producto,
+            'snapshot': snapshot_schema.dump(kardex['snapshot']) if kardex['snapshot'] else None,
+            'movimientos': kardex_list_schema.dump(kardex['movimientos'])
+        })
+    except ValueError as e:
+        return APIResponse.error(str(e), 404)
     except Exception as e:
-        return APIResponse.error(str(e), 500)
\ No newline at end of file
+        return APIResponse.error(str(e), 500)
+
+@inventario_bp.route('/kardex/<int:id_producto>/rango', methods = ['GET'])
+@usar_replica
+def ver_kardex_rango(id_producto):
+    """
+    Historial por rango de fechas (paginacion por cursor)
+    Params URL: ?desde=2025-01-01&hasta=2025-01-31&limit=50&cursor=<next_cursor>
+    """
+    try:
+        producto = InventarioService.obtener_resumen_producto(id_producto)
+        resultado = InventarioService.obtener_kardex_rango(
+            id_producto,
+            desde = request.args.get('desde', None, type=date.fromisoformat),
+            hasta = request.args.get('hasta', None, type=date.fromisoformat),
+            cursor = request.args.get('cursor', None, type=str),
+            limit = max(1, min(request.args.get('limit', 50, type=int), 500))
+        )
+        return APIResponse.success({
+            'producto': producto,
+            'items': kardex_list_schema.dump(resultado['items']),
+            'pagination': {
+                'next_cursor': resultado['next_cursor'],
+                'limit': resultado['limit']
+            }
+        })
+    except ValueError as e:
+        # Producto inexistente o cursor manipulado
+        return APIResponse.error(str(e), 400)
+    except Exception as e:
+        return APIResponse.error(str(e), 500)
+
+# Columnas del archivo exportado (mismo orden en CSV y NDJSON)
+COLUMNAS_EXPORT = (
+    'id_movimiento', 'fecha_movimiento', 'tipo_movimiento', 'cantidad',
+    'id_consumo_origen', 'nombre_producto', 'stock_actual'
+)
+
+@inventario_bp.route('/kardex/<int:id_producto>/export', methods = ['GET'])
+@usar_replica
+def exportar_kardex(id_producto):
+    """
+    Exporta el Kardex en STREAMING (fila por fila, sin armar todo en memoria)
+    Params URL: ?formato=ndjson|csv&desde=2025-01-01&hasta=2025-12-31
+    """
+    formato = request.args.get('formato', 'ndjson', type=str).lower()
+    if formato not in ('ndjson', 'csv'):
+        return APIResponse.error("Formato invalido (ndjson, csv)", 400)
+    
+    try:
+        # El producto se resuelve UNA vez, antes de empezar a transmitir
+        producto = InventarioService.obtener_resumen_producto(id_producto)
+    except ValueError as e:
+        return APIResponse.error(str(e), 404)
+    
+    filas = InventarioService.iterar_kardex(
+        id_producto,
+        desde = request.args.get('desde', None, type=date.fromisoformat),
+        hasta = request.args.get('hasta', None, type=date.fromisoformat)
+    )
+    constantes = (producto['nombre_producto'], producto['stock_actual'])
+    
+    def generar_ndjson():
+        dumps = current_app.json.dumps
+        for fila in filas:
+            registro = dict(zip(COLUMNAS_EXPORT, (*fila, *constantes)))
+            # ISO 8601 igual que Marshmallow (el encoder por defecto usaria formato HTTP)
+            registro['fecha_movimiento'] = fila.fecha_movimiento.isoformat()
+            yield dumps(registro) + '\n'
+    
+    def generar_csv():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(COLUMNAS_EXPORT)
+        for fila in filas:
+            writer.writerow((*fila, *constantes))
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+        yield buffer.getvalue()
+    
+    if formato == 'csv':
+        generador, mimetype = generar_csv(), 'text/csv'
+    else:
+        generador, mimetype = generar_ndjson(), 'application/x-ndjson'
+    
+    # `stream_with_context` mantiene viva la sesion de DB mientras se transmite
+    return Response(
+        stream_with_context(generador),
+        mimetype = mimetype,
+        headers = {
+            'Content-Disposition': f'attachment; filename=kardex_{id_producto}.{formato}'
+        }
+    )
@@ -0,0 +1,23 @@
+# src/clinica_backend/app/routes/metrics.py
+"""
+Endpoint de scraping para Prometheus (GET /metrics, fuera de /api).
+"""
+
+from flask import Blueprint, Response
+
+from app.utils import metrics
+from app.utils.response import APIResponse
+
+metrics_bp = Blueprint('metrics', __name__)
+
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def exponer_metricas():
+    if not metrics.disponible():
+        return APIResponse.error(
+            "prometheus_client no está instalado",
+            status_code=501,
+            code="METRICS_UNAVAILABLE"
+        )
+    cuerpo, content_type = metrics.generar_metricas()
+    return Response(cuerpo, content_type=content_type)
@@ -13,13 +13,28 @@ from app.services.paciente_service import PacienteService
 
 # 2. IMPORTAMOS LOS GUARDIANES (Schemas)
 # Validado: Importación explícita para evitar errores de 'current_app'
-from app.schemas.paciente_schema import PacienteSchema, PacienteCreateSchema, PacienteUpdateSchema
+from app.schemas.paciente_schema import PacienteSchema, PacienteCreateSchema, PacienteUpdateSchema, PacienteListadoSerializer, PacienteBulkSchema
 
 # 3. IMPORTAMOS EL EMPAQUETADOR (Respuestas)
 from app.utils.response import APIResponse
+from app.utils.replicas import usar_replica
 
 pacientes_bp = Blueprint('pacientes', __name__)
 
+
+def leer_filtros_listado(args):
+    """
+    Query params de filtro comunes al listado y al resumen (también los usa app/asgi.py).
+    ?search=juan&distrito_id=3&edad_min=60&edad_max=80&alerta=sin_telefono&alerta=sin_distrito
+    """
+    return {
+        'search': args.get('search', None, type=str),
+        'distrito_id': args.get('distrito_id', None, type=int),
+        'edad_min': args.get('edad_min', None, type=int),
+        'edad_max': args.get('edad_max', None, type=int),
+        'alertas': args.getlist('alerta')
+    }
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # INSTANCIAS DE SCHEMAS (Para usar dentro de las rutas)
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -27,6 +42,7 @@ paciente_schema = PacienteSchema()                      # Para un solo paciente
 pacientes_list_schema = PacienteSchema(many=True)       # Para una lista de pacientes
 create_schema = PacienteCreateSchema()                  # Validador estricto para crear
 update_schema = PacienteUpdateSchema()                  # Validador flexible para actualizar
+bulk_schema = PacienteBulkSchema()                      # Sobre del registro masivo
 
 # --------------------------------------------------------
 # ENDPOINT 1: CREAR (POST)
@@ -68,33 +84,69 @@ def crear_paciente():
         # Error: Se incendió la cocina (Error de servidor)
         return APIResponse.error(str(e), status_code=500)
 
+# --------------------------------------------------------
+# ENDPOINT 1.1: CREAR EN LOTE (POST)
+# --------------------------------------------------------
+@pacientes_bp.route('/pacientes/bulk', methods=['POST'])
+def crear_pacientes_bulk():
+    """
+    Registro masivo (apertura de la clínica, importaciones).
+    JSON: {"pacientes": [{"dni": "12345678", "nombre_completo": "Ana Pérez"}, ...]}
+    """
+    json_data = request.get_json()
+    if not json_data:
+        return APIResponse.error("No se enviaron datos JSON", status_code=400)
+    
+    try:
+        # 1. Validación de TODOS los pacientes antes de tocar la BD
+        data = bulk_schema.load(json_data)
+        
+        # 2. Verificaciones en lote + un solo commit
+        ids = PacienteService.crear_pacientes_bulk(data['pacientes'])
+        
+        return APIResponse.success(
+            data={'ids_pacientes': ids},
+            message=f"{len(ids)} pacientes registrados exitosamente",
+            status_code=201
+        )
+    
+    except ValidationError as e:
+        return APIResponse.error("Error de validación", status_code=400, details=e.messages)
+    except ValueError as e:
+        # DNI duplicado, distrito inexistente
+        return APIResponse.error(str(e), status_code=400)
+    except Exception as e:
+        return APIResponse.error(str(e), status_code=500)
+
 # --------------------------------------------------------
 # ENDPOINT 2: LISTAR (GET)
 # --------------------------------------------------------
 @pacientes_bp.route('/pacientes', methods=['GET'])
+@usar_replica
 def get_pacientes():
     """
     Obtiene lista paginada de pacientes.
-    Params URL: ?page=1&per_page=10&search=juan
+    Params URL: ?page=1&per_page=10&search=juan&edad_min=60&alerta=sin_telefono&orden=edad
+    Ordenes: nombre (defecto), edad, -edad, alertas
     """
     try:
         # 1. Leer la comanda (Query Params)
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 20, type=int)
-        search = request.args.get('search', None, type=str)
-        distrito_id = request.args.get('distrito_id', None, type=int)
+        orden = request.args.get('orden', 'nombre', type=str)
         
         # 2. El Chef prepara el buffet (Servicio)
         # ⚠️ CORRECCIÓN CRÍTICA: El nombre del método es 'listar_pacientes'
-        resultado = PacienteService.listar_pacientes(
+        # Camino rápido: filas con solo las columnas necesarias (sin objetos ORM)
+        resultado = PacienteService.listar_pacientes_filas(
             page=page, 
             per_page=per_page, 
-            search=search,
-            distrito_id=distrito_id
+            orden=orden,
+            **leer_filtros_listado(request.args)
         )
         
-        # 3. Empaquetar la lista
-        items_json = pacientes_list_schema.dump(resultado['items'])
+        # 3. Empaquetar la lista (serializador rápido, misma salida que PacienteSchema)
+        items_json = PacienteListadoSerializer.dump(resultado['items'])
         
         response_data = {
             'items': items_json,
@@ -107,6 +159,28 @@ def get_pacientes():
         }
         return APIResponse.success(data=response_data)
     
+    except ValueError as e:
+        # Orden o alerta desconocidos
+        return APIResponse.error(str(e), status_code=400)
+    except Exception as e:
+        return APIResponse.error(str(e), status_code=500)
+
+# --------------------------------------------------------
+# ENDPOINT 2.1: RESUMEN DE ALERTAS (GET)
+# --------------------------------------------------------
+@pacientes_bp.route('/pacientes/resumen', methods=['GET'])
+@usar_replica
+def get_resumen_pacientes():
+    """
+    Cuántos pacientes tienen cada alerta y su edad promedio (agregado en la BD).
+    Acepta los mismos filtros que el listado: ?distrito_id=3&edad_min=60
+    """
+    try:
+        return APIResponse.success(
+            data=PacienteService.resumen_alertas(**leer_filtros_listado(request.args))
+        )
+    except ValueError as e:
+        return APIResponse.error(str(e), status_code=400)
     except Exception as e:
         return APIResponse.error(str(e), status_code=500)
 
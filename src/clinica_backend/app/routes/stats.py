@@ -0,0 +1,64 @@
+# src/clinica_backend/app/routes/stats.py
+"""
+BLUEPRINT DE ESTADÍSTICAS (El Tablero del Dashboard)
+Agregados precalculados en vistas materializadas (migración 007).
+Se refrescan con:  flask --app run stats refrescar
+"""
+
+from datetime import date
+
+from flask import Blueprint, request
+
+from app.services.stats_service import StatsService
+from app.utils.replicas import usar_replica
+from app.utils.response import APIResponse
+
+stats_bp = Blueprint('stats', __name__)
+
+
+@stats_bp.route('/stats/ingresos-servicio', methods=['GET'])
+@usar_replica
+def ingresos_por_servicio():
+    """
+    Ingresos por procedimiento (servicio + productos consumidos).
+    Params URL: ?desde=2025-01-01&hasta=2025-06-30&limit=10
+    """
+    try:
+        return APIResponse.success(StatsService.ingresos_por_servicio(
+            desde=request.args.get('desde', None, type=date.fromisoformat),
+            hasta=request.args.get('hasta', None, type=date.fromisoformat),
+            limit=request.args.get('limit', None, type=int)
+        ))
+    except ValueError as e:
+        # limit < 1
+        return APIResponse.error(str(e), 400)
+    except Exception as e:
+        return APIResponse.error(str(e), 500)
+
+
+@stats_bp.route('/stats/edad-sexo', methods=['GET'])
+@usar_replica
+def edad_por_sexo():
+    try:
+        return APIResponse.success(StatsService.edad_por_sexo())
+    except Exception as e:
+        return APIResponse.error(str(e), 500)
+
+
+@stats_bp.route('/stats/pacientes-distrito', methods=['GET'])
+@usar_replica
+def pacientes_por_distrito():
+    try:
+        return APIResponse.success(StatsService.pacientes_por_distrito())
+    except Exception as e:
+        return APIResponse.error(str(e), 500)
+
+
+@stats_bp.route('/stats/estado', methods=['GET'])
+@usar_replica
+def estado_estadisticas():
+    """Último refresco de cada vista (para mostrar "datos al ..." en el dashboard)."""
+    try:
+        return APIResponse.success(StatsService.estado())
+    except Exception as e:
+        return APIResponse.error(str(e), 500)
@@ -21,6 +21,8 @@ Porque SQLAlchemyAutoSchema necesita saber:
 - Qué relaciones existen
 """
 
+from app.schemas.catalogo_schema import ProductoSchema, ServicioSchema
+
 from marshmallow import fields, validate, EXCLUDE
 """
 ¿QUÉ ES 'fields'?
@@ -568,6 +570,33 @@ class ConsultaCreateSchema(ma.SQLAlchemyAutoSchema):
     Si ALGO falla → Devuelve diccionario de errores
     """
     
+# ═══════════════════════════════════════════════════════════
+# SCHEMAS DE RESPUESTA ANIDADOS (Detalle de la Consulta)
+# Cada Nested aquí se traduce en un `selectinload` en la query
+# (ver app/utils/eager_loading.py): Schema y Query NO se desincronizan.
+# ═══════════════════════════════════════════════════════════
+
+class ConsumoProductoResponseSchema(ma.SQLAlchemyAutoSchema):
+    class Meta:
+        model = ConsumoProducto
+        include_fk = True
+        fields = (
+            "id_consumo", "id_producto", "cantidad_consumida",
+            "precio_producto", "importe_venta", "producto"
+        )
+    
+    producto = fields.Nested(ProductoSchema, only=("id_producto", "nombre_producto"))
+
+
+class ConsultaServicioResponseSchema(ma.SQLAlchemyAutoSchema):
+    class Meta:
+        model = ConsultaServicio
+        include_fk = True
+        fields = ("id_consulta_servicio", "id_servicio", "precio_servicio", "servicio", "consumos")
+    
+    servicio = fields.Nested(ServicioSchema, only=("id_servicio", "nombre_servicio"))
+    consumos = fields.List(fields.Nested(ConsumoProductoResponseSchema))
+
 # ═══════════════════════════════════════════════════════════
 # SCHEMA DE RESPUESTA: ConsultaResponseSchema
 # Para serializar (convertir objetos Python → JSON)
@@ -619,6 +648,10 @@ class ConsultaResponseSchema(ma.SQLAlchemyAutoSchema):
     
     fecha_consulta = ma.auto_field()
     total_historico = ma.auto_field()
+    id_paciente = fields.Integer()
+    
+    # Consulta → servicios → consumos → producto
+    servicios = fields.List(fields.Nested(ConsultaServicioResponseSchema))
     
     """
     EJEMPLO DE USO:
@@ -647,4 +680,36 @@ class ConsultaResponseSchema(ma.SQLAlchemyAutoSchema):
     
     ¡Conversión automática de tipos Python → JSON!
     """
-    
\ No newline at end of file
+
+# ═══════════════════════════════════════════════════════════
+# SCHEMAS DE LISTADO (Filas agregadas en SQL, no objetos ORM)
+# ═══════════════════════════════════════════════════════════
+
+class ConsultaResumenSchema(ma.Schema):
+    """
+    Una fila del listado de consultas. Los totales y conteos YA vienen
+    calculados por PostgreSQL (GROUP BY): aqui solo se formatean.
+    """
+    id_consulta = fields.Integer()
+    id_paciente = fields.Integer()
+    nombre_completo = fields.String()
+    fecha_consulta = fields.Date()
+    total_historico = fields.Decimal(as_string=False)
+    num_servicios = fields.Integer()
+    total_servicios = fields.Decimal(as_string=False)
+    num_productos = fields.Integer()
+    total_productos = fields.Decimal(as_string=False)
+    
+    # Solo en el historial de un paciente (funciones de ventana)
+    numero_visita = fields.Integer()
+    gasto_acumulado = fields.Decimal(as_string=False)
+
+
+class HistorialPacienteResumenSchema(ma.Schema):
+    id_paciente = fields.Integer()
+    nombre_completo = fields.String()
+    total_consultas = fields.Integer()
+    gasto_total = fields.Decimal(as_string=False)
+    primera_consulta = fields.Date()
+    ultima_consulta = fields.Date()
+
@@ -6,7 +6,7 @@ from app.extensions import ma # Instancia de Marshmallow configurada para usar S
 #         - SQLAlchemyAutoSchema: Clase base para esquemas que mapean modelos SQLAlchemy
 #         - Integracion ORM -> JSON: Convierte objetos de base de datos a JSON y viceversa
 
-from app.models.inventario import MovimientoStock 
+from app.models.inventario import MovimientoStock, SnapshotStock
 #   - Importa tu Modelo ORM: MovimientoStock
 #   - Contiene:
 #       - Definición de tabla y columnas
@@ -54,4 +54,33 @@ class MovimientoResponseSchema(MovimientoStockSchema):
     stock_nuevo = fields.Function(lambda obj: obj.producto.stock_actual if obj.producto else None)
     
     
-    
\ No newline at end of file
+    
+# Schema liviano para LISTAS del Kardex
+#   - NO toca `obj.producto` por fila (eso disparaba 1 query + 1 lambda por movimiento)
+#   - El producto (nombre, stock) se resuelve UNA vez por respuesta en el Service
+class MovimientoKardexSchema(MovimientoStockSchema):
+    class Meta(MovimientoStockSchema.Meta):
+        fields = ("id_movimiento", "tipo_movimiento", "cantidad", "id_consumo_origen", "fecha_movimiento")
+    
+# Schema para Recepciones de Compra (Muchas lineas en un solo Request)
+class MovimientoBulkSchema(ma.Schema):
+    # No hereda de `SQLAlchemyAutoSchema`: es un sobre (envelope), no una tabla
+    #   - Cada linea se valida con `MovimientoStockSchema`
+    #   - Si UNA linea falla, se rechaza toda la recepcion (Todo o Nada)
+    class Meta:
+        unknown = EXCLUDE
+
+    movimientos = fields.List(
+        fields.Nested(MovimientoStockSchema),
+        required = True,
+        validate = validate.Length(min = 1, max = 500, error = "La recepcion debe tener entre 1 y 500 lineas.")
+    )
+
+# Schema de Solo Lectura para la Fotografia del Kardex
+class SnapshotStockSchema(ma.SQLAlchemyAutoSchema):
+    class Meta:
+        model = SnapshotStock
+        # Solo Salida: Nadie crea snapshots desde la API (los crea el trabajo programado)
+        fields = ("id_snapshot", "id_producto", "fecha_corte", "id_ultimo_movimiento", "saldo")
+    
+    saldo = fields.Decimal(as_string = False)
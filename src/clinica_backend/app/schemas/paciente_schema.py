@@ -1,8 +1,9 @@
 # app/schemas/paciente_schema.py
-from app.extensions import ma
-from app.models.paciente import Paciente
+from app.extensions import ma, mapa_distritos
+from app.models.paciente import ALERTAS, Paciente
 from marshmallow import fields, validate, EXCLUDE
 
+
 class PacienteSchema(ma.SQLAlchemyAutoSchema):
     """
     Schema Maestro para Pacientes.
@@ -31,6 +32,10 @@ class PacienteSchema(ma.SQLAlchemyAutoSchema):
     id_paciente = ma.auto_field(dump_only=True)
     created_at = ma.auto_field(dump_only=True)
     
+    # Distrito anidado: sale del mapa en memoria (app/utils/distritos.py),
+    # no de la relación → serializar no dispara queries
+    distrito = fields.Method("obtener_distrito", dump_only=True)
+    
     # Campos calculados (Vienen de @property en el modelo)
     edad = fields.Integer(dump_only=True)
     alertas = fields.List(fields.String(), dump_only=True)
@@ -50,6 +55,9 @@ class PacienteSchema(ma.SQLAlchemyAutoSchema):
         validate=validate.OneOf(["M", "F", "O"], error="Sexo inválido (M, F, O)")
     )
 
+    def obtener_distrito(self, paciente):
+        return mapa_distritos.como_dict(paciente.id_distrito)
+
 # ─────────────────────────────────────────────────────────────────────
 # SUB-SCHEMAS ESPECIALIZADOS (HERENCIA)
 # ─────────────────────────────────────────────────────────────────────
@@ -68,4 +76,101 @@ class PacienteUpdateSchema(PacienteSchema):
     Usado para actualizaciones parciales (PUT/PATCH).
     El DNI no debería poder cambiarse fácilmente, lo hacemos dump_only aquí.
     """
-    dni = fields.String(dump_only=True) # En Update, el DNI es solo lectura
\ No newline at end of file
+    dni = fields.String(dump_only=True) # En Update, el DNI es solo lectura
+
+class PacienteBulkSchema(ma.Schema):
+    """
+    Registro masivo (POST /pacientes/bulk). Es un sobre, no una tabla:
+    cada paciente se valida con `PacienteCreateSchema`; si UNO falla, se rechaza todo.
+    """
+    class Meta:
+        unknown = EXCLUDE
+
+    pacientes = fields.List(
+        fields.Nested(PacienteCreateSchema),
+        required=True,
+        validate=validate.Length(min=1, max=500, error="El registro debe tener entre 1 y 500 pacientes.")
+    )
+
+# ─────────────────────────────────────────────────────────────────────
+# SERIALIZADOR RÁPIDO PARA LISTADOS (Sin Marshmallow, Sin Objetos ORM)
+# ─────────────────────────────────────────────────────────────────────
+
+class PacienteListadoSerializer:
+    """
+    Camino rápido para listados grandes de pacientes.
+    
+    `PacienteSchema(many=True).dump()` recorre campo por campo cada objeto ORM
+    y recalcula `edad`/`alertas` vía @property. Aquí, en cambio:
+        1. El Service hace un SELECT de SOLO estas columnas (filas = tuplas)
+        2. `edad` y las banderas de alerta vienen YA CALCULADAS por PostgreSQL
+           (expresiones de los @hybrid_property de Paciente)
+        3. `dump()` desempaqueta cada tupla y arma el dict directamente
+    
+    La salida es idéntica a `PacienteSchema().dump(paciente)`.
+    """
+    
+    # El orden importa: `dump()` desempaqueta las filas en este mismo orden
+    columnas = (
+        Paciente.id_paciente,
+        Paciente.dni,
+        Paciente.nombre_completo,
+        Paciente.sexo,
+        Paciente.telefono,
+        Paciente.nacimiento_year,
+        Paciente.nacimiento_month,
+        Paciente.nacimiento_day,
+        Paciente.paciente_problematico,
+        Paciente.created_at,
+        Paciente.id_distrito,
+        Paciente.edad.label('edad'),
+        # Una columna booleana por alerta, en el orden de ALERTAS
+        *(getattr(Paciente, codigo).label(codigo) for codigo in ALERTAS)
+    )
+    # Posición de id_distrito en cada fila (se deriva de `columnas`, no se escribe a mano)
+    POS_ID_DISTRITO = next(i for i, col in enumerate(columnas) if col is Paciente.id_distrito)
+    
+    @staticmethod
+    def ids_distrito(filas):
+        pos = PacienteListadoSerializer.POS_ID_DISTRITO
+        return {fila[pos] for fila in filas}
+    
+    @staticmethod
+    def dump(filas, nombres=None):
+        """
+        Args:
+            filas: Tuplas en el orden de `columnas`
+            nombres (Mapping): {id_distrito: nombre} ya resuelto; None = pedirlo
+                al mapa en memoria (puede recargarlo desde la BD)
+        """
+        resultado = []
+        agregar = resultado.append
+        
+        # El nombre del distrito sale del mapa en memoria (sin JOIN en la query)
+        filas = list(filas)
+        if nombres is None:
+            nombres = mapa_distritos.nombres(requeridos=PacienteListadoSerializer.ids_distrito(filas))
+        
+        for (id_paciente, dni, nombre_completo, sexo, telefono, year, month, day,
+             problematico, created_at, id_distrito, edad, *banderas) in filas:
+            agregar({
+                "id_paciente": id_paciente,
+                "dni": dni,
+                "nombre_completo": nombre_completo,
+                "sexo": sexo,
+                "telefono": telefono,
+                "nacimiento_year": year,
+                "nacimiento_month": month,
+                "nacimiento_day": day,
+                "paciente_problematico": problematico,
+                "created_at": created_at.isoformat() if created_at else None,
+                "distrito": (
+                    {"id_distrito": id_distrito, "nombre_distrito": nombres.get(id_distrito)}
+                    if id_distrito else None
+                ),
+                "edad": edad,
+                "alertas": [codigo for codigo, activa in zip(ALERTAS, banderas) if activa]
+            })
+        
+        return resultado
+
@@ -8,7 +8,7 @@
 # PARTE 1: IMPORTACIONES
 # ======================================================================================================
 
-from app.extensions import db
+from app.extensions import db, cache
     # Objetoo SQLAlchemy ya inicialzado en Flask
     #   - Contiene: (Conexiones DB, Session Manger, Mapear ORM)
     #   - Recibe = add
@@ -26,7 +26,9 @@ from app.models.servicio import Servicio
     #   = Tiene Claves Primarias
     #   = Tiene Relaciones
     
-from sqlalchemy import IntegrityError
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
     # Importa el error que ocurre cuando rompes reglas de BD 
     #   Ejemplo: INsertar duplicados, violar Claves Foraneas , insert null donde no debe
 # ======================================================================================================
@@ -44,12 +46,19 @@ class CatalogoService:
     #   - Validaciones 
     #   - NO habla (HTTP, No recibe Request, No retonra JSON)
     
+    # Claves de cache de los listados (ver app/utils/cache.py)
+    #   - Las rutas GET las leen con `cache.get_or_set`
+    #   - Los `crear_*` las invalidan justo despues del commit
+    CACHE_MARCAS = 'catalogo:marcas'
+    CACHE_PRODUCTOS = 'catalogo:productos'
+    CACHE_SERVICIOS = 'catalogo:servicios'
+    
     # --------------------------- MARCAS ---------------------------------------
     @staticmethod # No necesitamos instanciar la Lcase 
     def crear_marca(data):
         
         # Verificar que no existe la Marca
-        if Marca.query.filter_by(nombre_marca = ['nombre_marca']).first():
+        if Marca.query.filter_by(nombre_marca = data['nombre_marca']).first():
             # `filter_by` = 'SELECT * FROM marca WHERE nombre_marca = ?'
             raise ValueError(f"La Marca f{data['nombre_marca']} ya existe.")
         
@@ -61,6 +70,7 @@ class CatalogoService:
         try:
             db.session.add(nueva_marca)
             db.session.commit()
+            cache.invalidar(CatalogoService.CACHE_MARCAS)
             return nueva_marca
         except Exception as e:
             db.session.rollback()
@@ -69,7 +79,12 @@ class CatalogoService:
     @staticmethod
     def listar_marcas(): 
         # `SQL`: 'SELECT * FROM marca ORDER BY nombre_marca
-        return Marca.query.order_by(Marca.nonombre_marca).all()
+        return db.session.scalars(CatalogoService.sentencia_marcas()).all()
+    
+    @staticmethod
+    def sentencia_marcas():
+        # Select puro: lo ejecuta la sesion normal y la async (lecturas_async.py)
+        return select(Marca).order_by(Marca.nombre_marca)
     
     @staticmethod
     def crear_producto(data):
@@ -85,6 +100,8 @@ class CatalogoService:
         try:
             db.session.add(nuevo_producto)
             db.session.commit()
+            cache.invalidar(CatalogoService.CACHE_PRODUCTOS)
+            return nuevo_producto
         except Exception as e:
             db.session.rollback()
             raise e
@@ -92,7 +109,14 @@ class CatalogoService:
     @staticmethod
     def listar_productos():
         # `SQL`: 'SELECT * FROM producto ORDER BY nombre_producto
-        return Producto.query.order_by(Producto.nombre_producto).all() 
+        # `selectinload`: la marca de TODOS los productos en una sola query extra (sin N+1)
+        return db.session.scalars(CatalogoService.sentencia_productos()).all()
+    
+    @staticmethod
+    def sentencia_productos():
+        return select(Producto).options(
+            selectinload(Producto.marca)
+        ).order_by(Producto.nombre_producto)
     
     # ============ SERVICIOS =====================================
     @staticmethod # No necesitamos instanciar la CLASE
@@ -106,6 +130,7 @@ class CatalogoService:
         try:
             db.session.add(nuevo_servicio)
             db.session.commit()
+            cache.invalidar(CatalogoService.CACHE_SERVICIOS)
             return nuevo_servicio
         except Exception as e:
             db.session.rollback()
@@ -113,6 +138,10 @@ class CatalogoService:
         
     @staticmethod 
     def listar_servicios(): 
-        return  Servicio.query.order_by(Servicio.nombre_servicio.asc()).all()
+        return db.session.scalars(CatalogoService.sentencia_servicios()).all()
+    
+    @staticmethod
+    def sentencia_servicios():
+        return select(Servicio).order_by(Servicio.nombre_servicio.asc())
     
             
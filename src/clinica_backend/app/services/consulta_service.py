@@ -1,6 +1,6 @@
 # src/clinica_backend/app/services/consulta_service.py
 
-from app.extensions import db
+from app.extensions import db, cache
 """
 ¿QUÉ ES 'db'?
 -------------
@@ -30,12 +30,22 @@ from app.models.consulta import Consulta, ConsultaServicio, ConsumoProducto
 from app.models.paciente import Paciente
 from app.models.servicio import Servicio
 from app.models.producto import Producto
+from app.services.catalogo_service import CatalogoService
+from app.schemas.consulta_schema import ConsultaResponseSchema
+from app.utils.eager_loading import opciones_carga
+from app.utils.metrics import contar_consulta_creada, contar_movimientos
+from app.utils.pagination import codificar_cursor, filtro_keyset
+
+from sqlalchemy import func, select
+
+# Las cadenas `selectinload` se calculan UNA vez, a partir del Schema de respuesta
+OPCIONES_LECTURA = opciones_carga(Consulta, ConsultaResponseSchema())
 
 # ------------------------------------
 # CLASE DEL SERVICIO 
 # ------------------------------------
 
-class ConsulaService:
+class ConsultaService:
     """
     Servicio para manejar operaciones relacionadas con consultas medicas 
     
@@ -90,12 +100,13 @@ class ConsulaService:
             consulta = Consulta(
                 id_paciente = data["id_paciente"],
                 notas_generales = data.get("notas_generales"),
-                fecha_consulta = data.get("fecha_consulta") # Puede ser None(Usara Default)
+                fecha_consulta = data.get("fecha_consulta"), # Puede ser None(Usara Default)
                 total_historico = 0 # Calcularemos esto Sumando
             )
             db.session.add(consulta)
             db.session.flush() # Para obtener el id_consulta generado
             total_acumulado = 0 
+            consumos_registrados = 0
         
             """
             -------------------------------------
@@ -227,6 +238,7 @@ class ConsulaService:
                             importe_venta = importe
                         )
                         db.session.add(nuevo_consumo)
+                        consumos_registrados += 1
                         
             # ═══════════════════════════════════════════════════════════
             # PASO 5: FINALIZAR TRANSACCIÓN
@@ -235,9 +247,204 @@ class ConsulaService:
             # D. Actualizar Total y Cerrar
             consulta.total_historico = total_acumulado
             db.session.commit()
-            return consulta
+            
+            # Los consumos descontaron stock (trigger): el listado cacheado de productos quedo viejo
+            cache.invalidar(CatalogoService.CACHE_PRODUCTOS)
+            
+            # Metricas: cada consumo genero una SALIDA en movimientos_stock (trigger)
+            contar_consulta_creada()
+            contar_movimientos(['SALIDA'] * consumos_registrados)
         
         except Exception as e:
             db.session.rollback()
             raise e
-        
\ No newline at end of file
+        
+        # Releer con el arbol completo precargado (5 queries fijas en lugar de 1 + N + M + K)
+        return ConsultaService.obtener_consulta(consulta.id_consulta)
+    
+    # ═══════════════════════════════════════════════════════════
+    # LECTURAS (Con Carga Anticipada)
+    # ═══════════════════════════════════════════════════════════
+    
+    @staticmethod
+    def query_lectura():
+        """
+        Query base para TODA lectura de consultas que se serialice con
+        `ConsultaResponseSchema`: ya trae los `selectinload` de
+        servicios → servicio, servicios → consumos → producto.
+        """
+        return Consulta.query.options(*OPCIONES_LECTURA)
+    
+    @staticmethod
+    def obtener_consulta(id_consulta):
+        """
+        Obtiene una consulta con todo su detalle.
+        
+        Returns:
+            Consulta o None si no existe
+        """
+        return ConsultaService.query_lectura().filter(
+            Consulta.id_consulta == id_consulta
+        ).first()
+    
+    # ═══════════════════════════════════════════════════════════
+    # LISTADOS (Agregados en SQL, Paginación Keyset)
+    # ═══════════════════════════════════════════════════════════
+    
+    @staticmethod
+    def _pagina_agregada(filtros, desde=None, cursor=None, limit=50, con_historial=False):
+        """
+        Arma y ejecuta el listado de consultas en UNA sola sentencia SQL:
+        
+            WITH pagina AS (... LIMIT n+1)          -- Solo las filas de ESTA pagina
+            serv  AS (GROUP BY id_consulta)         -- N° y total de servicios de la pagina
+            prod  AS (GROUP BY id_consulta)         -- N° y total de productos de la pagina
+            SELECT pagina + serv + prod + paciente
+        
+        Los GROUP BY solo recorren las consultas de la pagina, no toda la tabla.
+        
+        Con `con_historial` agrega funciones de ventana sobre TODA la historia del
+        paciente (numero de visita y gasto acumulado). El filtro keyset es seguro
+        para la ventana: en orden descendente solo descarta consultas MAS NUEVAS.
+        """
+        orden_keyset = [Consulta.fecha_consulta, Consulta.id_consulta]
+        
+        columnas = [
+            Consulta.id_consulta,
+            Consulta.id_paciente,
+            Consulta.fecha_consulta,
+            Consulta.total_historico
+        ]
+        if con_historial:
+            orden_cronologico = (Consulta.fecha_consulta, Consulta.id_consulta)
+            columnas += [
+                func.row_number().over(order_by = orden_cronologico).label('numero_visita'),
+                func.sum(Consulta.total_historico).over(
+                    order_by = orden_cronologico,
+                    rows = (None, 0)
+                ).label('gasto_acumulado')
+            ]
+        
+        base = select(*columnas).where(*filtros)
+        if cursor:
+            base = base.where(filtro_keyset(orden_keyset, cursor))
+        base = base.subquery('base')
+        
+        # `desde` se aplica DESPUES de la ventana para no recortar el acumulado
+        pagina = select(base)
+        if desde:
+            pagina = pagina.where(base.c.fecha_consulta >= desde)
+        pagina = pagina.order_by(
+            base.c.fecha_consulta.desc(),
+            base.c.id_consulta.desc()
+        ).limit(limit + 1).cte('pagina')
+        
+        serv = select(
+            ConsultaServicio.id_consulta,
+            func.count(ConsultaServicio.id_consulta_servicio).label('num_servicios'),
+            func.sum(ConsultaServicio.precio_servicio).label('total_servicios')
+        ).join(
+            pagina, pagina.c.id_consulta == ConsultaServicio.id_consulta
+        ).group_by(ConsultaServicio.id_consulta).subquery('serv')
+        
+        prod = select(
+            ConsultaServicio.id_consulta,
+            func.count(ConsumoProducto.id_consumo).label('num_productos'),
+            func.sum(ConsumoProducto.importe_venta).label('total_productos')
+        ).join(
+            ConsumoProducto,
+            ConsumoProducto.id_consulta_servicio == ConsultaServicio.id_consulta_servicio
+        ).join(
+            pagina, pagina.c.id_consulta == ConsultaServicio.id_consulta
+        ).group_by(ConsultaServicio.id_consulta).subquery('prod')
+        
+        stmt = select(
+            pagina,
+            Paciente.nombre_completo,
+            func.coalesce(serv.c.num_servicios, 0).label('num_servicios'),
+            func.coalesce(serv.c.total_servicios, 0).label('total_servicios'),
+            func.coalesce(prod.c.num_productos, 0).label('num_productos'),
+            func.coalesce(prod.c.total_productos, 0).label('total_productos')
+        ).join(
+            Paciente, Paciente.id_paciente == pagina.c.id_paciente
+        ).outerjoin(
+            serv, serv.c.id_consulta == pagina.c.id_consulta
+        ).outerjoin(
+            prod, prod.c.id_consulta == pagina.c.id_consulta
+        ).order_by(
+            pagina.c.fecha_consulta.desc(),
+            pagina.c.id_consulta.desc()
+        )
+        
+        filas = db.session.execute(stmt).all()
+        
+        # Pedimos UNA fila extra: si llega, hay otra pagina (sin COUNT)
+        hay_mas = len(filas) > limit
+        filas = filas[:limit]
+        
+        siguiente = None
+        if hay_mas:
+            siguiente = codificar_cursor([filas[-1].fecha_consulta, filas[-1].id_consulta])
+        
+        return {
+            'items': [fila._asdict() for fila in filas],
+            'next_cursor': siguiente,
+            'limit': limit
+        }
+    
+    @staticmethod
+    def listar_consultas(desde=None, hasta=None, cursor=None, limit=50):
+        """
+        Listado general de consultas (mas recientes primero).
+        
+        Args:
+            desde (date): Fecha inicial (inclusive)
+            hasta (date): Fecha final (inclusive)
+            cursor (str): `next_cursor` de la pagina anterior
+        """
+        filtros = []
+        if hasta:
+            filtros.append(Consulta.fecha_consulta <= hasta)
+        
+        return ConsultaService._pagina_agregada(filtros, desde=desde, cursor=cursor, limit=limit)
+    
+    @staticmethod
+    def historial_paciente(id_paciente, desde=None, hasta=None, cursor=None, limit=50):
+        """
+        Historia clinica de UN paciente: resumen global + pagina de consultas.
+        
+        Returns:
+            dict | None: None si el paciente no existe (igual que `obtener_consulta`)
+        
+        Raises:
+            ValueError: Cursor manipulado o limit invalido
+        """
+        # Resumen en UNA query agregada (y de paso confirma que el paciente existe)
+        resumen = db.session.query(
+            Paciente.id_paciente,
+            Paciente.nombre_completo,
+            func.count(Consulta.id_consulta).label('total_consultas'),
+            func.coalesce(func.sum(Consulta.total_historico), 0).label('gasto_total'),
+            func.min(Consulta.fecha_consulta).label('primera_consulta'),
+            func.max(Consulta.fecha_consulta).label('ultima_consulta')
+        ).outerjoin(
+            Consulta, Consulta.id_paciente == Paciente.id_paciente
+        ).filter(
+            Paciente.id_paciente == id_paciente
+        ).group_by(
+            Paciente.id_paciente, Paciente.nombre_completo
+        ).first()
+        
+        if not resumen:
+            return None
+        
+        filtros = [Consulta.id_paciente == id_paciente]
+        if hasta:
+            filtros.append(Consulta.fecha_consulta <= hasta)
+        
+        pagina = ConsultaService._pagina_agregada(
+            filtros, desde=desde, cursor=cursor, limit=limit, con_historial=True
+        )
+        pagina['resumen'] = resumen._asdict()
+        return pagina
+
@@ -1,8 +1,18 @@
 # src/clinica_backen/app/services/inventario_service.py
 
-from app.extensions import db
-from app.models.inventario import MovimientoStock
+from collections import defaultdict
+from decimal import Decimal
+
+from datetime import timedelta
+
+from sqlalchemy import insert, select, text
+
+from app.extensions import db, cache
+from app.models.inventario import MovimientoStock, SnapshotStock
 from app.models.producto import Producto
+from app.services.catalogo_service import CatalogoService
+from app.utils.metrics import contar_movimientos
+from app.utils.pagination import armar_pagina, ordenar_keyset
 
 class InventarioService:
     """
@@ -12,6 +22,9 @@ class InventarioService:
     Confia en que los Triggers de PostgreSQL actualizaran el stock_actual.
     """
     
+    # Orden del Kardex paginado (la ultima columna es unica: desempata)
+    COLUMNAS_KARDEX = (MovimientoStock.fecha_movimiento, MovimientoStock.id_movimiento)
+    
     @staticmethod
     def registrar_movimiento_manual(data):
         """
@@ -45,6 +58,9 @@ class InventarioService:
         try:
             db.session.add(nuevo_movimiento)
             db.session.commit()
+            # El listado cacheado del catalogo incluye `stock_actual`
+            cache.invalidar(CatalogoService.CACHE_PRODUCTOS)
+            contar_movimientos([tipo])
             
             # Refrescar la Memoria (Paso Critico)
             # El Trigger de SQL ya corrio en milisegundos y actualizo el producto 
@@ -60,13 +76,236 @@ class InventarioService:
             db.session.rollback()
             raise e 
     
+    @staticmethod
+    def registrar_movimientos_bulk(lineas):
+        """
+        Procesa una Recepcion de Compra completa (N lineas) en UNA transaccion.
+        
+        Costo en Queries (independiente de N):
+            1. SELECT de todos los productos referenciados (IN (...))
+            2. INSERT multi-fila en movimientos_stock (el Trigger corre 1 vez por fila)
+            3. SELECT del stock resultante (IN (...))
+        
+        Args:
+            lineas (list[dict]): Lineas validadas por `MovimientoStockSchema`
+            
+        Returns:
+            dict: {'ids_movimientos': [...], 'stock': [{id_producto, nombre_producto, stock_actual}]}
+        """
+        ids_productos = {linea['id_producto'] for linea in lineas}
+        
+        # 1. Cargar TODOS los productos de una vez (en lugar de un `query.get` por linea)
+        productos = {
+            p.id_producto: p
+            for p in Producto.query.filter(Producto.id_producto.in_(ids_productos)).all()
+        }
+        
+        faltantes = sorted(ids_productos - productos.keys())
+        if faltantes:
+            raise ValueError(f"Productos no existen en el Catalogo: {faltantes}")
+        
+        # 2. Validacion de Negocio (Stock Negativo) con el efecto NETO por producto
+        #   - Una recepcion puede traer ENTRADA y SALIDA del mismo producto
+        delta_por_producto = defaultdict(Decimal)
+        for linea in lineas:
+            cantidad = Decimal(linea['cantidad'])
+            if linea['tipo_movimiento'] == 'SALIDA':
+                delta_por_producto[linea['id_producto']] -= cantidad
+            else:
+                delta_por_producto[linea['id_producto']] += cantidad
+        
+        for id_producto, delta in delta_por_producto.items():
+            producto = productos[id_producto]
+            saldo = (producto.stock_actual or 0) + delta
+            if saldo < 0:
+                raise ValueError(
+                    f"Stock Insuficiente para {producto.nombre_producto}. "
+                    f"Tienes {producto.stock_actual}, la recepcion deja {saldo}"
+                )
+        
+        # 3. Registrar los Hechos en UN solo INSERT multi-fila
+        # No Tocamos la Tabla de Productos: el Trigger `trig_after_movimiento_stock` lo hace por fila
+        filas = [
+            {
+                'id_producto': linea['id_producto'],
+                'tipo_movimiento': linea['tipo_movimiento'],
+                'cantidad': linea['cantidad']
+            }
+            for linea in lineas
+        ]
+        
+        try:
+            resultado = db.session.execute(
+                insert(MovimientoStock).values(filas).returning(MovimientoStock.id_movimiento)
+            )
+            ids_movimientos = [fila.id_movimiento for fila in resultado]
+            
+            # 4. Leer el Stock Fresco (ya actualizado por los Triggers) en UNA lectura
+            # Usamos columnas sueltas: no necesitamos refrescar objetos ORM uno por uno
+            stock = db.session.query(
+                Producto.id_producto,
+                Producto.nombre_producto,
+                Producto.stock_actual
+            ).filter(
+                Producto.id_producto.in_(ids_productos)
+            ).order_by(Producto.id_producto).all()
+            
+            db.session.commit()
+            cache.invalidar(CatalogoService.CACHE_PRODUCTOS)
+            contar_movimientos(linea['tipo_movimiento'] for linea in lineas)
+        
+        except Exception as e:
+            db.session.rollback()
+            raise e
+        
+        return {
+            'ids_movimientos': ids_movimientos,
+            'stock': [
+                {
+                    'id_producto': fila.id_producto,
+                    'nombre_producto': fila.nombre_producto,
+                    'stock_actual': fila.stock_actual
+                }
+                for fila in stock
+            ]
+        }
+    
     @staticmethod
     def obtener_kardex(id_producto):
-        """ Devuelve la Histotia comple de un producto"""
-        return MovimientoStock.query.filter_by(
+        """
+        Devuelve el Kardex COMPACTADO de un producto:
+            - snapshot: Ultima fotografia del saldo (o None si aun no hay)
+            - movimientos: SOLO los movimientos posteriores al snapshot
+        
+        El costo ya no crece con la historia del producto: crece con lo que
+        paso desde el ultimo `flask inventario snapshots`.
+        """
+        snapshot = SnapshotStock.query.filter_by(
             id_producto = id_producto
         ).order_by(
-            MovimientoStock.fecha_movimiento.desc()
+            SnapshotStock.id_ultimo_movimiento.desc()
+        ).first()
+        
+        query = MovimientoStock.query.filter_by(id_producto = id_producto)
+        if snapshot:
+            query = query.filter(MovimientoStock.id_movimiento > snapshot.id_ultimo_movimiento)
+        
+        movimientos = query.order_by(
+            MovimientoStock.fecha_movimiento.desc(),
+            MovimientoStock.id_movimiento.desc()
+        ).all()
+        
+        return {
+            'snapshot': snapshot,
+            'movimientos': movimientos
+        }
+    
+    @staticmethod
+    def obtener_resumen_producto(id_producto):
+        """
+        Cabecera del Kardex: nombre y stock del producto en UNA lectura.
+        Se resuelve una sola vez por respuesta (no por cada movimiento).
+        
+        Raises:
+            ValueError: Si el producto no existe
+        """
+        fila = db.session.execute(
+            InventarioService.sentencia_resumen_producto(id_producto)
+        ).first()
+        return InventarioService.resumen_desde_fila(fila, id_producto)
+    
+    @staticmethod
+    def sentencia_resumen_producto(id_producto):
+        return select(
+            Producto.id_producto,
+            Producto.nombre_producto,
+            Producto.stock_actual
+        ).where(Producto.id_producto == id_producto)
+    
+    @staticmethod
+    def resumen_desde_fila(fila, id_producto):
+        if not fila:
+            raise ValueError(f"Producto ID {id_producto} no existe en el Catalogo")
+        
+        return {
+            'id_producto': fila.id_producto,
+            'nombre_producto': fila.nombre_producto,
+            'stock_actual': fila.stock_actual
+        }
+    
+    @staticmethod
+    def _filtrar_por_fechas(query, desde=None, hasta=None):
+        """Aplica el rango de fechas (ambos inclusive) a una Query o a un Select."""
+        if desde:
+            query = query.filter(MovimientoStock.fecha_movimiento >= desde)
+        if hasta:
+            # `hasta` es un dia completo: todo lo anterior a la medianoche siguiente
+            query = query.filter(MovimientoStock.fecha_movimiento < hasta + timedelta(days=1))
+        return query
+    
+    @staticmethod
+    def obtener_kardex_rango(id_producto, desde=None, hasta=None, cursor=None, limit=50):
+        """
+        Consulta historica del Kardex por rango de fechas con paginacion KEYSET
+        sobre (fecha_movimiento, id_movimiento). Cada pagina cuesta lo mismo,
+        sin importar cuan atras en la historia este.
+        
+        Args:
+            desde (date): Fecha inicial (inclusive)
+            hasta (date): Fecha final (inclusive)
+            cursor (str): `next_cursor` de la pagina anterior (None = primera)
+        """
+        filas = db.session.scalars(
+            InventarioService.sentencia_kardex_rango(id_producto, desde, hasta, cursor, limit)
         ).all()
+        return armar_pagina(filas, InventarioService.COLUMNAS_KARDEX, limit)
+    
+    @staticmethod
+    def sentencia_kardex_rango(id_producto, desde=None, hasta=None, cursor=None, limit=50):
+        """Select de una pagina del Kardex (compartido con la ruta async)."""
+        stmt = select(MovimientoStock).where(MovimientoStock.id_producto == id_producto)
+        stmt = InventarioService._filtrar_por_fechas(stmt, desde, hasta)
+        return ordenar_keyset(stmt, InventarioService.COLUMNAS_KARDEX, cursor, limit)
+    
+    @staticmethod
+    def iterar_kardex(id_producto, desde=None, hasta=None, tamano_lote=1000):
+        """
+        Generador para EXPORTAR el Kardex completo sin cargarlo en memoria.
+        
+        `yield_per` hace que psycopg2 use un cursor del lado del servidor:
+        PostgreSQL entrega las filas de a `tamano_lote` en lugar de todas juntas.
+        Devuelve filas livianas (Row), no objetos ORM.
+        """
+        stmt = select(
+            MovimientoStock.id_movimiento,
+            MovimientoStock.fecha_movimiento,
+            MovimientoStock.tipo_movimiento,
+            MovimientoStock.cantidad,
+            MovimientoStock.id_consumo_origen
+        ).filter(
+            MovimientoStock.id_producto == id_producto
+        )
+        stmt = InventarioService._filtrar_por_fechas(stmt, desde, hasta)
+        stmt = stmt.order_by(
+            MovimientoStock.fecha_movimiento.desc(),
+            MovimientoStock.id_movimiento.desc()
+        ).execution_options(yield_per = tamano_lote)
+        
+        yield from db.session.execute(stmt)
+    
+    @staticmethod
+    def generar_snapshots():
+        """
+        Trabajo Programado: Compacta el Kardex de todos los productos con movimientos nuevos.
+        La logica vive en PostgreSQL (`sp_generar_snapshots_stock`, migracion 005).
         
-        
\ No newline at end of file
+        Returns:
+            int: Numero de snapshots creados
+        """
+        try:
+            creados = db.session.execute(text('SELECT sp_generar_snapshots_stock()')).scalar()
+            db.session.commit()
+            return creados
+        except Exception as e:
+            db.session.rollback()
+            raise e
@@ -0,0 +1,57 @@
+# src/clinica_backend/app/services/lecturas_async.py
+"""
+LECTURAS ASYNC (Versión await de los Services de lectura)
+
+No repite lógica: ejecuta con una AsyncSession los MISMOS Select que arman
+PacienteService, InventarioService y CatalogoService (`sentencia_*`), y arma
+la respuesta con sus mismos helpers. Cambiar un filtro en el Service lo
+cambia en ambos caminos.
+"""
+
+from app.services.catalogo_service import CatalogoService
+from app.services.inventario_service import InventarioService
+from app.services.paciente_service import PacienteService
+from app.utils.pagination import armar_pagina
+
+
+class LecturasAsyncService:
+
+    # ---------------------------- CATÁLOGO ----------------------------
+    @staticmethod
+    async def listar_marcas(session):
+        return (await session.scalars(CatalogoService.sentencia_marcas())).all()
+
+    @staticmethod
+    async def listar_productos(session):
+        # selectinload funciona igual en async: la marca llega en una query extra
+        return (await session.scalars(CatalogoService.sentencia_productos())).all()
+
+    @staticmethod
+    async def listar_servicios(session):
+        return (await session.scalars(CatalogoService.sentencia_servicios())).all()
+
+    # ---------------------------- PACIENTES ---------------------------
+    @staticmethod
+    async def listar_pacientes_filas(session, page=1, per_page=20, orden='nombre', **filtros):
+        page, per_page = PacienteService.acotar_pagina(page, per_page)
+        stmt_total, stmt_filas = PacienteService.sentencias_listado_filas(
+            page, per_page, orden, **filtros
+        )
+        total = await session.scalar(stmt_total)
+        filas = (await session.execute(stmt_filas)).all()
+        return PacienteService.pagina_filas(filas, total, page, per_page)
+
+    # ----------------------------- KARDEX -----------------------------
+    @staticmethod
+    async def obtener_resumen_producto(session, id_producto):
+        fila = (await session.execute(
+            InventarioService.sentencia_resumen_producto(id_producto)
+        )).first()
+        return InventarioService.resumen_desde_fila(fila, id_producto)
+
+    @staticmethod
+    async def obtener_kardex_rango(session, id_producto, desde=None, hasta=None, cursor=None, limit=50):
+        filas = (await session.scalars(
+            InventarioService.sentencia_kardex_rango(id_producto, desde, hasta, cursor, limit)
+        )).all()
+        return armar_pagina(filas, InventarioService.COLUMNAS_KARDEX, limit)
@@ -8,10 +8,13 @@ FUNDAMENTO CS: Separación de Responsabilidades (Separation of Concerns)
 3. MANTENIBILIDAD: Facilita pruebas y cambios en la lógica sin afectar otras
 """
 
-from app.extensions import db
+from collections import Counter
+
+from app.extensions import db, mapa_distritos
 # Importamos modelos explícitamente para evitar confusión
-from app.models.paciente import Paciente 
-from app.models.distrito import Distrito
+from app.models.paciente import ALERTAS, Paciente
+from app.schemas.paciente_schema import PacienteListadoSerializer
+from sqlalchemy import func, select
 from sqlalchemy.exc import IntegrityError
 
 class PacienteService:
@@ -24,6 +27,17 @@ class PacienteService:
     - Recibe Dicts (Python): snake_case del Guardian Schema
     - Devuelve Objetos de la Despensa (Modelos ORM) Al Mesero Routes
     """
+    
+    # Ordenes aceptados en ?orden= (edad/alertas se calculan en PostgreSQL)
+    ORDENES_LISTADO = {
+        'nombre': (Paciente.nombre_completo.asc(),),
+        'edad': (Paciente.edad.asc().nulls_last(), Paciente.nombre_completo.asc()),
+        '-edad': (Paciente.edad.desc().nulls_last(), Paciente.nombre_completo.asc()),
+        'alertas': (Paciente.cantidad_alertas.desc(), Paciente.nombre_completo.asc()),
+    }
+    
+    # Tope de ?per_page= en el listado (como el `limit` de consultas y kardex)
+    MAX_POR_PAGINA = 100
 
     @staticmethod
     def crear_paciente(data):
@@ -34,13 +48,13 @@ class PacienteService:
             data (dict): Datos del Paciente (Ya Validados y en snake case)
         """
         
-        # Regla de Negocio N1: Verificar que DNI no Exista
-        if Paciente.buscar_por_dni(data.get('dni')):
+        # Regla de Negocio N1: Verificar que DNI no Exista (caché de DNIs → sin query si ya lo conoce)
+        if data.get('dni') in Paciente.buscar_por_dnis([data.get('dni')]):
             raise ValueError(f"Ya Existe un Paciente con ese DNI {data.get('dni')}")
         
-        # Regla de Neocio N2: Verificar Distrito Existe
+        # Regla de Neocio N2: Verificar Distrito Existe (mapa en memoria → sin query)
         if data.get('id_distrito'):
-            if not Distrito.query.get(data.get('id_distrito')):
+            if mapa_distritos.faltantes([data.get('id_distrito')]):
                 raise ValueError(f"Distrito con id {data.get('id_distrito')} no Existe")
 
         # 3. Creacion de Objeto
@@ -81,6 +95,38 @@ class PacienteService:
             db.session.rollback()
             raise e
         
+    @staticmethod
+    def crear_pacientes_bulk(lista_data):
+        """
+        Registra muchos pacientes en UNA transacción (Todo o Nada).
+        
+        Las mismas reglas que `crear_paciente`, pero verificadas en lote:
+            - DNIs repetidos dentro del mismo envío
+            - DNIs ya registrados   → UNA query (o ninguna, si el caché los conoce)
+            - Distritos inexistentes → mapa en memoria (sin query)
+        
+        Returns:
+            list[int]: IDs de los pacientes creados, en el orden recibido
+        """
+        dnis = [data.get('dni') for data in lista_data if data.get('dni')]
+        repetidos = sorted(dni for dni, veces in Counter(dnis).items() if veces > 1)
+        if repetidos:
+            raise ValueError(f"DNIs repetidos en el envío: {', '.join(repetidos)}")
+        
+        existentes = Paciente.buscar_por_dnis(dnis)
+        if existentes:
+            raise ValueError(f"Ya existen pacientes con DNI: {', '.join(sorted(existentes))}")
+        
+        inexistentes = mapa_distritos.faltantes(data.get('id_distrito') for data in lista_data)
+        if inexistentes:
+            raise ValueError(f"Distritos inexistentes: {sorted(inexistentes)}")
+        
+        try:
+            return Paciente.bulk_save([Paciente(**data) for data in lista_data])
+        except IntegrityError as e:
+            # Otro proceso registró uno de estos DNIs entre la verificación y el INSERT
+            raise ValueError(f"Error de integridad: {str(e)}")
+    
     @staticmethod
     def obtener_paciente(id_paciente):
         """
@@ -94,27 +140,60 @@ class PacienteService:
         return Paciente.query.get(id_paciente)
     
     @staticmethod
-    def listar_pacientes(page=1, per_page=20, search=None, distrito_id=None):
+    def _filtros_listado(search=None, distrito_id=None, edad_min=None, edad_max=None, alertas=None):
         """
-        Lista Pacientes con paginación y filtros.
-        IMPORTANTE: En la ruta (Controller) debes llamar a este método exactamente así:
-        PacienteService.listar_pacientes(...)
+        Condiciones WHERE compartidas por los dos caminos de listado.
+        
+        Args:
+            edad_min / edad_max (int): Rango de edad (inclusive), calculado en SQL
+            alertas (list[str]): Solo pacientes con TODAS estas alertas, ej: ['sin_telefono']
+        
+        Raises:
+            ValueError: Si una alerta no existe
         """
-        query = Paciente.query
+        filtros = []
         
         # Filtro de Búsqueda (Nombre o DNI)
         if search:
-            query = query.filter(
+            filtros.append(
                 (Paciente.nombre_completo.ilike(f'%{search}%')) | 
                 (Paciente.dni.ilike(f'%{search}%'))
             )
         
         # Filtro por Distrito
         if distrito_id:
-            query = query.filter_by(id_distrito=distrito_id)
+            filtros.append(Paciente.id_distrito == distrito_id)
+        
+        # Filtros calculados (expresiones de los @hybrid_property)
+        if edad_min is not None:
+            filtros.append(Paciente.edad >= edad_min)
+        if edad_max is not None:
+            filtros.append(Paciente.edad <= edad_max)
+        
+        for codigo in alertas or ():
+            if codigo not in ALERTAS:
+                raise ValueError(f"Alerta desconocida: '{codigo}'. Opciones: {', '.join(ALERTAS)}")
+            filtros.append(getattr(Paciente, codigo))
+        
+        return filtros
+    
+    @staticmethod
+    def _orden_listado(orden):
+        if orden not in PacienteService.ORDENES_LISTADO:
+            raise ValueError(f"Orden inválido: '{orden}'. Opciones: {', '.join(PacienteService.ORDENES_LISTADO)}")
+        return PacienteService.ORDENES_LISTADO[orden]
+    
+    @staticmethod
+    def listar_pacientes(page=1, per_page=20, orden='nombre', **filtros):
+        """
+        Lista Pacientes con paginación y filtros.
+        IMPORTANTE: En la ruta (Controller) debes llamar a este método exactamente así:
+        PacienteService.listar_pacientes(...)
+        """
+        query = Paciente.query.filter(*PacienteService._filtros_listado(**filtros))
         
-        # Ordenamiento por defecto
-        query = query.order_by(Paciente.nombre_completo.asc())
+        # Ordenamiento (por defecto: nombre)
+        query = query.order_by(*PacienteService._orden_listado(orden))
         
         # Paginación
         pagination = query.paginate(page=page, per_page=per_page, error_out=False)
@@ -127,6 +206,83 @@ class PacienteService:
             'pages': pagination.pages
         }
     
+    @staticmethod
+    def listar_pacientes_filas(page=1, per_page=20, orden='nombre', **filtros):
+        """
+        Igual que `listar_pacientes`, pero devuelve FILAS (tuplas) con solo las
+        columnas de `PacienteListadoSerializer.columnas`, listas para su `dump()`.
+        Sin objetos ORM: ni identity map, ni @property por fila.
+        """
+        page, per_page = PacienteService.acotar_pagina(page, per_page)
+        stmt_total, stmt_filas = PacienteService.sentencias_listado_filas(
+            page, per_page, orden, **filtros
+        )
+        
+        total = db.session.scalar(stmt_total)
+        filas = db.session.execute(stmt_filas).all()
+        
+        return PacienteService.pagina_filas(filas, total, page, per_page)
+    
+    @staticmethod
+    def acotar_pagina(page, per_page):
+        """
+        page >= 1 y 1 <= per_page <= MAX_POR_PAGINA (vienen directo del query string:
+        un LIMIT negativo rompe en PostgreSQL y uno enorme serializa toda la tabla).
+        """
+        return max(page, 1), max(1, min(per_page, PacienteService.MAX_POR_PAGINA))
+    
+    @staticmethod
+    def sentencias_listado_filas(page, per_page, orden='nombre', **filtros):
+        """
+        Sentencias (COUNT, filas) del listado rápido. Son Select puros: las
+        ejecuta tanto la sesión normal como la async (app/services/lecturas_async.py).
+        """
+        page, per_page = PacienteService.acotar_pagina(page, per_page)
+        orden_por = PacienteService._orden_listado(orden)
+        filtros = PacienteService._filtros_listado(**filtros)
+        
+        stmt_total = select(func.count()).select_from(Paciente).where(*filtros)
+        stmt_filas = (
+            select(*PacienteListadoSerializer.columnas)
+            .where(*filtros)
+            .order_by(*orden_por)
+            .limit(per_page)
+            .offset((page - 1) * per_page)
+        )
+        return stmt_total, stmt_filas
+    
+    @staticmethod
+    def pagina_filas(filas, total, page, per_page):
+        return {
+            'items': filas,
+            'total': total,
+            'page': page,
+            'per_page': per_page,
+            'pages': -(-total // per_page) if per_page else 0
+        }
+    
+    @staticmethod
+    def resumen_alertas(**filtros):
+        """
+        Cuántos pacientes tienen cada alerta + edad promedio, en UNA query
+        (agregación en PostgreSQL, sin cargar pacientes en memoria).
+        Acepta los mismos filtros que el listado.
+        """
+        condiciones = PacienteService._filtros_listado(**filtros)
+        fila = db.session.execute(
+            select(
+                func.count().label('total'),
+                func.avg(Paciente.edad).label('edad_promedio'),
+                *(func.count().filter(getattr(Paciente, codigo)).label(codigo) for codigo in ALERTAS)
+            ).select_from(Paciente).where(*condiciones)
+        ).one()
+        
+        return {
+            'total': fila.total,
+            'edad_promedio': round(float(fila.edad_promedio), 1) if fila.edad_promedio is not None else None,
+            'alertas': {codigo: getattr(fila, codigo) for codigo in ALERTAS}
+        }
+    
     @staticmethod
     def actualizar_paciente(id_paciente, data):
         paciente = Paciente.get_by_id(id_paciente)
@@ -136,14 +292,22 @@ class PacienteService:
         # Validar cambio de DNI
         nuevo_dni = data.get('dni')
         if nuevo_dni and nuevo_dni != paciente.dni:
-            if Paciente.buscar_por_dni(nuevo_dni):
+            if Paciente.buscar_por_dnis([nuevo_dni]):
                 raise ValueError(f"El DNI {nuevo_dni} ya está en uso")
 
+        # Validar cambio de Distrito (mapa en memoria → sin query)
+        if data.get('id_distrito') and mapa_distritos.faltantes([data.get('id_distrito')]):
+            raise ValueError(f"Distrito con id {data.get('id_distrito')} no Existe")
+
         paciente.update(data)
 
         try:
             db.session.commit()
             return paciente
+        except IntegrityError as e:
+            # DNI tomado por otro worker después de la verificación
+            db.session.rollback()
+            raise ValueError(f"Error de integridad: {str(e)}")
         except Exception as e:
             db.session.rollback()
             raise e
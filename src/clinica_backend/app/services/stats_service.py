@@ -0,0 +1,165 @@
+# app/services/stats_service.py
+"""
+Service Layer - Estadísticas del Dashboard
+
+Lee las VISTAS MATERIALIZADAS de la migración 007 (src/sql/migrations):
+    mv_ingresos_servicio_mes   → ingresos por procedimiento (y mes)
+    mv_edad_por_sexo           → edad promedio por sexo
+    mv_pacientes_por_distrito  → pacientes por distrito
+
+Cada vista tiene decenas de filas: responder es leer una tabla pequeña, no
+recorrer consultas/pacientes completos como hacía el notebook con pandas.
+Los datos son tan frescos como el último `refrescar()` (ver `estado()`).
+"""
+
+from sqlalchemy import column, desc, func, select, table, text
+
+from app.extensions import db
+
+# `table()`/`column()`: referencias livianas, NO se registran en los metadatos
+# (Flask-Migrate no intentará crearlas como tablas)
+mv_ingresos = table(
+    'mv_ingresos_servicio_mes',
+    column('mes'), column('id_servicio'), column('nombre_servicio'),
+    column('aplicaciones'), column('ingreso_servicio'), column('ingreso_productos')
+)
+mv_edad_sexo = table(
+    'mv_edad_por_sexo',
+    column('sexo'), column('pacientes'), column('pacientes_con_edad'),
+    column('edad_promedio'), column('edad_min'), column('edad_max')
+)
+mv_distritos = table(
+    'mv_pacientes_por_distrito',
+    column('id_distrito'), column('nombre_distrito'), column('pacientes')
+)
+stats_refrescos = table(
+    'stats_refrescos',
+    column('nombre_vista'), column('refrescada_en'), column('ms_ultimo_refresco')
+)
+
+
+def _numero(valor):
+    """NUMERIC → float para los gráficos del Frontend (None se respeta)."""
+    return float(valor) if valor is not None else None
+
+
+class StatsService:
+
+    @staticmethod
+    def ingresos_por_servicio(desde=None, hasta=None, limit=None):
+        """
+        Ingresos por procedimiento, del mayor al menor.
+
+        Args:
+            desde / hasta (date): Rango de meses (inclusive; se toma el mes de cada fecha)
+            limit (int): Top N (None = todos)
+        
+        Raises:
+            ValueError: Si `limit` es menor que 1
+        """
+        if limit is not None and limit < 1:
+            raise ValueError("limit debe ser al menos 1")
+        
+        ingreso_servicio = func.sum(mv_ingresos.c.ingreso_servicio)
+        ingreso_productos = func.sum(mv_ingresos.c.ingreso_productos)
+        stmt = (
+            select(
+                mv_ingresos.c.id_servicio,
+                mv_ingresos.c.nombre_servicio,
+                func.sum(mv_ingresos.c.aplicaciones).label('aplicaciones'),
+                ingreso_servicio.label('ingreso_servicio'),
+                ingreso_productos.label('ingreso_productos'),
+                (ingreso_servicio + ingreso_productos).label('ingreso_total')
+            )
+            .group_by(mv_ingresos.c.id_servicio, mv_ingresos.c.nombre_servicio)
+            .order_by(desc('ingreso_total'))
+        )
+        if desde:
+            stmt = stmt.where(mv_ingresos.c.mes >= desde.replace(day=1))
+        if hasta:
+            stmt = stmt.where(mv_ingresos.c.mes <= hasta.replace(day=1))
+        if limit is not None:
+            stmt = stmt.limit(limit)
+
+        return [
+            {
+                'id_servicio': fila.id_servicio,
+                'nombre_servicio': fila.nombre_servicio,
+                'aplicaciones': int(fila.aplicaciones),
+                'ingreso_servicio': _numero(fila.ingreso_servicio),
+                'ingreso_productos': _numero(fila.ingreso_productos),
+                'ingreso_total': _numero(fila.ingreso_total)
+            }
+            for fila in db.session.execute(stmt)
+        ]
+
+    @staticmethod
+    def edad_por_sexo():
+        filas = db.session.execute(select(mv_edad_sexo).order_by(mv_edad_sexo.c.sexo))
+        return [
+            {
+                'sexo': fila.sexo,
+                'pacientes': fila.pacientes,
+                'pacientes_con_edad': fila.pacientes_con_edad,
+                'edad_promedio': _numero(fila.edad_promedio),
+                'edad_min': fila.edad_min,
+                'edad_max': fila.edad_max
+            }
+            for fila in filas
+        ]
+
+    @staticmethod
+    def pacientes_por_distrito():
+        filas = db.session.execute(
+            select(mv_distritos).order_by(mv_distritos.c.pacientes.desc())
+        )
+        return [
+            {
+                # id 0 en la vista = "sin distrito" → None en la API
+                'id_distrito': fila.id_distrito or None,
+                'nombre_distrito': fila.nombre_distrito,
+                'pacientes': fila.pacientes
+            }
+            for fila in filas
+        ]
+
+    @staticmethod
+    def estado():
+        """Cuándo se refrescó cada vista por última vez."""
+        filas = db.session.execute(select(stats_refrescos).order_by(stats_refrescos.c.nombre_vista))
+        return [
+            {
+                'vista': fila.nombre_vista,
+                'refrescada_en': fila.refrescada_en.isoformat() if fila.refrescada_en else None,
+                'ms_ultimo_refresco': _numero(fila.ms_ultimo_refresco)
+            }
+            for fila in filas
+        ]
+
+    @staticmethod
+    def refrescar(forzar=False, max_edad_horas=24):
+        """
+        Trabajo Programado: refresca las vistas cuyas tablas fuente cambiaron.
+        La lógica vive en PostgreSQL (`sp_refrescar_estadisticas`, migración 007).
+
+        Args:
+            forzar (bool): Refrescar todas aunque no haya cambios
+            max_edad_horas (int): Refrescar igual si la última vez fue hace más que esto
+
+        Returns:
+            list[dict]: {'vista', 'refrescada', 'duracion_ms'} por vista
+        """
+        try:
+            filas = db.session.execute(
+                text("SELECT * FROM sp_refrescar_estadisticas(:forzar, make_interval(hours => :horas))"),
+                {'forzar': forzar, 'horas': max_edad_horas}
+            ).all()
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            raise e
+
+        return [
+            {'vista': f.vista, 'refrescada': f.refrescada, 'duracion_ms': _numero(f.duracion_ms)}
+            for f in filas
+        ]
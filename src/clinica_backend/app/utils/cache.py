@@ -0,0 +1,203 @@
+"""
+CACHÉ DE LECTURAS (La Memoria de Corto Plazo)
+
+¿PARA QUÉ?
+El catálogo (marcas, productos, servicios) cambia pocas veces al mes, pero
+se pide en CADA carga del formulario de consultas. Sin caché: una query y
+una serialización completas por cada request.
+
+DISEÑO:
+    cache.get_or_set('catalogo:marcas', fabrica)
+        - HIT  → devolvemos lo guardado (ya serializado, listo para jsonify)
+        - MISS → ejecutamos `fabrica()`, guardamos y devolvemos
+    cache.invalidar('catalogo:marcas')   ← lo llaman los Services al escribir
+
+BACKENDS (config CACHE_BACKEND):
+    'memory' → Diccionario en el proceso (default). Cada worker de gunicorn
+               tiene el suyo: la invalidación es local y el TTL acota lo viejo.
+    'redis'  → Compartido entre workers (CACHE_REDIS_URL). Requiere `redis`.
+    'null'   → Sin caché (tests / depuración).
+
+Igual que las demás extensiones: se crea vacía en extensions.py y se conecta
+en create_app con `cache.init_app(app)`.
+"""
+
+import asyncio
+import pickle
+import threading
+import time
+
+from app.utils.replicas import leer_del_primario
+
+
+class MemoryBackend:
+    """Diccionario con expiración, seguro entre hilos del mismo proceso."""
+
+    bloqueante = False  # No hace I/O: se puede llamar directo desde el event loop
+
+    def __init__(self):
+        self._datos = {}
+        self._lock = threading.Lock()
+
+    def get(self, clave):
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is None:
+                return None
+            expira = entrada[0]
+            if expira is not None and expira < time.monotonic():
+                del self._datos[clave]
+                return None
+            return entrada
+
+    def set(self, clave, valor, ttl=None):
+        expira = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._datos[clave] = (expira, valor)
+
+    def delete(self, *claves):
+        with self._lock:
+            for clave in claves:
+                self._datos.pop(clave, None)
+
+    def clear(self):
+        with self._lock:
+            self._datos.clear()
+
+
+class RedisBackend:
+    """Mismo contrato que MemoryBackend, guardando los valores con pickle en Redis."""
+
+    bloqueante = True  # Cada llamada es un viaje de red
+
+    def __init__(self, url, prefijo='clinica:'):
+        import redis  # Dependencia opcional: solo si CACHE_BACKEND = 'redis'
+        self._redis = redis.Redis.from_url(url)
+        self._prefijo = prefijo
+
+    def get(self, clave):
+        crudo = self._redis.get(self._prefijo + clave)
+        if crudo is None:
+            return None
+        return (None, pickle.loads(crudo))
+
+    def set(self, clave, valor, ttl=None):
+        self._redis.set(self._prefijo + clave, pickle.dumps(valor), ex=ttl or None)
+
+    def delete(self, *claves):
+        if claves:
+            self._redis.delete(*[self._prefijo + c for c in claves])
+
+    def clear(self):
+        for clave in self._redis.scan_iter(self._prefijo + '*'):
+            self._redis.delete(clave)
+
+
+class NullBackend:
+    """Nunca guarda nada: todo es MISS."""
+
+    bloqueante = False
+
+    def get(self, clave):
+        return None
+
+    def set(self, clave, valor, ttl=None):
+        pass
+
+    def delete(self, *claves):
+        pass
+
+    def clear(self):
+        pass
+
+
+class Cache:
+    """Fachada única de la app: backend intercambiable + contadores de hit/miss."""
+
+    def __init__(self):
+        self.backend = MemoryBackend()
+        self.default_ttl = 300
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'invalidaciones': 0}
+
+    def init_app(self, app):
+        tipo = app.config.get('CACHE_BACKEND', 'memory')
+        self.default_ttl = app.config.get('CACHE_DEFAULT_TTL', 300)
+
+        if tipo == 'redis':
+            self.backend = RedisBackend(app.config['CACHE_REDIS_URL'])
+        elif tipo == 'null':
+            self.backend = NullBackend()
+        else:
+            self.backend = MemoryBackend()
+
+        app.extensions['cache'] = self
+
+    def _contar(self, evento, cantidad=1):
+        with self._lock:
+            self._stats[evento] += cantidad
+
+    def get_or_set(self, clave, fabrica, ttl=None):
+        """
+        Devuelve el valor cacheado de `clave` o lo calcula con `fabrica()`.
+
+        Args:
+            clave (str): Identificador, ej: 'catalogo:productos'
+            fabrica (callable): Función sin argumentos que produce el valor
+            ttl (int): Segundos de vida (None = CACHE_DEFAULT_TTL)
+        """
+        entrada = self.backend.get(clave)
+        if entrada is not None:
+            self._contar('hits')
+            return entrada[1]
+
+        self._contar('misses')
+        # Del primario: lo que entra al caché lo verán todos hasta que venza,
+        # y una réplica atrasada devolvería lo de antes de la última escritura
+        with leer_del_primario():
+            valor = fabrica()
+        self.backend.set(clave, valor, ttl if ttl is not None else self.default_ttl)
+        return valor
+
+    async def get_or_set_async(self, clave, fabrica, ttl=None):
+        """
+        Igual que `get_or_set`, pero `fabrica` es una corrutina (la usa app/asgi.py).
+        Comparte backend y contadores con el camino síncrono: una escritura
+        invalida ambos. Con un backend de red (Redis) las llamadas van a un
+        hilo para no bloquear el event loop. La fábrica lee de ASYNC_DATABASE_URL
+        (el primario salvo que se configure otra cosa).
+        """
+        backend = self.backend
+        if backend.bloqueante:
+            entrada = await asyncio.to_thread(backend.get, clave)
+        else:
+            entrada = backend.get(clave)
+        if entrada is not None:
+            self._contar('hits')
+            return entrada[1]
+
+        self._contar('misses')
+        valor = await fabrica()
+        ttl = ttl if ttl is not None else self.default_ttl
+        if backend.bloqueante:
+            await asyncio.to_thread(backend.set, clave, valor, ttl)
+        else:
+            backend.set(clave, valor, ttl)
+        return valor
+
+    def invalidar(self, *claves):
+        """Borra las claves indicadas (write-through: se llama justo después del commit)."""
+        self.backend.delete(*claves)
+        self._contar('invalidaciones', len(claves))
+
+    def limpiar(self):
+        self.backend.clear()
+
+    def stats(self):
+        """Contadores del proceso actual (cada worker lleva los suyos)."""
+        with self._lock:
+            datos = dict(self._stats)
+        consultas = datos['hits'] + datos['misses']
+        datos['hit_ratio'] = round(datos['hits'] / consultas, 4) if consultas else None
+        datos['backend'] = type(self.backend).__name__
+        return datos
@@ -0,0 +1,86 @@
+"""
+COMPRESIÓN + GET CONDICIONAL (El Ahorro de Ancho de Banda)
+
+EL PROBLEMA:
+El Frontend (Streamlit) re-ejecuta la página en cada click y vuelve a pedir
+`/marcas`, `/productos`, `/pacientes?page=1`... que casi nunca cambian.
+Cada vez viaja el JSON completo y sin comprimir.
+
+LA SOLUCIÓN (un `after_request` para TODA la app):
+1. ETag débil (W/"sha1 del cuerpo"):
+   - El cliente lo guarda y lo reenvía en `If-None-Match`.
+   - Si coincide respondemos 304 Not Modified SIN cuerpo.
+2. Compresión br/gzip según `Accept-Encoding`, solo si el cuerpo supera
+   COMPRESS_MIN_SIZE (comprimir 80 bytes cuesta más de lo que ahorra).
+
+El ETag se calcula sobre el JSON SIN comprimir: por eso es débil (W/),
+la misma representación lógica vale para la versión gzip y la br.
+
+Las respuestas en streaming (export NDJSON/CSV del Kardex) no se tocan:
+no tenemos el cuerpo completo en memoria.
+"""
+
+import gzip
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dependencia opcional
+    brotli = None
+
+
+def _codificacion_aceptada():
+    """Mejor codificación que el cliente acepta y nosotros sabemos producir."""
+    disponibles = ['br', 'gzip'] if brotli is not None else ['gzip']
+    return request.accept_encodings.best_match(disponibles)
+
+
+def _comprimir(datos, codificacion, nivel):
+    if codificacion == 'br':
+        return brotli.compress(datos, quality=min(nivel, 11))
+    return gzip.compress(datos, compresslevel=nivel)
+
+
+def registrar_compresion(app):
+    """Registra el middleware en la app (lo llama create_app)."""
+
+    mimetypes = set(app.config.get('COMPRESS_MIMETYPES', ('application/json',)))
+    minimo = app.config.get('COMPRESS_MIN_SIZE', 500)
+    nivel = app.config.get('COMPRESS_LEVEL', 6)
+    usar_etag = app.config.get('ETAG_ENABLED', True)
+
+    @app.after_request
+    def _optimizar_respuesta(response):
+        if request.method not in ('GET', 'HEAD'):
+            return response
+        if response.direct_passthrough or response.is_streamed:
+            return response
+        if response.status_code != 200 or response.mimetype not in mimetypes:
+            return response
+
+        # 1. GET condicional: 304 si el cliente ya tiene esta versión
+        if usar_etag:
+            response.add_etag(weak=True)
+            response.make_conditional(request)
+            if response.status_code == 304:
+                return response
+
+        # 2. Compresión
+        response.vary.add('Accept-Encoding')
+        if 'Content-Encoding' in response.headers:
+            return response
+
+        datos = response.get_data()
+        if len(datos) < minimo:
+            return response
+
+        codificacion = _codificacion_aceptada()
+        if codificacion is None:
+            return response
+
+        response.set_data(_comprimir(datos, codificacion, nivel))
+        response.headers['Content-Encoding'] = codificacion
+        return response
+
+    return app
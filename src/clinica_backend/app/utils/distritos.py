@@ -0,0 +1,158 @@
+"""
+MAPA DE DISTRITOS EN MEMORIA (La Guía de Calles)
+
+`distritos` es una tabla de referencia pequeña (decenas de filas) que casi
+nunca cambia, pero se consultaba en cada registro (`Distrito.query.get`) y
+se unía (JOIN) en cada listado de pacientes.
+
+Ahora cada proceso guarda una copia {id_distrito: nombre_distrito}:
+    - Se carga la primera vez que se usa (con el primer request).
+    - Es VERSIONADA: cada recarga con contenido distinto sube `version`.
+    - Se recarga cuando:
+        1. Un commit de ESTE proceso toca `distritos` (hooks en app/models/distrito.py)
+        2. Vence DISTRITOS_TTL (cambios hechos por otro worker)
+        3. Se pide un id que no está (máx. una recarga cada DISTRITOS_RECARGA_MIN_S)
+
+Los lectores nunca esperan un lock: la recarga arma un dict nuevo y lo
+reemplaza de una sola vez.
+"""
+
+import logging
+import threading
+import time
+from types import MappingProxyType
+
+from flask import has_app_context
+
+logger = logging.getLogger('app.distritos')
+
+
+class MapaDistritos:
+    """Copia por proceso de la tabla `distritos`, reemplazada atómicamente."""
+
+    def __init__(self):
+        self._app = None
+        self._datos = MappingProxyType({})
+        self.version = 0
+        self.ttl = 600
+        self.recarga_min_s = 5
+        self._cargado_en = None     # monotonic de la última carga (None = nunca)
+        self._vencido = True
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self._app = app
+        self.ttl = app.config.get('DISTRITOS_TTL', 600)
+        self.recarga_min_s = app.config.get('DISTRITOS_RECARGA_MIN_S', 5)
+        app.extensions['mapa_distritos'] = self
+
+    # ------------------------------------------------------------------
+    # CARGA
+    # ------------------------------------------------------------------
+
+    def _leer_tabla(self):
+        from sqlalchemy import select
+
+        from app.extensions import db
+        from app.models.distrito import Distrito
+
+        return dict(db.session.execute(
+            select(Distrito.id_distrito, Distrito.nombre_distrito)
+        ).all())
+
+    def recargar(self):
+        """Lee la tabla y reemplaza el mapa (sube `version` si cambió algo)."""
+        visto = self._cargado_en
+        with self._lock:
+            if self._cargado_en != visto and not self._vencido:
+                return self._datos  # Otro hilo recargó mientras esperábamos el lock
+            # Se baja ANTES de leer: un commit durante la lectura vuelve a vencerlo
+            self._vencido = False
+            try:
+                if has_app_context() or self._app is None:
+                    nuevos = self._leer_tabla()
+                else:
+                    # Capa ASGI (app/asgi.py): no hay contexto de Flask en el event loop
+                    with self._app.app_context():
+                        nuevos = self._leer_tabla()
+            except Exception:
+                if self._cargado_en is None:
+                    raise
+                # Mejor un mapa algo viejo que tumbar el request: se reintenta luego
+                logger.exception("No se pudo recargar el mapa de distritos; se usa la versión anterior")
+                self._cargado_en = time.monotonic() - self.ttl + self.recarga_min_s  # Reintento pronto
+                return self._datos
+            self._instalar(nuevos)
+        return self._datos
+
+    def _instalar(self, datos):
+        if dict(self._datos) != datos:
+            self.version += 1
+            logger.info(f"Mapa de distritos v{self.version}: {len(datos)} distritos")
+        self._datos = MappingProxyType(dict(datos))
+        self._cargado_en = time.monotonic()
+
+    def reemplazar(self, datos):
+        """Instala `datos` como mapa vigente sin leer la BD (útil en benchmarks)."""
+        with self._lock:
+            self._instalar(datos)
+            self._vencido = False
+
+    def invalidar(self):
+        """El próximo acceso recarga (lo llaman los hooks tras un commit)."""
+        self._vencido = True
+
+    # ------------------------------------------------------------------
+    # LECTURA
+    # ------------------------------------------------------------------
+
+    @property
+    def datos(self):
+        """Mapa actual tal cual, SIN recargar (para quien ya revisó `necesita_recarga`)."""
+        return self._datos
+
+    def necesita_recarga(self, requeridos=()):
+        """
+        ¿El próximo `nombres(requeridos)` iría a la BD? No hace I/O: la capa
+        ASGI lo usa para recargar en un hilo en vez de en el event loop.
+        """
+        ahora = time.monotonic()
+        cargado_en = self._cargado_en
+        if self._vencido or cargado_en is None or ahora - cargado_en > self.ttl:
+            return True
+        datos = self._datos
+        return any(i not in datos for i in requeridos if i) and ahora - cargado_en > self.recarga_min_s
+
+    def nombres(self, requeridos=()):
+        """
+        Mapa vigente {id_distrito: nombre_distrito} (solo lectura).
+
+        Args:
+            requeridos (iterable): IDs que el llamador necesita; si alguno falta,
+                se recarga una vez (puede haberlo creado otro worker).
+        """
+        if self.necesita_recarga(requeridos):
+            return self.recargar()
+        return self._datos
+
+    def faltantes(self, ids):
+        """IDs de `ids` que NO existen como distrito."""
+        ids = {i for i in ids if i}
+        datos = self.nombres(requeridos=ids)
+        return {i for i in ids if i not in datos}
+
+    def como_dict(self, id_distrito):
+        """Forma anidada que espera el Frontend, o None."""
+        if not id_distrito:
+            return None
+        return {
+            'id_distrito': id_distrito,
+            'nombre_distrito': self.nombres(requeridos=(id_distrito,)).get(id_distrito)
+        }
+
+    def estado(self):
+        return {
+            'version': self.version,
+            'distritos': len(self._datos),
+            'edad_s': round(time.monotonic() - self._cargado_en, 1) if self._cargado_en else None
+        }
@@ -0,0 +1,86 @@
+"""
+CACHÉ DE DNIs (El Padrón de la Recepción)
+
+Cada registro de paciente pregunta "¿ya existe este DNI?". En la apertura de
+la clínica (o en una carga masiva) eso es un viaje a PostgreSQL por DNI.
+
+Este caché recuerda, por proceso, SOLO los DNIs que NO existen (caché negativo):
+el caso común es registrar un DNI nuevo, y esa respuesta es la que se repite.
+
+¿Por qué no guardar también los "sí existe"?
+    Un "existe" desactualizado SÍ hace daño: si otro worker borra al paciente,
+    este seguiría rechazando el re-registro ("Ya Existe un Paciente") hasta
+    que venza la entrada. Un "no existe" desactualizado es inofensivo: el
+    índice UNIQUE de la BD rechaza el duplicado (IntegrityError).
+    Por eso un DNI que existe siempre se confirma contra la BD.
+
+Se mantiene al día solo: los hooks del modelo Paciente (insert/update/delete)
+lo actualizan DESPUÉS del commit (un rollback no lo ensucia).
+
+Límites:
+    - Acotado (DNI_CACHE_SIZE, LRU) y con vencimiento (DNI_CACHE_TTL).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class CacheDNI:
+    """LRU thread-safe de DNIs que NO existen: dni → expira_en."""
+
+    def __init__(self, capacidad=10000, ttl=300):
+        self.capacidad = capacidad
+        self.ttl = ttl
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0}
+
+    def init_app(self, app):
+        self.capacidad = app.config.get('DNI_CACHE_SIZE', 10000)
+        self.ttl = app.config.get('DNI_CACHE_TTL', 300)
+        app.extensions['cache_dni'] = self
+
+    def consultar(self, dnis):
+        """
+        Returns:
+            list: DNIs que hay que preguntar a la BD (los demás seguro NO existen)
+        """
+        ahora = time.monotonic()
+        desconocidos = []
+        with self._lock:
+            for dni in dnis:
+                expira = self._items.get(dni)
+                if expira is None or expira < ahora:
+                    desconocidos.append(dni)
+                    continue
+                self._items.move_to_end(dni)
+            self._stats['hits'] += len(dnis) - len(desconocidos)
+            self._stats['misses'] += len(desconocidos)
+        return desconocidos
+
+    def marcar(self, dnis, existe):
+        """`existe=False` guarda el DNI como ausente; `existe=True` lo olvida."""
+        with self._lock:
+            if existe:
+                for dni in dnis:
+                    self._items.pop(dni, None)
+                return
+            if self.capacidad <= 0:
+                return
+            expira = time.monotonic() + self.ttl
+            for dni in dnis:
+                if not dni:
+                    continue
+                self._items[dni] = expira
+                self._items.move_to_end(dni)
+            while len(self._items) > self.capacidad:
+                self._items.popitem(last=False)
+
+    def limpiar(self):
+        with self._lock:
+            self._items.clear()
+
+    def stats(self):
+        with self._lock:
+            return {**self._stats, 'entradas': len(self._items), 'capacidad': self.capacidad}
@@ -0,0 +1,69 @@
+"""
+CARGA ANTICIPADA GUIADA POR SCHEMA (Eager Loading)
+
+EL PROBLEMA (N+1):
+Todas las relaciones usan lazy='select' por defecto. Al serializar una lista:
+    1 query  → consultas
+    N queries → consulta.servicios       (una por consulta)
+    M queries → servicio.consumos        (una por servicio)
+    K queries → consumo.producto         (una por consumo)
+
+LA SOLUCIÓN:
+`selectinload` carga cada nivel con UNA query `WHERE id IN (...)`.
+La cadena correcta depende de QUÉ va a serializar el Schema, así que la
+derivamos del propio Schema: si mañana el Schema agrega un Nested, la
+query lo carga automáticamente (no hay dos listas que mantener sincronizadas).
+
+Uso:
+    query = Consulta.query.options(*opciones_carga(Consulta, ConsultaResponseSchema()))
+"""
+
+from marshmallow import fields
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import selectinload
+
+
+def _schema_anidado(campo):
+    """Devuelve el Schema anidado de un campo Nested / List(Nested), o None."""
+    if isinstance(campo, fields.Nested):
+        return campo.schema
+    if isinstance(campo, fields.List) and isinstance(campo.inner, fields.Nested):
+        return campo.inner.schema
+    return None
+
+
+def _cadenas(modelo, schema, padre=None):
+    relaciones = sa_inspect(modelo).relationships
+
+    for nombre, campo in schema.fields.items():
+        anidado = _schema_anidado(campo)
+        if anidado is None:
+            continue
+
+        atributo = campo.attribute or nombre
+        if atributo not in relaciones:
+            continue
+
+        relacion = getattr(modelo, atributo)
+        opcion = selectinload(relacion) if padre is None else padre.selectinload(relacion)
+
+        # Bajamos un nivel: las hojas son las cadenas completas
+        hijas = list(_cadenas(relaciones[atributo].mapper.class_, anidado, opcion))
+        if hijas:
+            yield from hijas
+        else:
+            yield opcion
+
+
+def opciones_carga(modelo, schema):
+    """
+    Construye las cadenas `selectinload` que necesita `schema` para serializar `modelo`.
+
+    Args:
+        modelo: Clase ORM raíz (ej: Consulta)
+        schema: INSTANCIA del Schema de respuesta (respeta `only`/`exclude`)
+
+    Returns:
+        list: Opciones para `query.options(*...)`
+    """
+    return list(_cadenas(modelo, schema))
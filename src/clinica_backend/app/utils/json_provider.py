@@ -0,0 +1,134 @@
+"""
+PROVEEDOR JSON RÁPIDO (El Empaquetador Industrial)
+
+Flask convierte TODAS las respuestas (jsonify / APIResponse) a texto JSON
+con el proveedor registrado en `app.json`. El de fábrica usa el módulo
+`json` de la librería estándar, escrito en Python puro para los casos raros.
+
+Este proveedor usa, en orden de preferencia:
+    1. orjson  (Rust, el más rápido, serializa date/datetime/UUID nativamente)
+    2. ujson   (C)
+    3. json    (stdlib, el comportamiento original de Flask)
+
+Salida:
+    - Compacta por defecto (sin espacios ni saltos de línea)
+    - `?pretty=1` en la URL la indenta para leerla en el navegador
+    - Decimal → string ("600.00"), igual que Flask: no perdemos centavos
+    - date/datetime → ISO-8601 ("2024-01-05", "2024-01-05T08:30:00") con
+      CUALQUIERA de los tres encoders. OJO: el de fábrica de Flask usaba
+      `http_date` ("Fri, 05 Jan 2024 00:00:00 GMT"); aquí no.
+"""
+
+import decimal
+import uuid
+
+from flask import has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependencia opcional
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover - dependencia opcional
+    ujson = None
+
+
+def _default(o):
+    """Tipos que los encoders no conocen (mismas reglas que el proveedor de Flask)."""
+    if isinstance(o, decimal.Decimal):
+        return str(o)
+    if isinstance(o, uuid.UUID):
+        return str(o)
+    if hasattr(o, '__html__'):
+        return str(o.__html__())
+    if hasattr(o, 'isoformat'):
+        # ujson no conoce date/datetime; orjson ya los resolvió antes de llegar aquí
+        return o.isoformat()
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Reemplazo directo de `DefaultJSONProvider`.
+
+    Lee de la configuración (ver config.py):
+        JSON_COMPACT       → Salida compacta (True en producción)
+        JSON_SORT_KEYS     → Ordenar llaves (cuesta CPU, apagado por defecto)
+        JSON_PRETTY_PARAM  → Nombre del query param para indentar (?pretty=1)
+    """
+
+    compact = True
+    sort_keys = False
+    pretty_param = 'pretty'
+
+    # El `dumps` de la stdlib (fallback) también pasa por `_default`: fechas en ISO-8601
+    default = staticmethod(_default)
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.compact = app.config.get('JSON_COMPACT', True)
+        self.sort_keys = app.config.get('JSON_SORT_KEYS', False)
+        self.pretty_param = app.config.get('JSON_PRETTY_PARAM', 'pretty')
+
+    @property
+    def motor(self):
+        """Nombre del encoder activo (útil en /health y en logs)."""
+        if orjson is not None:
+            return 'orjson'
+        if ujson is not None:
+            return 'ujson'
+        return 'json'
+
+    def _quiere_pretty(self):
+        if not self.compact:
+            return True
+        if has_request_context():
+            return request.args.get(self.pretty_param, '').lower() in ('1', 'true', 'yes')
+        return False
+
+    def _encode(self, obj, pretty=False):
+        if orjson is not None:
+            opciones = orjson.OPT_NON_STR_KEYS
+            if pretty:
+                opciones |= orjson.OPT_INDENT_2
+            if self.sort_keys:
+                opciones |= orjson.OPT_SORT_KEYS
+            return orjson.dumps(obj, default=_default, option=opciones)
+
+        if ujson is not None:
+            return ujson.dumps(
+                obj,
+                default=_default,
+                ensure_ascii=False,
+                sort_keys=self.sort_keys,
+                indent=2 if pretty else 0
+            ).encode()
+
+        return super().dumps(
+            obj,
+            indent=2 if pretty else None,
+            separators=None if pretty else (',', ':'),
+            sort_keys=self.sort_keys
+        ).encode()
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None and ujson is None:
+            kwargs.setdefault('sort_keys', self.sort_keys)
+            return super().dumps(obj, **kwargs)
+        return self._encode(obj).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is not None:
+            return orjson.loads(s)
+        if ujson is not None:
+            return ujson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        """Lo que usa `jsonify()` (y por lo tanto `APIResponse`)."""
+        obj = self._prepare_response_obj(args, kwargs)
+        cuerpo = self._encode(obj, pretty=self._quiere_pretty())
+        return self._app.response_class(cuerpo, mimetype=self.mimetype)
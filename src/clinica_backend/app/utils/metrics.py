@@ -0,0 +1,158 @@
+"""
+MÉTRICAS PROMETHEUS (El Tablero de Control)
+
+Expone GET /metrics en formato Prometheus para planificar capacidad en las
+horas pico de la clínica:
+
+    clinica_http_requests_total{method, endpoint, status}
+    clinica_http_request_duration_seconds{method, endpoint}     (histograma)
+    clinica_db_pool_connections{estado}                          (checked_in / checked_out / overflow)
+    clinica_consultas_creadas_total
+    clinica_movimientos_stock_total{tipo}
+    clinica_api_errors_total{code, status}                       (APIResponse.error)
+
+`endpoint` es el nombre Flask de la ruta ('pacientes.listar_pacientes'), no la URL:
+así '/pacientes/1' y '/pacientes/2' cuentan juntos.
+
+MULTI-PROCESO (gunicorn):
+Cada worker es un proceso con su propia memoria. Si definimos la variable de
+entorno PROMETHEUS_MULTIPROC_DIR (un directorio vacío), prometheus_client
+escribe los valores en archivos compartidos y /metrics suma TODOS los workers
+sin importar cuál atienda el scrape. Ver gunicorn.conf.py (hook child_exit).
+
+`prometheus_client` es opcional: sin él, todo esto es un no-op y /metrics responde 501.
+"""
+
+import os
+import time
+
+from flask import g, request
+
+try:
+    import prometheus_client as prom
+    from prometheus_client import multiprocess
+except ImportError:  # pragma: no cover - dependencia opcional
+    prom = None
+    multiprocess = None
+
+
+MULTIPROCESO = bool(os.environ.get('PROMETHEUS_MULTIPROC_DIR'))
+
+# Buckets pensados para una API CRUD: de 5ms a 10s
+BUCKETS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+if prom is not None:
+    REQUESTS = prom.Counter(
+        'clinica_http_requests_total',
+        'Requests HTTP atendidos',
+        ['method', 'endpoint', 'status']
+    )
+    LATENCIA = prom.Histogram(
+        'clinica_http_request_duration_seconds',
+        'Duración de los requests HTTP',
+        ['method', 'endpoint'],
+        buckets=BUCKETS_LATENCIA
+    )
+    POOL_DB = prom.Gauge(
+        'clinica_db_pool_connections',
+        'Conexiones del pool de SQLAlchemy por estado',
+        ['estado'],
+        multiprocess_mode='livesum'  # Suma de los workers vivos
+    )
+    CONSULTAS_CREADAS = prom.Counter(
+        'clinica_consultas_creadas_total',
+        'Consultas registradas'
+    )
+    MOVIMIENTOS_STOCK = prom.Counter(
+        'clinica_movimientos_stock_total',
+        'Movimientos de stock registrados por tipo',
+        ['tipo']
+    )
+    ERRORES_API = prom.Counter(
+        'clinica_api_errors_total',
+        'Respuestas de error emitidas por APIResponse.error',
+        ['code', 'status']
+    )
+
+
+# ============================================================================
+# CONTADORES DE NEGOCIO (los llaman los Services / APIResponse)
+# ============================================================================
+
+def contar_consulta_creada():
+    if prom is not None:
+        CONSULTAS_CREADAS.inc()
+
+
+def contar_movimientos(tipos):
+    """
+    Args:
+        tipos (iterable): Tipo de cada movimiento registrado, ej: ['ENTRADA', 'SALIDA']
+    """
+    if prom is None:
+        return
+    for tipo in tipos:
+        MOVIMIENTOS_STOCK.labels(tipo=tipo).inc()
+
+
+def contar_error(code, status_code):
+    if prom is not None:
+        ERRORES_API.labels(code=code, status=str(status_code)).inc()
+
+
+# ============================================================================
+# MIDDLEWARE + EXPOSICIÓN
+# ============================================================================
+
+def _actualizar_pool(engine):
+    pool = engine.pool
+    # Solo QueuePool expone estas estadísticas (SQLite/NullPool no)
+    if not hasattr(pool, 'checkedout'):
+        return
+    POOL_DB.labels(estado='checked_in').set(pool.checkedin())
+    POOL_DB.labels(estado='checked_out').set(pool.checkedout())
+    POOL_DB.labels(estado='overflow').set(max(pool.overflow(), 0))
+
+
+def registrar_metricas(app):
+    """Registra el middleware de conteo/latencia (lo llama create_app)."""
+    if prom is None or not app.config.get('METRICS_ENABLED', True):
+        return app
+
+    from app.extensions import db
+
+    @app.before_request
+    def _iniciar_cronometro():
+        g._metricas_inicio = time.perf_counter()
+
+    @app.after_request
+    def _registrar_request(response):
+        inicio = g.pop('_metricas_inicio', None)
+        if inicio is None or request.endpoint == 'metrics.exponer_metricas':
+            return response
+
+        endpoint = request.endpoint or 'sin_ruta'
+        REQUESTS.labels(request.method, endpoint, str(response.status_code)).inc()
+        LATENCIA.labels(request.method, endpoint).observe(time.perf_counter() - inicio)
+        _actualizar_pool(db.engine)
+        return response
+
+    return app
+
+
+def generar_metricas():
+    """
+    Returns:
+        tuple: (cuerpo en formato Prometheus, content-type)
+    """
+    if MULTIPROCESO:
+        registro = prom.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registro)
+    else:
+        registro = prom.REGISTRY
+    return prom.generate_latest(registro), prom.CONTENT_TYPE_LATEST
+
+
+def disponible():
+    return prom is not None
@@ -0,0 +1,130 @@
+"""
+PAGINACIÓN POR CURSOR (Keyset Pagination)
+
+¿POR QUÉ NO `paginate(page=N)`?
+- OFFSET obliga a PostgreSQL a leer y descartar todas las filas anteriores:
+  la página 500 cuesta 500 veces más que la página 1.
+- Además hace un COUNT(*) extra para calcular `total` y `pages`.
+
+KEYSET: "Dame las siguientes N filas DESPUÉS de la última que viste".
+    WHERE (fecha, id) < (:ultima_fecha, :ultimo_id)
+    ORDER BY fecha DESC, id DESC
+    LIMIT N
+Con un índice sobre (fecha DESC, id DESC) cada página cuesta lo mismo.
+
+El cursor es opaco para el Frontend (base64 de los valores de la última fila):
+solo lo devuelve tal cual en `?cursor=...` para pedir la siguiente página.
+"""
+
+import base64
+import json
+from datetime import date, datetime
+
+from sqlalchemy import literal, tuple_
+
+
+def codificar_cursor(valores):
+    """Convierte los valores de orden de la última fila en un string opaco."""
+    serializables = [
+        v.isoformat() if isinstance(v, (date, datetime)) else v
+        for v in valores
+    ]
+    crudo = json.dumps(serializables, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(crudo).decode()
+
+
+def decodificar_cursor(cursor, columnas):
+    """
+    Operación inversa de `codificar_cursor`, tipando cada valor según su columna.
+
+    Raises:
+        ValueError: Si el cursor fue manipulado o no corresponde a las columnas.
+    """
+    try:
+        valores = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        raise ValueError("Cursor de paginación inválido")
+
+    if not isinstance(valores, list) or len(valores) != len(columnas):
+        raise ValueError("Cursor de paginación inválido")
+
+    tipados = []
+    try:
+        for valor, columna in zip(valores, columnas):
+            tipo_python = columna.type.python_type
+            if tipo_python is datetime:
+                valor = datetime.fromisoformat(valor)
+            elif tipo_python is date:
+                valor = date.fromisoformat(valor)
+            elif tipo_python is int and (not isinstance(valor, int) or isinstance(valor, bool)):
+                raise ValueError(valor)
+            tipados.append(valor)
+    except (TypeError, ValueError):
+        # Ej.: [123, 1] o [null, 1] en una columna de fecha, o un texto en el id
+        raise ValueError("Cursor de paginación inválido")
+    return tipados
+
+
+def filtro_keyset(columnas, cursor):
+    """
+    Condición WHERE "filas posteriores al cursor" en orden DESCENDENTE.
+    Útil cuando la query no es un `Query` simple (CTEs, agregados, etc.).
+    """
+    valores = decodificar_cursor(cursor, columnas)
+    return tuple_(*columnas) < tuple_(*[literal(v, c.type) for v, c in zip(valores, columnas)])
+
+
+def _validar_limit(limit):
+    if limit < 1:
+        raise ValueError("El tamaño de página (limit) debe ser al menos 1")
+
+
+def ordenar_keyset(query, columnas, cursor=None, limit=50):
+    """
+    Aplica el filtro del cursor, el ORDER BY descendente y LIMIT `limit + 1`
+    a una Query o a un Select (el Select sirve también para sesiones async).
+
+    Raises:
+        ValueError: Si `limit` es menor que 1.
+    """
+    _validar_limit(limit)
+    if cursor:
+        query = query.filter(filtro_keyset(columnas, cursor))
+
+    # Pedimos UNA fila extra: si llega, sabemos que hay otra página (sin COUNT)
+    return query.order_by(*[c.desc() for c in columnas]).limit(limit + 1)
+
+
+def armar_pagina(filas, columnas, limit):
+    """Recorta la fila extra de `ordenar_keyset` y calcula el `next_cursor`."""
+    _validar_limit(limit)
+    hay_mas = len(filas) > limit
+    filas = filas[:limit]
+
+    siguiente = None
+    if hay_mas:
+        ultima = filas[-1]
+        siguiente = codificar_cursor([getattr(ultima, c.key) for c in columnas])
+
+    return {
+        'items': filas,
+        'next_cursor': siguiente,
+        'limit': limit
+    }
+
+
+def paginar_keyset(query, columnas, cursor=None, limit=50):
+    """
+    Aplica paginación keyset DESCENDENTE sobre `columnas` (la última debe ser única, ej: el ID).
+
+    Args:
+        query: Query de SQLAlchemy ya filtrada (sin ORDER BY ni LIMIT)
+        columnas (list): Columnas de orden, ej: [Modelo.fecha, Modelo.id]
+        cursor (str): Cursor recibido del Frontend (None = primera página)
+        limit (int): Tamaño de página
+
+    Returns:
+        dict: {'items': [...], 'next_cursor': str | None, 'limit': int}
+    """
+    filas = ordenar_keyset(query, columnas, cursor, limit).all()
+    return armar_pagina(filas, columnas, limit)
@@ -0,0 +1,188 @@
+"""
+PERFILADO POR REQUEST (El Cronómetro)
+
+Antes de optimizar hay que MEDIR. Con PROFILING_ENABLED = True cada request registra:
+    - Tiempo total (wall time)
+    - Cantidad y duración de las queries SQL (eventos del motor de SQLAlchemy)
+    - Tiempo de serialización JSON (app.json.response)
+    - Tamaño de la respuesta
+
+Y lo publica en tres lugares:
+    1. Header `Server-Timing` → visible en la pestaña Network del navegador
+         Server-Timing: db;dur=12.4;desc="3 queries", json;dur=1.1, app;dur=5.0, total;dur=18.5
+    2. Una línea de log estructurada (logger 'app.perf', formato JSON)
+    3. Un ring buffer con los requests lentos (> PROFILING_SLOW_MS) y su SQL,
+       consultable en GET /api/debug/slow
+
+`app` = total - db - json: el tiempo de Python puro (Services, Schemas de Marshmallow...).
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import deque
+
+from flask import g, has_app_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger('app.perf')
+
+# Máximo de sentencias SQL guardadas por request en el ring buffer
+MAX_SQL_POR_REQUEST = 50
+
+
+class RegistroLentos:
+    """Ring buffer thread-safe de los requests lentos más recientes."""
+
+    def __init__(self, capacidad=50):
+        self._items = deque(maxlen=capacidad)
+        self._lock = threading.Lock()
+
+    def agregar(self, registro):
+        with self._lock:
+            self._items.append(registro)
+
+    def listar(self):
+        """Del más lento al más rápido."""
+        with self._lock:
+            items = list(self._items)
+        return sorted(items, key=lambda r: r['total_ms'], reverse=True)
+
+    def limpiar(self):
+        with self._lock:
+            self._items.clear()
+
+    def redimensionar(self, capacidad):
+        with self._lock:
+            self._items = deque(self._items, maxlen=capacidad)
+
+
+registro_lentos = RegistroLentos()
+
+
+# ============================================================================
+# EVENTOS DEL MOTOR (se registran una sola vez para TODOS los engines)
+# ============================================================================
+
+def _perfil_activo():
+    return getattr(g, '_perfil', None) if has_app_context() else None
+
+
+def _antes_de_query(conn, cursor, statement, parameters, context, executemany):
+    if _perfil_activo() is not None:
+        conn.info.setdefault('_perfil_inicio', []).append(time.perf_counter())
+
+
+def _despues_de_query(conn, cursor, statement, parameters, context, executemany):
+    perfil = _perfil_activo()
+    pila = conn.info.get('_perfil_inicio')
+    if perfil is None or not pila:
+        return
+
+    duracion = time.perf_counter() - pila.pop()
+    perfil['sql_s'] += duracion
+    perfil['sql_n'] += 1
+    if len(perfil['sql']) < MAX_SQL_POR_REQUEST:
+        perfil['sql'].append({'sql': statement, 'ms': round(duracion * 1000, 2)})
+
+
+def _error_de_query(contexto):
+    # Si la sentencia falla no hay after_cursor_execute: descartamos su inicio
+    conn = contexto.connection
+    if conn is not None and conn.info.get('_perfil_inicio'):
+        conn.info['_perfil_inicio'].pop()
+
+
+_eventos_registrados = False
+
+
+def _registrar_eventos_motor():
+    global _eventos_registrados
+    if _eventos_registrados:
+        return
+    event.listen(Engine, 'before_cursor_execute', _antes_de_query)
+    event.listen(Engine, 'after_cursor_execute', _despues_de_query)
+    event.listen(Engine, 'handle_error', _error_de_query)
+    _eventos_registrados = True
+
+
+# ============================================================================
+# MIDDLEWARE
+# ============================================================================
+
+def _medir_serializacion(app):
+    """Envuelve `app.json.response` (lo que usa jsonify) para cronometrarlo."""
+    original = app.json.response
+
+    def response_medida(*args, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            perfil = _perfil_activo()
+            if perfil is not None:
+                perfil['json_s'] += time.perf_counter() - inicio
+
+    app.json.response = response_medida
+
+
+def registrar_profiling(app):
+    """Activa el perfilado si PROFILING_ENABLED (lo llama create_app)."""
+    if not app.config.get('PROFILING_ENABLED', False):
+        return app
+
+    umbral_ms = app.config.get('PROFILING_SLOW_MS', 200)
+    registro_lentos.redimensionar(app.config.get('PROFILING_BUFFER_SIZE', 50))
+
+    _registrar_eventos_motor()
+    _medir_serializacion(app)
+
+    @app.before_request
+    def _iniciar_perfil():
+        g._perfil = {
+            'inicio': time.perf_counter(),
+            'sql_s': 0.0,
+            'sql_n': 0,
+            'json_s': 0.0,
+            'sql': []
+        }
+
+    @app.after_request
+    def _cerrar_perfil(response):
+        perfil = g.pop('_perfil', None)
+        if perfil is None:
+            return response
+
+        total_ms = (time.perf_counter() - perfil['inicio']) * 1000
+        sql_ms = perfil['sql_s'] * 1000
+        json_ms = perfil['json_s'] * 1000
+        app_ms = max(0.0, total_ms - sql_ms - json_ms)
+        tamano = None if response.is_streamed else response.calculate_content_length()
+
+        response.headers['Server-Timing'] = (
+            f'db;dur={sql_ms:.1f};desc="{perfil["sql_n"]} queries", '
+            f'json;dur={json_ms:.1f}, app;dur={app_ms:.1f}, total;dur={total_ms:.1f}'
+        )
+
+        registro = {
+            'method': request.method,
+            'path': request.full_path.rstrip('?'),
+            'endpoint': request.endpoint,
+            'status': response.status_code,
+            'total_ms': round(total_ms, 2),
+            'sql_ms': round(sql_ms, 2),
+            'sql_count': perfil['sql_n'],
+            'json_ms': round(json_ms, 2),
+            'app_ms': round(app_ms, 2),
+            'bytes': tamano
+        }
+        logger.info(json.dumps(registro))
+
+        if total_ms >= umbral_ms:
+            registro_lentos.agregar({**registro, 'timestamp': time.time(), 'sql': perfil['sql']})
+
+        return response
+
+    return app
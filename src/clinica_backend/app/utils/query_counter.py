@@ -0,0 +1,79 @@
+"""
+CONTADOR DE QUERIES (El Detector de N+1)
+
+Herramienta para pruebas: cuenta cuántas sentencias SQL ejecuta un bloque
+de código. Si un endpoint que hoy hace 4 queries empieza a hacer 40, la
+prueba falla y muestra el SQL ejecutado.
+
+Cuenta en TODOS los motores (`db.engines`): primario y réplicas. Las rutas
+con @usar_replica leen de una réplica cuando hay REPLICA_DATABASE_URLS.
+
+Uso (dentro de un app_context):
+    with assert_max_queries(4):
+        client.get('/api/v1/consultas/1')
+
+    with ContadorQueries() as contador:
+        client.get('/api/v1/consultas/1')
+    print(contador.total, contador.sentencias)
+"""
+
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app.extensions import db
+
+
+class ContadorQueries:
+    """Context manager que escucha los motores de SQLAlchemy mientras está activo."""
+
+    def __init__(self, engine=None):
+        # `db.engines` requiere app_context: se resuelve al entrar, no al importar
+        self._engines = [engine] if engine is not None else None
+        self.sentencias = []
+
+    def _registrar(self, conn, cursor, statement, parameters, context, executemany):
+        self.sentencias.append(statement)
+
+    @property
+    def total(self):
+        return len(self.sentencias)
+
+    def __enter__(self):
+        if self._engines is None:
+            # Sin repetir: un bind puede apuntar al mismo engine que otro
+            self._engines = list({id(e): e for e in db.engines.values()}.values())
+        for engine in self._engines:
+            event.listen(engine, 'before_cursor_execute', self._registrar)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        for engine in self._engines:
+            event.remove(engine, 'before_cursor_execute', self._registrar)
+        return False
+
+
+def _reporte(contador):
+    return '\n'.join(f'  {i}. {sql}' for i, sql in enumerate(contador.sentencias, 1))
+
+
+@contextmanager
+def assert_num_queries(esperadas, engine=None):
+    """Falla si el bloque NO ejecuta exactamente `esperadas` queries."""
+    with ContadorQueries(engine) as contador:
+        yield contador
+    if contador.total != esperadas:
+        raise AssertionError(
+            f"Se esperaban {esperadas} queries, se ejecutaron {contador.total}:\n{_reporte(contador)}"
+        )
+
+
+@contextmanager
+def assert_max_queries(maximo, engine=None):
+    """Falla si el bloque ejecuta MÁS de `maximo` queries (regresión N+1)."""
+    with ContadorQueries(engine) as contador:
+        yield contador
+    if contador.total > maximo:
+        raise AssertionError(
+            f"Máximo {maximo} queries, se ejecutaron {contador.total}:\n{_reporte(contador)}"
+        )
@@ -0,0 +1,186 @@
+"""
+RÉPLICAS DE LECTURA (El Desvío de Tráfico)
+
+Todas las lecturas y escrituras iban al mismo PostgreSQL. Con réplicas
+configuradas (REPLICA_DATABASE_URLS → SQLALCHEMY_BINDS 'replica_0', 'replica_1'...):
+
+    GET decorado con @usar_replica  → réplica (round-robin entre las sanas)
+    Todo lo demás                   → primario
+
+Reglas de seguridad (lectura después de escritura):
+    1. Si la sesión tiene cambios pendientes o está haciendo flush → primario.
+    2. Sentencias DML explícitas (insert/update/delete) → primario.
+    3. Después de una escritura exitosa el cliente recibe la cookie
+       `leer_primario` por REPLICA_STICKY_SECONDS: sus GET siguientes leen
+       del primario y no ven datos "del pasado" por el retraso de replicación.
+       (El requests.Session del Frontend guarda la cookie automáticamente.)
+
+    4. Lo que se guarda en el caché compartido (`cache.get_or_set`) se lee del
+       primario: una réplica atrasada justo después de una invalidación dejaría
+       datos viejos en el caché para TODOS durante CACHE_DEFAULT_TTL.
+
+Salud:
+    Un error de desconexión en una réplica la saca de la rotación por
+    REPLICA_RETRY_SECONDS; al volver se prueba con `SELECT 1`.
+    Sin réplicas sanas, todo va al primario.
+
+Para pruebas locales basta apuntar una réplica a la MISMA base de datos.
+"""
+
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from flask import current_app, g, has_app_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, text
+
+COOKIE_PRIMARIO = 'leer_primario'
+
+
+class EnrutadorReplicas:
+    """Elige la réplica de cada lectura: round-robin + salud."""
+
+    def __init__(self):
+        self.claves = ()
+        self.reintento_s = 30
+        self._ciclo = None
+        self._caidas = {}           # clave -> monotonic hasta cuándo está fuera
+        self._escuchando = set()    # engines con listener de errores ya instalado
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.claves = tuple(app.config.get('REPLICA_BINDS', ()))
+        self.reintento_s = app.config.get('REPLICA_RETRY_SECONDS', 30)
+        self._ciclo = itertools.cycle(self.claves) if self.claves else None
+        app.extensions['replicas'] = self
+
+        if not self.claves:
+            return
+
+        pegajoso_s = app.config.get('REPLICA_STICKY_SECONDS', 5)
+
+        @app.after_request
+        def _marcar_lectura_primario(response):
+            # Escritura exitosa → las próximas lecturas de ESTE cliente van al primario
+            if request.method not in ('GET', 'HEAD', 'OPTIONS') and response.status_code < 400:
+                response.set_cookie(
+                    COOKIE_PRIMARIO, '1',
+                    max_age=pegajoso_s, httponly=True, samesite='Lax'
+                )
+            return response
+
+    @property
+    def activo(self):
+        return bool(self.claves)
+
+    def _engine(self, clave):
+        engine = current_app.extensions['sqlalchemy'].engines[clave]
+        if clave not in self._escuchando:
+            event.listen(engine, 'handle_error', lambda ctx, c=clave: self._al_fallar(c, ctx))
+            self._escuchando.add(clave)
+        return engine
+
+    def _al_fallar(self, clave, contexto):
+        if contexto.is_disconnect:
+            self.marcar_caida(clave)
+
+    def marcar_caida(self, clave):
+        with self._lock:
+            self._caidas[clave] = time.monotonic() + self.reintento_s
+
+    def _esta_sana(self, clave):
+        with self._lock:
+            hasta = self._caidas.get(clave)
+        if hasta is None:
+            return True
+        if time.monotonic() < hasta:
+            return False
+
+        # Pasó el tiempo de castigo: probamos antes de devolverla a la rotación
+        try:
+            with self._engine(clave).connect() as conn:
+                conn.execute(text('SELECT 1'))
+        except Exception:
+            self.marcar_caida(clave)
+            return False
+        with self._lock:
+            self._caidas.pop(clave, None)
+        return True
+
+    def elegir(self):
+        """Engine de la próxima réplica sana, o None (→ primario)."""
+        if not self.claves:
+            return None
+        for _ in range(len(self.claves)):
+            with self._lock:
+                clave = next(self._ciclo)
+            if self._esta_sana(clave):
+                return self._engine(clave)
+        return None
+
+    def estado(self):
+        """Para /api/health/db: qué réplicas están en rotación."""
+        ahora = time.monotonic()
+        with self._lock:
+            return {
+                clave: 'caida' if self._caidas.get(clave, 0) > ahora else 'ok'
+                for clave in self.claves
+            }
+
+
+def usar_replica(vista):
+    """
+    Decorador para rutas GET de solo lectura:
+
+        @pacientes_bp.route('/pacientes', methods=['GET'])
+        @usar_replica
+        def get_pacientes(): ...
+    """
+    @wraps(vista)
+    def envoltura(*args, **kwargs):
+        g.usar_replica = request.cookies.get(COOKIE_PRIMARIO) is None
+        return vista(*args, **kwargs)
+    return envoltura
+
+
+@contextmanager
+def leer_del_primario():
+    """Dentro del bloque las lecturas van al primario, aunque la ruta tenga @usar_replica."""
+    if not has_app_context():
+        yield
+        return
+    anterior = g.get('usar_replica')
+    g.usar_replica = False
+    try:
+        yield
+    finally:
+        g.usar_replica = anterior
+
+
+class RoutingSession(Session):
+    """
+    Session de Flask-SQLAlchemy que manda las lecturas marcadas a una réplica.
+    Se instala en extensions.py: SQLAlchemy(session_options={'class_': RoutingSession})
+    """
+
+    def _lee_de_replica(self, clause):
+        if not has_app_context() or not g.get('usar_replica'):
+            return False
+        if self._flushing or self.new or self.dirty or self.deleted:
+            return False
+        if clause is not None and getattr(clause, 'is_dml', False):
+            return False
+        return True
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._lee_de_replica(clause):
+            # Una réplica por request: todas sus queries ven el mismo estado
+            if '_engine_replica' not in g:
+                enrutador = current_app.extensions.get('replicas')
+                g._engine_replica = enrutador.elegir() if enrutador is not None else None
+            if g._engine_replica is not None:
+                return g._engine_replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
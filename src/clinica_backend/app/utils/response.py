@@ -1,5 +1,7 @@
 from flask import jsonify
 
+from app.utils.metrics import contar_error
+
 """
 MODULO DE RESPUESTAS ESTANDARIZADAS (Patrón Facade para Respuestas HTTP)
 
@@ -79,4 +81,7 @@ class APIResponse:
             "error": error_structure
         }
         
+        # Contador Prometheus por código de error (no-op sin prometheus_client)
+        contar_error(code, status_code)
+        
         return jsonify(response_structure), status_code
\ No newline at end of file
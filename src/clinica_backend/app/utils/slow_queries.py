@@ -0,0 +1,231 @@
+"""
+REGISTRO DE QUERIES LENTAS (El Radar)
+
+`SQLALCHEMY_ECHO = True` imprime TODO en desarrollo y en producción no hay nada.
+Este módulo registra SOLO las sentencias que superan SLOW_QUERY_MS:
+    - SQL, "forma" de los parámetros (tipos, NUNCA valores: son datos de pacientes)
+    - Duración, endpoint que la disparó, hora
+
+Opcional (SLOW_QUERY_EXPLAIN = True): para una muestra de los SELECT lentos
+(SLOW_QUERY_EXPLAIN_SAMPLE) corre en segundo plano:
+    EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) <la misma sentencia>
+en una conexión aparte con `SET TRANSACTION READ ONLY` + ROLLBACK, así
+nunca puede escribir y el request original no espera. La cola está acotada
+(SLOW_QUERY_EXPLAIN_PENDIENTES): en una ráfaga de queries lentas, las que no
+entran se registran sin plan en vez de acumular EXPLAINs contra la BD.
+
+Todo queda en un almacén en memoria acotado (los N más recientes),
+consultable en GET /api/admin/slow-queries (solo con DEBUG).
+
+Sospechosos a confirmar: los `ilike` del buscador de pacientes y las
+queries del Kardex.
+"""
+
+import itertools
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger('app.sql.slow')
+
+
+def forma_parametros(parametros, executemany=False):
+    """
+    Describe los parámetros sin exponer valores.
+
+    Ejemplos:
+        {'dni': '123', 'limit': 50}  → {'dni': 'str', 'limit': 'int'}
+        ('123', 50)                  → ['str', 'int']
+        executemany con 500 filas    → {'filas': 500, 'forma': {...}}
+    """
+    if executemany and isinstance(parametros, (list, tuple)):
+        return {
+            'filas': len(parametros),
+            'forma': forma_parametros(parametros[0]) if parametros else None
+        }
+    if isinstance(parametros, dict):
+        return {k: type(v).__name__ for k, v in parametros.items()}
+    if isinstance(parametros, (list, tuple)):
+        return [type(v).__name__ for v in parametros]
+    return type(parametros).__name__
+
+
+class AlmacenQueriesLentas:
+    """Almacén thread-safe de las últimas N queries lentas."""
+
+    def __init__(self, capacidad=200):
+        self._items = deque(maxlen=capacidad)
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def agregar(self, registro):
+        with self._lock:
+            registro['id'] = next(self._ids)
+            self._items.append(registro)
+        return registro
+
+    def adjuntar_explain(self, registro, plan=None, error=None):
+        with self._lock:
+            registro['explain'] = plan
+            if error:
+                registro['explain_error'] = error
+
+    def listar(self, limit=50, min_ms=0):
+        """Las más lentas primero."""
+        with self._lock:
+            items = [dict(r) for r in self._items if r['ms'] >= min_ms]
+        items.sort(key=lambda r: r['ms'], reverse=True)
+        return items[:limit]
+
+    def agrupar(self):
+        """Una fila por sentencia: cuántas veces apareció, máximo y promedio."""
+        grupos = {}
+        with self._lock:
+            for r in self._items:
+                g = grupos.setdefault(r['sql'], {'sql': r['sql'], 'veces': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+                g['veces'] += 1
+                g['total_ms'] += r['ms']
+                g['max_ms'] = max(g['max_ms'], r['ms'])
+        filas = []
+        for g in grupos.values():
+            g['avg_ms'] = round(g.pop('total_ms') / g['veces'], 2)
+            filas.append(g)
+        return sorted(filas, key=lambda g: g['max_ms'], reverse=True)
+
+    def limpiar(self):
+        with self._lock:
+            self._items.clear()
+
+    def redimensionar(self, capacidad):
+        with self._lock:
+            self._items = deque(self._items, maxlen=capacidad)
+
+
+almacen_lentas = AlmacenQueriesLentas()
+
+
+class _Configuracion:
+    umbral_s = 0.1
+    explain = False
+    muestreo = 0.1
+
+
+_config = _Configuracion()
+
+# Un solo hilo: los EXPLAIN se encolan y nunca compiten entre sí por la BD.
+# La cola del ThreadPoolExecutor no tiene límite: los cupos la acotan.
+_ejecutor_explain = ThreadPoolExecutor(max_workers=1, thread_name_prefix='explain')
+_cupos_explain = threading.BoundedSemaphore(4)
+
+
+# ============================================================================
+# EXPLAIN EN SEGUNDO PLANO
+# ============================================================================
+
+def _correr_explain(cupos, engine, sentencia, parametros, registro):
+    try:
+        _explicar(engine, sentencia, parametros, registro)
+    finally:
+        cupos.release()  # El mismo semáforo que se tomó (init_app puede reemplazarlo)
+
+
+def _explicar(engine, sentencia, parametros, registro):
+    try:
+        with engine.connect() as conn:
+            # `info` vive con la conexión del pool: la marca se quita antes de devolverla
+            conn.info['_sin_radar'] = True  # Que el EXPLAIN no se registre a sí mismo
+            try:
+                conn.exec_driver_sql('SET TRANSACTION READ ONLY')
+                plan = conn.exec_driver_sql(
+                    'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) ' + sentencia,
+                    parametros
+                ).scalar()
+            finally:
+                conn.rollback()
+                conn.info.pop('_sin_radar', None)
+        almacen_lentas.adjuntar_explain(registro, plan=plan)
+    except Exception as e:
+        almacen_lentas.adjuntar_explain(registro, error=str(e))
+
+
+def _debe_explicar(sentencia, executemany):
+    if not _config.explain or executemany:
+        return False
+    # ANALYZE EJECUTA la sentencia: solo lecturas
+    if not sentencia.lstrip().upper().startswith(('SELECT', 'WITH')):
+        return False
+    return random.random() < _config.muestreo
+
+
+# ============================================================================
+# EVENTOS DEL MOTOR
+# ============================================================================
+
+def _antes(conn, cursor, statement, parameters, context, executemany):
+    if not conn.info.get('_sin_radar'):
+        conn.info.setdefault('_radar_inicio', []).append(time.perf_counter())
+
+
+def _despues(conn, cursor, statement, parameters, context, executemany):
+    pila = conn.info.get('_radar_inicio')
+    if conn.info.get('_sin_radar') or not pila:
+        return
+
+    duracion = time.perf_counter() - pila.pop()
+    if duracion < _config.umbral_s:
+        return
+
+    registro = almacen_lentas.agregar({
+        'sql': statement,
+        'parametros': forma_parametros(parameters, executemany),
+        'ms': round(duracion * 1000, 2),
+        'endpoint': request.endpoint if has_request_context() else None,
+        'timestamp': time.time(),
+        'explain': None
+    })
+    logger.warning(f"{registro['ms']} ms | {registro['endpoint']} | {' '.join(statement.split())[:300]}")
+
+    if _debe_explicar(statement, executemany):
+        cupos = _cupos_explain
+        if cupos.acquire(blocking=False):
+            _ejecutor_explain.submit(_correr_explain, cupos, conn.engine, statement, parameters, registro)
+        else:
+            almacen_lentas.adjuntar_explain(registro, error="Descartado: cola de EXPLAIN llena")
+
+
+def _error(contexto):
+    # Si la sentencia falla no hay after_cursor_execute: descartamos su inicio
+    conn = contexto.connection
+    if conn is not None and conn.info.get('_radar_inicio'):
+        conn.info['_radar_inicio'].pop()
+
+
+_eventos_registrados = False
+
+
+def registrar_queries_lentas(app):
+    """Activa el radar si SLOW_QUERY_ENABLED (lo llama create_app)."""
+    global _eventos_registrados, _cupos_explain
+    if not app.config.get('SLOW_QUERY_ENABLED', False):
+        return app
+
+    _config.umbral_s = app.config.get('SLOW_QUERY_MS', 100) / 1000
+    _config.explain = app.config.get('SLOW_QUERY_EXPLAIN', False)
+    _config.muestreo = app.config.get('SLOW_QUERY_EXPLAIN_SAMPLE', 0.1)
+    almacen_lentas.redimensionar(app.config.get('SLOW_QUERY_STORE_SIZE', 200))
+    _cupos_explain = threading.BoundedSemaphore(app.config.get('SLOW_QUERY_EXPLAIN_PENDIENTES', 4))
+
+    if not _eventos_registrados:
+        event.listen(Engine, 'before_cursor_execute', _antes)
+        event.listen(Engine, 'after_cursor_execute', _despues)
+        event.listen(Engine, 'handle_error', _error)
+        _eventos_registrados = True
+
+    return app
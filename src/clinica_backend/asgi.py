@@ -0,0 +1,20 @@
+# asgi.py (en la raíz del proyecto)
+"""
+Punto de entrada ASGI: lecturas async + el resto de la API Flask.
+
+    uvicorn asgi:app --host 0.0.0.0 --port 5000 --workers 4
+
+Ver app/asgi.py para saber qué rutas atiende la capa async.
+"""
+
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app import create_app
+from app.asgi import crear_asgi
+
+config_name = os.environ.get('FLASK_ENV', 'default')
+flask_app = create_app(config_name)
+app = crear_asgi(flask_app)
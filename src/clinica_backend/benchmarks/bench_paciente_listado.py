@@ -0,0 +1,84 @@
+# src/clinica_backend/benchmarks/bench_paciente_listado.py
+"""
+BENCHMARK: Serialización del listado de pacientes
+
+Compara, para la misma página de pacientes:
+    A) PacienteSchema(many=True).dump(objetos_orm)   ← camino clásico
+    B) PacienteListadoSerializer.dump(filas)          ← camino rápido
+
+No necesita base de datos: arma objetos transitorios y tuplas equivalentes.
+
+Uso (desde src/clinica_backend):
+    python -m benchmarks.bench_paciente_listado --filas 1000 --repeticiones 20
+"""
+
+import argparse
+import timeit
+from datetime import datetime, timezone
+
+from app import create_app
+from app.extensions import mapa_distritos
+from app.models import Distrito, Paciente
+from app.models.paciente import ALERTAS
+from app.schemas.paciente_schema import PacienteListadoSerializer, PacienteSchema
+
+
+def generar_datos(n):
+    distritos = [Distrito(id_distrito=i, nombre_distrito=f'Distrito {i}') for i in range(1, 44)]
+    creado = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    objetos, filas = [], []
+
+    for i in range(n):
+        distrito = distritos[i % len(distritos)] if i % 7 else None
+        valores = dict(
+            id_paciente=i,
+            dni=f'{10000000 + i}',
+            nombre_completo=f'Paciente de Prueba {i}',
+            sexo='F' if i % 2 else 'M',
+            telefono=f'9{i:08d}' if i % 5 else None,
+            nacimiento_year=1950 + i % 60,
+            nacimiento_month=(i % 12) + 1 if i % 3 else None,
+            nacimiento_day=(i % 28) + 1 if i % 3 else None,
+            paciente_problematico=False,
+            created_at=creado,
+            id_distrito=distrito.id_distrito if distrito else None
+        )
+        paciente = Paciente(**valores)
+        objetos.append(paciente)
+        # En producción `edad` y las banderas las calcula PostgreSQL (ver PacienteListadoSerializer.columnas)
+        filas.append((
+            *valores.values(),
+            paciente.edad,
+            *(getattr(paciente, codigo) for codigo in ALERTAS)
+        ))
+
+    return objetos, filas, {d.id_distrito: d.nombre_distrito for d in distritos}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filas', type=int, default=1000)
+    parser.add_argument('--repeticiones', type=int, default=20)
+    args = parser.parse_args()
+
+    app = create_app('development')
+    with app.app_context():
+        objetos, filas, nombres = generar_datos(args.filas)
+        mapa_distritos.reemplazar(nombres)  # Sin BD: ambos caminos leen el nombre del mapa
+        schema = PacienteSchema(many=True)
+
+        # Ambos caminos DEBEN producir exactamente el mismo JSON
+        assert schema.dump(objetos) == PacienteListadoSerializer.dump(filas), "Las salidas difieren"
+
+        t_schema = timeit.timeit(lambda: schema.dump(objetos), number=args.repeticiones)
+        t_rapido = timeit.timeit(lambda: PacienteListadoSerializer.dump(filas), number=args.repeticiones)
+
+    por_pagina = lambda t: t / args.repeticiones * 1000
+    print(f"Pacientes por página: {args.filas} | Repeticiones: {args.repeticiones}")
+    print(f"  PacienteSchema(many=True).dump : {por_pagina(t_schema):8.2f} ms/página")
+    print(f"  PacienteListadoSerializer.dump : {por_pagina(t_rapido):8.2f} ms/página")
+    print(f"  Aceleración                    : {t_schema / t_rapido:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+# src/clinica_backend/benchmarks/bench_to_dict.py
+"""
+BENCHMARK: BaseModel.to_dict / to_dicts
+
+Compara, para N pacientes transitorios (sin base de datos):
+    A) to_dict clásico: db.inspect(self).mapper.column_attrs en cada llamada
+    B) to_dict con metadatos cacheados por clase
+    C) Paciente.to_dicts(objetos)                      ← bulk
+    D) _to_camel_case clásico vs. cacheado (keys en camelCase)
+
+Uso (desde src/clinica_backend):
+    python -m benchmarks.bench_to_dict --filas 10000 --repeticiones 10
+"""
+
+import argparse
+import timeit
+
+from app import create_app
+from app.extensions import db, mapa_distritos
+from app.models import Paciente
+from benchmarks.bench_paciente_listado import generar_datos
+
+
+def to_dict_clasico(obj):
+    return {c.key: getattr(obj, c.key) for c in db.inspect(obj).mapper.column_attrs}
+
+
+def camel_clasico(snake_case_dict):
+    camel_data = {}
+    for key, value in snake_case_dict.items():
+        components = key.split('_')
+        camel_data[components[0] + ''.join(x.title() for x in components[1:])] = value
+    return camel_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filas', type=int, default=10000)
+    parser.add_argument('--repeticiones', type=int, default=10)
+    args = parser.parse_args()
+
+    app = create_app('development')
+    with app.app_context():
+        objetos, _, nombres = generar_datos(args.filas)
+        mapa_distritos.reemplazar(nombres)  # Sin BD: el mapa de distritos no debe ir a leer la tabla
+
+        # Todos los caminos DEBEN producir exactamente lo mismo
+        esperado = [to_dict_clasico(o) for o in objetos]
+        assert [o.to_dict() for o in objetos] == esperado, "to_dict difiere"
+        assert Paciente.to_dicts(objetos) == esperado, "to_dicts difiere"
+        assert Paciente.to_dicts(objetos, camel=True) == [camel_clasico(d) for d in esperado], "camel difiere"
+
+        casos = {
+            'to_dict clásico (inspect)      ': lambda: [to_dict_clasico(o) for o in objetos],
+            'to_dict cacheado               ': lambda: [o.to_dict() for o in objetos],
+            'Paciente.to_dicts              ': lambda: Paciente.to_dicts(objetos),
+            'clásico + _to_camel_case viejo ': lambda: [camel_clasico(to_dict_clasico(o)) for o in objetos],
+            'Paciente.to_dicts(camel=True)  ': lambda: Paciente.to_dicts(objetos, camel=True),
+        }
+        tiempos = {nombre: timeit.timeit(fn, number=args.repeticiones) for nombre, fn in casos.items()}
+
+    base = next(iter(tiempos.values()))
+    print(f"Instancias: {args.filas} | Repeticiones: {args.repeticiones}")
+    for nombre, t in tiempos.items():
+        print(f"  {nombre}: {t / args.repeticiones * 1000:8.2f} ms/lote  ({base / t:4.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+# src/clinica_backend/benchmarks/check_queries.py
+"""
+CHEQUEO: Queries por endpoint (Regresiones N+1)
+
+Llena una base SQLite en memoria (config 'testing') con una consulta CHICA
+y una GRANDE, y verifica con `assert_num_queries` que los endpoints hacen
+la MISMA cantidad de queries sin importar cuántos servicios/consumos o
+pacientes haya:
+
+    GET /api/v1/consultas/<id>   → 5 (consulta, servicios, servicio, consumos, producto)
+    GET /api/v1/pacientes        → 2 (COUNT + filas; el distrito sale del mapa en memoria)
+
+Sale con error (AssertionError + el SQL ejecutado) si alguno cambia.
+
+Uso (desde src/clinica_backend):
+    python -m benchmarks.check_queries
+"""
+
+from decimal import Decimal
+
+from app import create_app
+from app.extensions import db, mapa_distritos
+from app.models import (
+    Consulta, ConsultaServicio, ConsumoProducto, Distrito, Marca, Paciente, Producto, Servicio
+)
+from app.utils.query_counter import assert_num_queries
+
+QUERIES_DETALLE_CONSULTA = 5
+QUERIES_LISTADO_PACIENTES = 2
+
+
+def sembrar():
+    """Devuelve (id consulta chica, id consulta grande)."""
+    distritos = [Distrito(nombre_distrito=f'Distrito {i}') for i in range(1, 6)]
+    marca = Marca(nombre_marca='Marca de Prueba')
+    productos = [Producto(marca=marca, nombre_producto=f'Producto {i}', precio_venta=10) for i in range(5)]
+    servicios = [Servicio(nombre_servicio=f'Servicio {i}', precio_servicio=100) for i in range(5)]
+    pacientes = [
+        Paciente(
+            id_paciente=i + 1,  # BIGINT: SQLite solo autoincrementa INTEGER PRIMARY KEY
+            dni=f'{10000000 + i}',
+            nombre_completo=f'Paciente de Prueba {i}',
+            sexo='F' if i % 2 else 'M',
+            nacimiento_year=1960 + i,
+            distrito=distritos[i % len(distritos)]
+        )
+        for i in range(30)
+    ]
+
+    def consulta(n_servicios):
+        return Consulta(
+            paciente=pacientes[0],
+            total_historico=Decimal('0'),
+            servicios=[
+                ConsultaServicio(
+                    servicio=servicios[s],
+                    precio_servicio=100,
+                    consumos=[
+                        ConsumoProducto(producto=p, cantidad_consumida=1, precio_producto=10, importe_venta=10)
+                        for p in productos[:s + 1]
+                    ]
+                )
+                for s in range(n_servicios)
+            ]
+        )
+
+    chica, grande = consulta(1), consulta(5)
+    db.session.add_all([*pacientes, chica, grande])
+    db.session.commit()
+    ids = chica.id_consulta, grande.id_consulta
+    db.session.remove()  # Sin identity map: cada GET carga desde la BD
+    return ids
+
+
+def main():
+    app = create_app('testing')
+    cliente = app.test_client()
+
+    with app.app_context():
+        db.create_all()
+        id_chica, id_grande = sembrar()
+        mapa_distritos.recargar()  # Carga fuera de lo medido
+
+        for id_consulta in (id_chica, id_grande):
+            with assert_num_queries(QUERIES_DETALLE_CONSULTA):
+                respuesta = cliente.get(f'/api/v1/consultas/{id_consulta}')
+            assert respuesta.status_code == 200, respuesta.get_json()
+            db.session.remove()
+
+        for per_page in (5, 30):
+            with assert_num_queries(QUERIES_LISTADO_PACIENTES):
+                respuesta = cliente.get(f'/api/v1/pacientes?per_page={per_page}')
+            assert respuesta.status_code == 200, respuesta.get_json()
+            assert len(respuesta.get_json()['data']['items']) == per_page
+            db.session.remove()
+
+    print(f"GET /api/v1/consultas/<id> : {QUERIES_DETALLE_CONSULTA} queries (1 y 5 servicios)")
+    print(f"GET /api/v1/pacientes      : {QUERIES_LISTADO_PACIENTES} queries (5 y 30 por página)")
+
+
+if __name__ == '__main__':
+    main()
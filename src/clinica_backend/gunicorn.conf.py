@@ -0,0 +1,25 @@
+# src/clinica_backend/gunicorn.conf.py
+"""
+Configuración de gunicorn para producción:
+    PROMETHEUS_MULTIPROC_DIR=/tmp/clinica_metrics gunicorn -c gunicorn.conf.py run:app
+
+PROMETHEUS_MULTIPROC_DIR debe existir y estar VACÍO al arrancar: ahí cada
+worker escribe sus métricas y /metrics las suma (ver app/utils/metrics.py).
+"""
+
+import os
+import multiprocessing
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+
+
+def child_exit(server, worker):
+    """Un worker murió: sus gauges 'livesum' (pool de BD) dejan de sumarse."""
+    if not os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        return
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    multiprocess.mark_process_dead(worker.pid)
@@ -43,6 +43,36 @@ class Config:
     Valor por defecto: 10 segundos
     """
     
+    API_MAX_WORKERS = int(os.getenv("API_MAX_WORKERS", "8"))
+    API_POOL_CONNECTIONS = int(os.getenv("API_POOL_CONNECTIONS", "4"))
+    API_POOL_MAXSIZE = int(os.getenv("API_POOL_MAXSIZE", "16"))
+    
+    """
+    Concurrencia y pool del cliente HTTP (BaseAPIClient)
+        - API_MAX_WORKERS: hilos máximos por lote de peticiones (get_many)
+        - API_POOL_CONNECTIONS: hosts distintos con pool propio
+        - API_POOL_MAXSIZE: conexiones keep-alive por host
+          (debe ser >= API_MAX_WORKERS o los hilos esperan conexión libre)
+    """
+    
+    API_RETRIES = int(os.getenv("API_RETRIES", "3"))
+    API_RETRY_BACKOFF = float(os.getenv("API_RETRY_BACKOFF", "0.3"))
+    API_RETRY_JITTER = float(os.getenv("API_RETRY_JITTER", "0.2"))
+    
+    """
+    Reintentos SOLO para métodos idempotentes (GET, HEAD, OPTIONS, PUT, DELETE)
+    Espera entre intentos: backoff * 2^(intento-1) + aleatorio(0, jitter)
+    Un POST nunca se reintenta (podría crear dos pacientes).
+    """
+    
+    API_BREAKER_THRESHOLD = int(os.getenv("API_BREAKER_THRESHOLD", "5"))
+    API_BREAKER_RESET = float(os.getenv("API_BREAKER_RESET", "30"))
+    
+    """
+    Circuit Breaker: tras N fallos seguidos (conexión/timeout/5xx) las
+    llamadas fallan al instante durante API_BREAKER_RESET segundos.
+    """
+    
     # =============================
     # DEBUG 
     # =============================
@@ -54,6 +84,13 @@ class Config:
     OJO: Nunca exponer en produccion (expone informacion sensible)
     """
     
+    METRICS_WINDOW = int(os.getenv("METRICS_WINDOW", "1000"))
+    
+    """
+    Muestras de latencia guardadas por endpoint para calcular p50/p95/p99
+    (modules/utils/metrics.py). Ventana deslizante: las más viejas se descartan.
+    """
+    
     STREAMLIT_PAGE_TITLE = os.getenv("PAGE_TITLE", "🏥 MediStock ERP")
     STREAMLIT_PAGE_ICON = os.getenv("PAGE_ICON", "🏥")
     STREAMLIT_LAYOUT = os.getenv("LAYOUT", "wide")
@@ -73,8 +110,34 @@ class Config:
     EDAD_MINIMA = 0
     EDAD_MAXIMA = 120
     
+    # =============================
+    # CACHE DE LECTURAS (modules/utils/cache_manager.py)
+    # =============================
     CACHE_TTL_PACIENTES = 300  # 5 minutos (datos estables)
     CACHE_TTL_INVENTARIO = 60  # 1 minuto (datos más dinámicos)
+    CACHE_TTL_CATALOGO = 600   # 10 minutos (marcas/servicios casi no cambian)
+    CACHE_TTL_DEFAULT = 30
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "256"))
+    
+    # TTL por recurso raíz del endpoint (0 = nunca cachear)
+    CACHE_TTL_POR_RECURSO = {
+        "/pacientes": CACHE_TTL_PACIENTES,
+        "/consultas": CACHE_TTL_PACIENTES,
+        "/productos": CACHE_TTL_INVENTARIO,
+        "/kardex": CACHE_TTL_INVENTARIO,
+        "/movimientos": CACHE_TTL_INVENTARIO,
+        "/marcas": CACHE_TTL_CATALOGO,
+        "/servicios": CACHE_TTL_CATALOGO,
+        "/health": 0,
+    }
+    
+    # Escribir en un recurso también invalida estos otros
+    # (ej: una consulta con consumos descuenta stock de productos)
+    CACHE_DEPENDENCIAS = {
+        "/consultas": ("/pacientes", "/productos", "/kardex"),
+        "/movimientos": ("/productos", "/kardex"),
+        "/marcas": ("/productos",),
+    }
     
     # =============================
     # Validacion de Configuracion
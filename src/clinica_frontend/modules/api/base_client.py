@@ -13,14 +13,59 @@ Autor: MediStock Team
 Versión: 2.0
 """
 
+import asyncio
+import time
 import requests
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from urllib3.util.retry import Retry
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Union
 import logging
 from clinica_frontend.config import Config
+from clinica_frontend.modules.utils.cache_manager import api_cache, ttl_para
+from clinica_frontend.modules.api.circuit_breaker import CircuitBreaker, CircuitOpenError
+from clinica_frontend.modules.api.timed_adapter import (
+    TimedHTTPAdapter, pop_connect_time, reset_connect_time
+)
+from clinica_frontend.modules.utils.metrics import client_metrics
 
 # Configurar logger
 logger = logging.getLogger(__name__)
 
+# Una petición de lote: "/pacientes" o ("/pacientes", {"page": 2})
+GetRequest = Union[str, Tuple[str, Optional[Dict]]]
+
+# Métodos que se pueden repetir sin efectos duplicados (RFC 9110)
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+
+# Respuestas que indican un problema transitorio del servidor
+TRANSIENT_STATUS = (502, 503, 504)
+
+# Un solo breaker por proceso: si el Backend cae, cae para todos los clientes
+backend_breaker = CircuitBreaker(
+    failure_threshold=Config.API_BREAKER_THRESHOLD,
+    reset_timeout=Config.API_BREAKER_RESET
+)
+
+
+def _build_retry() -> Retry:
+    """Política de reintentos con backoff exponencial (+ jitter si urllib3 >= 2)."""
+    kwargs = dict(
+        total=Config.API_RETRIES,
+        connect=Config.API_RETRIES,
+        read=Config.API_RETRIES,
+        status=Config.API_RETRIES,
+        backoff_factor=Config.API_RETRY_BACKOFF,
+        status_forcelist=TRANSIENT_STATUS,
+        allowed_methods=IDEMPOTENT_METHODS,
+        raise_on_status=False,
+        respect_retry_after_header=True
+    )
+    try:
+        return Retry(backoff_jitter=Config.API_RETRY_JITTER, **kwargs)
+    except TypeError:
+        # urllib3 1.x no soporta jitter
+        return Retry(**kwargs)
+
 
 class BaseAPIClient:
     """
@@ -53,6 +98,18 @@ class BaseAPIClient:
         # Session reutiliza conexión TCP (HTTP Keep-Alive)
         self.session = requests.Session()
         
+        # Pool de conexiones dimensionado para get_many() + reintentos:
+        # sin esto urllib3 guarda solo 10 conexiones y un "connection reset"
+        # llega directo al usuario como error
+        # (TimedHTTPAdapter = HTTPAdapter + medición del tiempo de conexión)
+        adapter = TimedHTTPAdapter(
+            pool_connections=Config.API_POOL_CONNECTIONS,
+            pool_maxsize=Config.API_POOL_MAXSIZE,
+            max_retries=_build_retry()
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        
         # Headers por defecto para todas las peticiones
         self.session.headers.update({
             "Content-Type": "application/json",
@@ -98,6 +155,80 @@ class BaseAPIClient:
                 f"Recibido: {endpoint}"
             )
 
+    def _send(
+        self,
+        method: str,
+        endpoint: str,
+        cache: str = "bypass",
+        **kwargs
+    ) -> requests.Response:
+        """
+        Ejecuta la petición pasando por el Circuit Breaker y la cronometra.
+        
+        - Circuito abierto: lanza CircuitOpenError SIN tocar la red.
+        - Error de red / timeout / 5xx transitorio: cuenta como fallo.
+        - Cualquier otra respuesta (incluye 4xx): el Backend está vivo.
+        
+        Los reintentos ya ocurrieron dentro del HTTPAdapter: aquí llega
+        el resultado final.
+        
+        Tiempos (ver modules/utils/metrics.py):
+            connect → TimedHTTPAdapter (0 si la conexión Keep-Alive se reutilizó)
+            ttfb    → hasta tener los headers, descontando connect
+            body    → lectura del cuerpo (stream=True la separa de ttfb)
+        """
+        try:
+            backend_breaker.before_call()
+        except CircuitOpenError:
+            client_metrics.record(method, endpoint, status="circuit_open", cache=cache)
+            raise
+        
+        reset_connect_time()
+        inicio = time.perf_counter()
+        try:
+            response = self.session.request(
+                method,
+                f"{self.base_url}{endpoint}",
+                timeout=self.timeout,
+                stream=True,
+                **kwargs
+            )
+            headers_listos = time.perf_counter()
+            contenido = response.content  # Lee el cuerpo y libera la conexión al pool
+            fin = time.perf_counter()
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            backend_breaker.record_failure()
+            client_metrics.record(
+                method, endpoint, status="error", cache=cache,
+                connect=pop_connect_time(), ttfb=time.perf_counter() - inicio
+            )
+            raise
+        except Exception:
+            # Error del propio cliente (no del Backend): no abre el circuito
+            backend_breaker.release()
+            pop_connect_time()
+            raise
+        
+        if response.status_code in TRANSIENT_STATUS:
+            backend_breaker.record_failure()
+        else:
+            backend_breaker.record_success()
+        
+        connect = pop_connect_time()
+        ttfb = max(0.0, headers_listos - inicio - connect)
+        body = fin - headers_listos
+        client_metrics.record(
+            method, endpoint, status=response.status_code, cache=cache,
+            connect=connect, ttfb=ttfb, body=body, size=len(contenido)
+        )
+        logger.debug(
+            f"{method} {endpoint} -> {response.status_code} | "
+            f"{(connect + ttfb + body) * 1000:.1f} ms "
+            f"(connect {connect * 1000:.1f}, ttfb {ttfb * 1000:.1f}, body {body * 1000:.1f}) | "
+            f"{len(contenido)} B | cache {cache}"
+        )
+        return response
+
     def _handle_response(self, response: requests.Response) -> Dict[str, Any]:
         """
         Procesa respuesta HTTP y normaliza salida.
@@ -188,7 +319,20 @@ class BaseAPIClient:
             }
         }
         """
-        if isinstance(exception, requests.exceptions.Timeout):
+        if isinstance(exception, CircuitOpenError):
+            logger.warning(f"CIRCUITO ABIERTO en {method} {endpoint}")
+            return {
+                "success": False,
+                "error": {
+                    "message": (
+                        "Backend no disponible. "
+                        f"Reintentando en {exception.retry_in:.0f}s"
+                    ),
+                    "type": "circuit_open"
+                }
+            }
+        
+        elif isinstance(exception, requests.exceptions.Timeout):
             logger.warning(f"TIMEOUT en {method} {endpoint}")
             return {
                 "success": False,
@@ -236,7 +380,8 @@ class BaseAPIClient:
     def get(
         self,
         endpoint: str,
-        params: Optional[Dict] = None
+        params: Optional[Dict] = None,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """
         Realiza petición GET.
@@ -246,6 +391,7 @@ class BaseAPIClient:
         Args:
             endpoint: Ruta del endpoint (ej: "/pacientes")
             params: Parámetros query (ej: {"limit": 10, "offset": 0})
+            use_cache: False para forzar la lectura desde el Backend
             
         Returns:
             {
@@ -258,25 +404,133 @@ class BaseAPIClient:
             result = client.get("/pacientes", params={"limit": 50})
             if result["success"]:
                 pacientes = result["data"]
+        
+        Caché:
+            Solo se guardan respuestas exitosas, con el TTL del recurso
+            (ver Config.CACHE_TTL_POR_RECURSO) y el ETag del Backend.
+            Vencida la entrada, se revalida con `If-None-Match`: si no cambió,
+            el Backend responde 304 sin cuerpo y se reutiliza lo guardado.
         """
         self._validate_endpoint(endpoint)
         
+        ttl = ttl_para(endpoint) if use_cache else 0
+        key = api_cache.make_key(endpoint, params)
+        vencida = None
+        if ttl > 0:
+            encontrado, cacheado = api_cache.get(key)
+            if encontrado:
+                logger.debug(f"GET {endpoint} -> CACHE HIT")
+                client_metrics.record_cache_hit("GET", endpoint)
+                return cacheado
+            vencida = api_cache.revalidable(key)
+        
         try:
-            url = f"{self.base_url}{endpoint}"
             logger.debug(f"GET {endpoint} | Params: {params}")
             
-            response = self.session.get(
-                url,
+            response = self._send(
+                "GET", endpoint,
+                cache="miss" if ttl > 0 else "bypass",
                 params=params,
-                timeout=self.timeout
+                headers={"If-None-Match": vencida[0]} if vencida else None
             )
             
-            logger.debug(f"GET {endpoint} -> {response.status_code}")
-            return self._handle_response(response)
+            if vencida and response.status_code == 304:
+                # No cambió: misma respuesta, sin volver a bajar el cuerpo
+                api_cache.renovar(key, ttl)
+                return vencida[1]
+            
+            result = self._handle_response(response)
+            
+            if ttl > 0 and result.get("success"):
+                api_cache.set(key, result, ttl, etag=response.headers.get("ETag"))
+            return result
         
         except Exception as e:
             return self._handle_error(endpoint, "GET", e)
 
+    def get_many(
+        self,
+        requests_: Sequence[GetRequest],
+        max_workers: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Ejecuta varios GET en paralelo (hilos) y devuelve los resultados EN ORDEN.
+        
+        Uso típico: Una página que necesita varios recursos a la vez.
+        La espera total es la del GET más lento, no la suma de todos.
+        
+        Args:
+            requests_: Lista de endpoints o tuplas (endpoint, params)
+            max_workers: Hilos máximos (default: Config.API_MAX_WORKERS)
+            
+        Returns:
+            Lista de respuestas normalizadas (mismo formato que get()).
+            Un GET que falla no cancela a los demás: su posición trae
+            {"success": False, "error": {...}}.
+            
+        Ejemplo:
+            pacientes, marcas, servicios = client.get_many([
+                ("/pacientes", {"page": 1}),
+                "/marcas",
+                "/servicios",
+            ])
+        """
+        normalizadas = [self._normalize_request(r) for r in requests_]
+        if not normalizadas:
+            return []
+        
+        workers = min(max_workers or Config.API_MAX_WORKERS, len(normalizadas))
+        if workers <= 1:
+            return [self.get(endpoint, params) for endpoint, params in normalizadas]
+        
+        logger.debug(f"GET_MANY {len(normalizadas)} peticiones | {workers} hilos")
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # map() conserva el orden de entrada
+            return list(pool.map(lambda r: self.get(*r), normalizadas))
+
+    async def get_async(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None
+    ) -> Dict[str, Any]:
+        """
+        Versión awaitable de get() (corre en un hilo para no bloquear el event loop).
+        
+        Ejemplo:
+            result = await client.get_async("/pacientes")
+        """
+        return await asyncio.to_thread(self.get, endpoint, params)
+
+    async def get_many_async(
+        self,
+        requests_: Sequence[GetRequest],
+        max_workers: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Versión awaitable de get_many(): misma entrada, misma salida en orden.
+        
+        Ejemplo:
+            resultados = await client.get_many_async(["/marcas", "/servicios"])
+        """
+        limite = asyncio.Semaphore(max_workers or Config.API_MAX_WORKERS)
+        
+        async def _uno(endpoint: str, params: Optional[Dict]) -> Dict[str, Any]:
+            async with limite:
+                return await self.get_async(endpoint, params)
+        
+        return list(await asyncio.gather(
+            *[_uno(endpoint, params) for endpoint, params in
+              (self._normalize_request(r) for r in requests_)]
+        ))
+
+    @staticmethod
+    def _normalize_request(request: GetRequest) -> Tuple[str, Optional[Dict]]:
+        """Acepta "/endpoint" o ("/endpoint", params) y devuelve siempre la tupla."""
+        if isinstance(request, str):
+            return request, None
+        endpoint, params = request
+        return endpoint, params
+
     def post(self, endpoint: str, data: Dict) -> Dict[str, Any]:
         """
         Realiza petición POST.
@@ -309,17 +563,16 @@ class BaseAPIClient:
         self._validate_endpoint(endpoint)
         
         try:
-            url = f"{self.base_url}{endpoint}"
             logger.debug(f"POST {endpoint}")  # Sin data por seguridad
             
-            response = self.session.post(
-                url,
-                json=data,
-                timeout=self.timeout
-            )
+            response = self._send("POST", endpoint, json=data)
+            
+            result = self._handle_response(response)
             
-            logger.debug(f"POST {endpoint} -> {response.status_code}")
-            return self._handle_response(response)
+            # Escritura: las lecturas cacheadas del recurso quedaron viejas
+            if result.get("success"):
+                api_cache.invalidate_resource(endpoint)
+            return result
         
         except Exception as e:
             return self._handle_error(endpoint, "POST", e)
@@ -351,17 +604,16 @@ class BaseAPIClient:
         self._validate_endpoint(endpoint)
         
         try:
-            url = f"{self.base_url}{endpoint}"
             logger.debug(f"PUT {endpoint}")
             
-            response = self.session.put(
-                url,
-                json=data,
-                timeout=self.timeout
-            )
+            response = self._send("PUT", endpoint, json=data)
+            
+            result = self._handle_response(response)
             
-            logger.debug(f"PUT {endpoint} -> {response.status_code}")
-            return self._handle_response(response)
+            # Escritura: las lecturas cacheadas del recurso quedaron viejas
+            if result.get("success"):
+                api_cache.invalidate_resource(endpoint)
+            return result
         
         except Exception as e:
             return self._handle_error(endpoint, "PUT", e)
@@ -390,16 +642,16 @@ class BaseAPIClient:
         self._validate_endpoint(endpoint)
         
         try:
-            url = f"{self.base_url}{endpoint}"
             logger.debug(f"DELETE {endpoint}")
             
-            response = self.session.delete(
-                url,
-                timeout=self.timeout
-            )
+            response = self._send("DELETE", endpoint)
+            
+            result = self._handle_response(response)
             
-            logger.debug(f"DELETE {endpoint} -> {response.status_code}")
-            return self._handle_response(response)
+            # Escritura: las lecturas cacheadas del recurso quedaron viejas
+            if result.get("success"):
+                api_cache.invalidate_resource(endpoint)
+            return result
         
         except Exception as e:
             return self._handle_error(endpoint, "DELETE", e)
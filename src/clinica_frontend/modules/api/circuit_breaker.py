@@ -0,0 +1,110 @@
+# src/clinica_frontend/modules/api/circuit_breaker.py
+"""
+Circuit Breaker para las llamadas al Backend.
+
+Problema:
+- Con el Backend caído, CADA widget de Streamlit espera API_TIMEOUT
+  segundos antes de mostrar el error. Una página con 5 llamadas = 50s.
+
+Solución (3 estados):
+- CLOSED:    Normal. Se cuentan los fallos consecutivos.
+- OPEN:      Tras `failure_threshold` fallos seguidos, se rechaza al
+             instante durante `reset_timeout` segundos (sin tocar la red).
+- HALF_OPEN: Pasado ese tiempo se deja pasar UNA llamada de prueba:
+             si funciona → CLOSED; si falla → OPEN otra vez.
+
+Autor: MediStock Team
+Versión: 1.0
+"""
+
+import threading
+import time
+from typing import Any, Dict
+
+
+class CircuitOpenError(Exception):
+    """Se lanza cuando el circuito está abierto y la llamada no se intenta."""
+
+    def __init__(self, retry_in: float):
+        self.retry_in = retry_in
+        super().__init__(f"Circuito abierto, reintento en {retry_in:.0f}s")
+
+
+class CircuitBreaker:
+    """
+    Breaker thread-safe compartido por todos los clientes del proceso.
+
+    Uso:
+        breaker.before_call()        # Lanza CircuitOpenError si está abierto
+        try:
+            ... llamada ...
+            breaker.record_success()
+        except ...:
+            breaker.record_failure()
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        # Llamar con el lock tomado
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def before_call(self) -> None:
+        """
+        Raises:
+            CircuitOpenError: Si la llamada debe rechazarse sin intentarse
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return
+            if state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+            raise CircuitOpenError(retry_in)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    def release(self) -> None:
+        """La llamada falló por causas del cliente: no dice nada del Backend."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self._current_state(),
+                "consecutive_failures": self._failures
+            }
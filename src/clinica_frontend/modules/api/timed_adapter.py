@@ -0,0 +1,75 @@
+# src/clinica_frontend/modules/api/timed_adapter.py
+"""
+HTTPAdapter que mide el tiempo de conexión (DNS + TCP + TLS).
+
+requests solo expone `response.elapsed` (todo junto). Para separar
+"la red tardó en conectar" de "el Backend tardó en responder" reemplazamos
+la clase de conexión de urllib3 por una que cronometra `connect()`.
+
+Con Keep-Alive la mayoría de peticiones REUTILIZAN una conexión abierta:
+su tiempo de conexión es 0 (y eso es justamente lo que queremos ver).
+
+El tiempo se acumula en una variable por hilo: get_many() corre varias
+peticiones en paralelo y cada hilo lee solo el suyo.
+
+Autor: MediStock Team
+Versión: 1.0
+"""
+
+import threading
+import time
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+_local = threading.local()
+
+
+def reset_connect_time() -> None:
+    """Pone en cero el acumulado del hilo actual (antes de cada petición)."""
+    _local.connect_s = 0.0
+
+
+def pop_connect_time() -> float:
+    """Devuelve y limpia los segundos gastados conectando en el hilo actual."""
+    valor = getattr(_local, "connect_s", 0.0)
+    _local.connect_s = 0.0
+    return valor
+
+
+class _ConnectTimerMixin:
+    def connect(self):
+        inicio = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            # Se acumula: un reintento puede abrir más de una conexión
+            _local.connect_s = getattr(_local, "connect_s", 0.0) + (time.perf_counter() - inicio)
+
+
+class TimedHTTPConnection(_ConnectTimerMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_ConnectTimerMixin, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """Igual que HTTPAdapter (pool, reintentos), con conexiones cronometradas."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
@@ -0,0 +1,200 @@
+# src/clinica_frontend/modules/utils/cache_manager.py
+"""
+Caché de lecturas de la API (TTL + LRU).
+
+Problema:
+- Streamlit re-ejecuta el script completo en cada interacción.
+- Cada rerun volvía a pedir /pacientes, /productos... al Backend.
+
+Solución:
+- BaseAPIClient.get consulta primero este caché.
+- Cada entrada vive según el TTL de su recurso (Config.CACHE_TTL_*).
+- Tamaño acotado (Config.CACHE_MAX_ENTRIES): al llenarse se descarta
+  la entrada usada hace más tiempo (LRU).
+- post/put/delete invalidan las entradas del mismo recurso
+  (y de los recursos que dependen de él, ver Config.CACHE_DEPENDENCIAS).
+- Si el Backend mandó un ETag, la entrada vencida NO se borra: el próximo GET
+  la revalida con `If-None-Match` y un 304 (sin cuerpo) la renueva.
+
+Alcance:
+- `api_cache` es una instancia a nivel de módulo: la comparten TODAS las
+  sesiones de Streamlit del mismo proceso (un módulo se importa una vez).
+- Por eso guarda y entrega COPIAS (deepcopy): si una página modifica la
+  respuesta que recibió, no ensucia lo que verán las demás.
+
+Autor: MediStock Team
+Versión: 1.0
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from clinica_frontend.config import Config
+
+
+def recurso_de(endpoint: str) -> str:
+    """
+    Recurso raíz de un endpoint.
+
+    Ejemplos:
+        "/pacientes"              -> "/pacientes"
+        "/pacientes/12/consultas" -> "/pacientes"
+        "/kardex/5/rango"         -> "/kardex"
+    """
+    return "/" + endpoint.strip("/").split("/", 1)[0]
+
+
+def ttl_para(endpoint: str) -> int:
+    """TTL (segundos) configurado para el recurso del endpoint. 0 = no cachear."""
+    return Config.CACHE_TTL_POR_RECURSO.get(
+        recurso_de(endpoint),
+        Config.CACHE_TTL_DEFAULT
+    )
+
+
+class CacheManager:
+    """
+    Caché en memoria con expiración (TTL) y desalojo LRU.
+
+    Thread-safe: Streamlit atiende cada sesión en su propio hilo.
+
+    Uso:
+        encontrado, valor = api_cache.get(clave)
+        api_cache.set(clave, valor, ttl=60)
+        api_cache.invalidate_resource("/pacientes")
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        # clave -> (expira, valor, etag)
+        self._datos: "OrderedDict[Tuple, Tuple[float, Any, Optional[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[Dict] = None) -> Tuple:
+        """Clave estable: mismo endpoint + mismos params (en cualquier orden)."""
+        return (endpoint, tuple(sorted((k, str(v)) for k, v in (params or {}).items())))
+
+    def get(self, key: Tuple) -> Tuple[bool, Any]:
+        """
+        Returns:
+            (True, valor) si hay entrada vigente, (False, None) si no.
+        """
+        with self._lock:
+            entrada = self._datos.get(key)
+            if entrada is None:
+                self._misses += 1
+                return False, None
+
+            expira, valor, etag = entrada
+            if expira < time.monotonic():
+                if etag is None:
+                    del self._datos[key]  # Con ETag se conserva para revalidar
+                self._misses += 1
+                return False, None
+
+            # Usada recién: pasa al final de la cola LRU
+            self._datos.move_to_end(key)
+            self._hits += 1
+        return True, copy.deepcopy(valor)
+
+    def revalidable(self, key: Tuple) -> Optional[Tuple[str, Any]]:
+        """
+        (etag, valor) de una entrada guardada con ETag (vigente o no), o None.
+        Se llama después de un miss de `get()`.
+        """
+        with self._lock:
+            entrada = self._datos.get(key)
+            if entrada is None or entrada[2] is None:
+                return None
+            etag, valor = entrada[2], entrada[1]
+        return etag, copy.deepcopy(valor)
+
+    def renovar(self, key: Tuple, ttl: int) -> bool:
+        """El Backend respondió 304: la entrada vuelve a estar vigente por `ttl`."""
+        with self._lock:
+            entrada = self._datos.get(key)
+            if entrada is None:
+                return False
+            self._datos[key] = (time.monotonic() + ttl, entrada[1], entrada[2])
+            self._datos.move_to_end(key)
+            return True
+
+    def set(self, key: Tuple, value: Any, ttl: int, etag: Optional[str] = None) -> None:
+        if ttl <= 0:
+            return
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._datos[key] = (time.monotonic() + ttl, value, etag)
+            self._datos.move_to_end(key)
+            while len(self._datos) > self.max_entries:
+                self._datos.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate_resource(self, endpoint: str) -> int:
+        """
+        Borra las entradas del recurso de `endpoint` y de sus dependientes.
+
+        Returns:
+            Cantidad de entradas eliminadas
+        """
+        raiz = recurso_de(endpoint)
+        afectados = {raiz, *Config.CACHE_DEPENDENCIAS.get(raiz, ())}
+
+        with self._lock:
+            claves = [k for k in self._datos if recurso_de(k[0]) in afectados]
+            for clave in claves:
+                del self._datos[clave]
+        return len(claves)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._datos.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores del proceso (para el panel de debug)."""
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "entries": len(self._datos),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_ratio": round(self._hits / total, 4) if total else None
+            }
+
+
+# ═══════════════════════════════════════════════════════════
+# INSTANCIA COMPARTIDA (una por proceso)
+# ═══════════════════════════════════════════════════════════
+
+api_cache = CacheManager(max_entries=Config.CACHE_MAX_ENTRIES)
+
+
+def render_cache_debug() -> None:
+    """
+    Muestra los contadores del caché en el sidebar (solo con DEBUG_MODE).
+
+    Uso en una página:
+        from clinica_frontend.modules.utils.cache_manager import render_cache_debug
+        render_cache_debug()
+    """
+    if not Config.DEBUG_MODE:
+        return
+
+    import streamlit as st
+
+    stats = api_cache.stats()
+    with st.sidebar.expander("🗄️ Caché API"):
+        ratio = stats["hit_ratio"]
+        st.metric("Hit ratio", f"{ratio:.0%}" if ratio is not None else "—")
+        st.json(stats)
+        if st.button("Vaciar caché"):
+            api_cache.clear()
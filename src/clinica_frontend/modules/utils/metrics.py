@@ -0,0 +1,216 @@
+# src/clinica_frontend/modules/utils/metrics.py
+"""
+Métricas de latencia del cliente HTTP.
+
+Cada petición de BaseAPIClient registra:
+- connect: DNS + TCP + TLS (0 si reutilizó una conexión Keep-Alive)
+- ttfb:    desde conexión lista hasta recibir los headers (= tiempo del Backend)
+- body:    lectura del cuerpo (tamaño del payload / red)
+- total:   todo lo anterior
++ bytes recibidos, status y estado del caché (miss / bypass).
+
+Los aciertos del caché local NO son peticiones: se cuentan aparte con
+`record_cache_hit()` y no entran en los percentiles ni en los errores.
+
+Se agregan por (método, endpoint) con los IDs normalizados
+("/pacientes/12" -> "/pacientes/{id}") para que la cardinalidad no explote.
+
+Salidas:
+- client_metrics.summary()      → dict con p50/p95/p99 (uso en código)
+- client_metrics.prometheus()   → texto en formato de exposición Prometheus
+- render_metrics_debug()        → panel en el sidebar (solo DEBUG_MODE)
+
+Autor: MediStock Team
+Versión: 1.0
+"""
+
+import re
+import threading
+from collections import defaultdict, deque
+from typing import Any, Dict, List, Optional
+
+from clinica_frontend.config import Config
+
+PHASES = ("connect", "ttfb", "body", "total")
+QUANTILES = (0.5, 0.95, 0.99)
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_template(endpoint: str) -> str:
+    """'/kardex/5/rango' -> '/kardex/{id}/rango'"""
+    return _ID_SEGMENT.sub("/{id}", endpoint)
+
+
+def _percentile(ordenados: List[float], q: float) -> float:
+    """Percentil por rango más cercano (suficiente para monitoreo)."""
+    if not ordenados:
+        return 0.0
+    indice = min(len(ordenados) - 1, max(0, int(round(q * len(ordenados))) - 1))
+    return ordenados[indice]
+
+
+class _EndpointStats:
+    """Ventana deslizante de muestras por fase + contadores acumulados."""
+
+    def __init__(self, window: int):
+        self.samples = {fase: deque(maxlen=window) for fase in PHASES}
+        self.sums = dict.fromkeys(PHASES, 0.0)
+        self.count = 0
+        self.bytes = 0
+        self.status = defaultdict(int)
+        self.cache = defaultdict(int)
+
+
+class ClientMetrics:
+    """
+    Registro thread-safe compartido por el proceso.
+
+    Uso:
+        client_metrics.record("GET", "/pacientes", status=200,
+                              connect=0.0, ttfb=0.120, body=0.004,
+                              size=5120, cache="miss")
+    """
+
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self._stats: Dict[tuple, _EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    def _stats_de(self, method: str, endpoint: str) -> _EndpointStats:
+        """Stats del endpoint (se crean al primer uso). Llamar con el lock tomado."""
+        clave = (method, endpoint_template(endpoint))
+        stats = self._stats.get(clave)
+        if stats is None:
+            stats = self._stats[clave] = _EndpointStats(self.window)
+        return stats
+
+    def record(
+        self,
+        method: str,
+        endpoint: str,
+        status: Any,
+        connect: float = 0.0,
+        ttfb: float = 0.0,
+        body: float = 0.0,
+        size: int = 0,
+        cache: str = "bypass"
+    ) -> None:
+        valores = {
+            "connect": connect,
+            "ttfb": ttfb,
+            "body": body,
+            "total": connect + ttfb + body,
+        }
+        with self._lock:
+            stats = self._stats_de(method, endpoint)
+            for fase, valor in valores.items():
+                stats.samples[fase].append(valor)
+                stats.sums[fase] += valor
+            stats.count += 1
+            stats.bytes += size
+            stats.status[str(status)] += 1
+            stats.cache[cache] += 1
+
+    def record_cache_hit(self, method: str, endpoint: str) -> None:
+        """Respuesta servida por el caché local: solo suma al contador de hits."""
+        with self._lock:
+            self._stats_de(method, endpoint).cache["hit"] += 1
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Una fila por endpoint con percentiles en milisegundos."""
+        filas = []
+        with self._lock:
+            for (method, endpoint), stats in sorted(self._stats.items()):
+                fila = {
+                    "method": method,
+                    "endpoint": endpoint,
+                    "requests": stats.count,
+                    "bytes": stats.bytes,
+                    "cache_hits": stats.cache.get("hit", 0),
+                    "errors": sum(n for s, n in stats.status.items() if not s.startswith(("2", "3"))),
+                }
+                for fase in PHASES:
+                    ordenados = sorted(stats.samples[fase])
+                    for q in QUANTILES:
+                        fila[f"{fase}_p{int(q * 100)}_ms"] = round(_percentile(ordenados, q) * 1000, 1)
+                filas.append(fila)
+        return filas
+
+    def prometheus(self, prefix: str = "medistock_client") -> str:
+        """Formato de texto de Prometheus (summary con cuantiles por fase)."""
+        lineas = [
+            f"# HELP {prefix}_request_seconds Latencia de peticiones al Backend por fase.",
+            f"# TYPE {prefix}_request_seconds summary",
+        ]
+        bytes_, cache, respuestas = [], [], []
+        with self._lock:
+            for (method, endpoint), stats in sorted(self._stats.items()):
+                base = f'method="{method}",endpoint="{endpoint}"'
+                for fase in PHASES:
+                    ordenados = sorted(stats.samples[fase])
+                    etiquetas = f'{base},phase="{fase}"'
+                    for q in QUANTILES:
+                        lineas.append(
+                            f'{prefix}_request_seconds{{{etiquetas},quantile="{q}"}} '
+                            f'{_percentile(ordenados, q):.6f}'
+                        )
+                    lineas.append(f"{prefix}_request_seconds_sum{{{etiquetas}}} {stats.sums[fase]:.6f}")
+                    lineas.append(f"{prefix}_request_seconds_count{{{etiquetas}}} {stats.count}")
+                bytes_.append(f"{prefix}_response_bytes_total{{{base}}} {stats.bytes}")
+                for estado, n in sorted(stats.cache.items()):
+                    cache.append(f'{prefix}_cache_total{{{base},result="{estado}"}} {n}')
+                for status, n in sorted(stats.status.items()):
+                    respuestas.append(f'{prefix}_responses_total{{{base},status="{status}"}} {n}')
+
+        # Cada familia de métricas va en un bloque contiguo (lo exige el formato)
+        lineas += [
+            f"# HELP {prefix}_response_bytes_total Bytes recibidos del Backend.",
+            f"# TYPE {prefix}_response_bytes_total counter",
+            *bytes_,
+            f"# HELP {prefix}_cache_total Lecturas por resultado del caché local.",
+            f"# TYPE {prefix}_cache_total counter",
+            *cache,
+            f"# HELP {prefix}_responses_total Respuestas por código HTTP.",
+            f"# TYPE {prefix}_responses_total counter",
+            *respuestas,
+        ]
+        return "\n".join(lineas) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+# ═══════════════════════════════════════════════════════════
+# INSTANCIA COMPARTIDA (una por proceso)
+# ═══════════════════════════════════════════════════════════
+
+client_metrics = ClientMetrics(window=Config.METRICS_WINDOW)
+
+
+def render_metrics_debug(title: Optional[str] = "⏱️ Latencia API") -> None:
+    """
+    Panel de latencias en el sidebar (solo con DEBUG_MODE).
+
+    Responde "¿la página lenta es culpa del Backend (ttfb), de la red
+    (connect/body) o del render (nada de lo anterior)?".
+    """
+    if not Config.DEBUG_MODE:
+        return
+
+    import pandas as pd
+    import streamlit as st
+
+    filas = client_metrics.summary()
+    with st.sidebar.expander(title):
+        if not filas:
+            st.caption("Sin peticiones registradas todavía.")
+            return
+        st.dataframe(pd.DataFrame(filas).set_index(["method", "endpoint"]))
+        st.download_button(
+            "Exportar (Prometheus)",
+            client_metrics.prometheus(),
+            file_name="medistock_client_metrics.prom",
+            mime="text/plain"
+        )
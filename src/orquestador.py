@@ -98,7 +98,10 @@ if __name__ == "__main__":
         RUTA_MIGRACIONES / '001_stock_ledger_trigger.sql',
         RUTA_MIGRACIONES / '002_stock_ledger_sync.sql',
         RUTA_MIGRACIONES / '003_sp_register_entrada.sql', 
-        RUTA_MIGRACIONES / '004_backfill_historical_data.sql'
+        RUTA_MIGRACIONES / '004_backfill_historical_data.sql',
+        RUTA_MIGRACIONES / '005_stock_snapshots.sql',
+        RUTA_MIGRACIONES / '006_consultas_listado_indices.sql',
+        RUTA_MIGRACIONES / '007_stats_materialized_views.sql'
     ]
 
     print("--- ⚔️ INICIANDO RITUAL DE MIGRACIÓN DEL TEMPLO DE DATOS ⚔️ ---")
@@ -0,0 +1,141 @@
+-- ======================================================================
+-- MIGRACIÓN 005: FOTOGRAFÍAS DEL LIBRO MAYOR (SNAPSHOTS DE STOCK)
+-- Misión: Que el Kardex y el Trigger de sincronización NO tengan que
+--         recorrer toda la historia de 'movimientos_stock' cada vez.
+--         Saldo = Último Snapshot + Movimientos posteriores al Snapshot.
+-- ======================================================================
+
+BEGIN;
+
+-- PASO 1: LA TABLA 'snapshots_stock'
+-- El límite del snapshot es 'id_ultimo_movimiento' (NO la fecha):
+-- el backfill (004) insertó movimientos con fechas históricas, así que
+-- solo el ID garantiza que ningún movimiento se cuente dos veces o se pierda.
+CREATE TABLE IF NOT EXISTS snapshots_stock (
+    id_snapshot SERIAL PRIMARY KEY,
+    id_producto INTEGER NOT NULL REFERENCES productos_catalogo(id_producto),
+    fecha_corte TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    id_ultimo_movimiento INTEGER NOT NULL,
+    saldo NUMERIC(12,2) NOT NULL,
+    UNIQUE (id_producto, id_ultimo_movimiento)
+);
+
+-- PASO 2: LOS ÍNDICES DEL KARDEX
+-- "Último snapshot del producto" y "movimientos posteriores al snapshot"
+-- se resuelven con un Index Scan en lugar de un Seq Scan de toda la historia.
+CREATE INDEX IF NOT EXISTS ix_snapshots_producto_ultimo
+    ON snapshots_stock (id_producto, id_ultimo_movimiento DESC);
+CREATE INDEX IF NOT EXISTS ix_movimientos_producto_id
+    ON movimientos_stock (id_producto, id_movimiento);
+CREATE INDEX IF NOT EXISTS ix_movimientos_producto_fecha
+    ON movimientos_stock (id_producto, fecha_movimiento DESC, id_movimiento DESC);
+
+-- PASO 3: LA FUNCIÓN 'sp_generar_snapshots_stock' (El Trabajo Programado)
+-- Genera un snapshot SOLO para los productos que tuvieron movimientos
+-- desde su último snapshot. Devuelve cuántos snapshots se crearon.
+CREATE OR REPLACE FUNCTION sp_generar_snapshots_stock()
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $BODY$
+DECLARE
+    filas_creadas INTEGER;
+BEGIN
+    -- SHARE MODE espera a que terminen los INSERT en curso y bloquea los nuevos
+    -- mientras dura la foto: así ningún movimiento con ID menor al límite
+    -- puede confirmarse DESPUÉS de que el snapshot lo haya "saltado".
+    LOCK TABLE movimientos_stock IN SHARE MODE;
+
+    WITH ultimo AS (
+        SELECT DISTINCT ON (id_producto)
+            id_producto,
+            saldo,
+            id_ultimo_movimiento
+        FROM snapshots_stock
+        ORDER BY id_producto, id_ultimo_movimiento DESC
+    ),
+    delta AS (
+        SELECT
+            m.id_producto,
+            MAX(m.id_movimiento) AS id_ultimo_movimiento,
+            SUM(
+                CASE
+                    WHEN m.tipo_movimiento = 'ENTRADA' THEN m.cantidad
+                    ELSE -m.cantidad
+                END
+            ) AS delta
+        FROM movimientos_stock m
+        LEFT JOIN ultimo u ON u.id_producto = m.id_producto
+        WHERE m.id_movimiento > COALESCE(u.id_ultimo_movimiento, 0)
+        GROUP BY m.id_producto
+    )
+    INSERT INTO snapshots_stock (id_producto, id_ultimo_movimiento, saldo)
+    SELECT
+        d.id_producto,
+        d.id_ultimo_movimiento,
+        COALESCE(u.saldo, 0) + d.delta
+    FROM delta d
+    LEFT JOIN ultimo u ON u.id_producto = d.id_producto
+    ON CONFLICT (id_producto, id_ultimo_movimiento) DO NOTHING;
+
+    GET DIAGNOSTICS filas_creadas = ROW_COUNT;
+    RETURN filas_creadas;
+END;
+$BODY$;
+
+-- PASO 4: EL SINCRONIZADOR, AHORA COMPACTADO
+-- Reemplaza la versión de la migración 002: en lugar de SUM() sobre TODA
+-- la historia del producto, parte del último snapshot y suma solo el resto.
+CREATE OR REPLACE FUNCTION sincronizar_stock_actual()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $BODY$
+DECLARE
+    producto_id INT;
+    saldo_base NUMERIC;
+    id_base INT;
+BEGIN
+    -- Determinar qué producto fue afectado
+    IF TG_OP = 'DELETE' THEN
+        producto_id := OLD.id_producto;
+    ELSE
+        producto_id := NEW.id_producto;
+    END IF;
+
+    -- Si alguien reescribe historia ya compactada (UPDATE/DELETE de un
+    -- movimiento cubierto por un snapshot), esos snapshots dejan de ser verdad.
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        DELETE FROM snapshots_stock
+        WHERE id_producto = OLD.id_producto
+          AND id_ultimo_movimiento >= OLD.id_movimiento;
+    END IF;
+
+    SELECT saldo, id_ultimo_movimiento
+    INTO saldo_base, id_base
+    FROM snapshots_stock
+    WHERE id_producto = producto_id
+    ORDER BY id_ultimo_movimiento DESC
+    LIMIT 1;
+
+    UPDATE productos_catalogo
+    SET stock_actual = COALESCE(saldo_base, 0) + (
+        SELECT COALESCE(SUM(
+            CASE
+                WHEN tipo_movimiento = 'ENTRADA' THEN cantidad
+                ELSE -cantidad
+            END
+        ), 0)
+        FROM movimientos_stock
+        WHERE id_producto = producto_id
+          AND id_movimiento > COALESCE(id_base, 0)
+    )
+    WHERE id_producto = producto_id;
+
+    RETURN NULL; -- Para triggers AFTER ROW que no modifican la fila, NULL está bien.
+END;
+$BODY$;
+
+-- PASO 5: LA PRIMERA FOTO
+-- Compactamos la historia existente para que el beneficio sea inmediato.
+SELECT sp_generar_snapshots_stock();
+
+COMMIT;
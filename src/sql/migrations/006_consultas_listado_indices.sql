@@ -0,0 +1,18 @@
+-- ======================================================================
+-- MIGRACIÓN 006: ÍNDICES PARA LOS LISTADOS DE CONSULTAS
+-- Misión: Que GET /consultas y GET /pacientes/<id>/consultas paginen por
+--         cursor (fecha_consulta, id_consulta) con un Index Scan.
+-- ======================================================================
+
+BEGIN;
+
+-- Listado general: WHERE (fecha, id) < (...) ORDER BY fecha DESC, id DESC LIMIT n
+CREATE INDEX IF NOT EXISTS ix_consultas_fecha_id
+    ON consultas (fecha_consulta DESC, id_consulta DESC);
+
+-- Historia del paciente: mismo orden, acotado a un paciente
+-- (también alimenta las funciones de ventana de numero_visita / gasto_acumulado)
+CREATE INDEX IF NOT EXISTS ix_consultas_paciente_fecha_id
+    ON consultas (id_paciente, fecha_consulta DESC, id_consulta DESC);
+
+COMMIT;
@@ -0,0 +1,171 @@
+-- ======================================================================
+-- MIGRACIÓN 007: VISTAS MATERIALIZADAS PARA EL DASHBOARD (/api/v1/stats)
+-- Misión: Que los agregados del notebook (ingresos por procedimiento,
+--         edad promedio por sexo, pacientes por distrito) se lean de una
+--         tabla pequeña ya calculada, no de un Seq Scan de toda la historia.
+--
+-- Refresco: `sp_refrescar_estadisticas()` (flask --app run stats refrescar)
+--   - REFRESH ... CONCURRENTLY: el dashboard sigue leyendo mientras se recalcula
+--     (requiere un índice UNIQUE sobre columnas simples en cada vista).
+--   - "Incremental" a nivel de vista: solo se refresca si sus tablas fuente
+--     cambiaron (huella de pg_stat_user_tables) o si pasó `p_max_edad`.
+--     PostgreSQL no tiene mantenimiento incremental nativo de vistas materializadas.
+-- ======================================================================
+
+BEGIN;
+
+-- PASO 1: INGRESOS POR PROCEDIMIENTO Y MES
+-- Un mes por fila: el endpoint filtra por rango de meses y suma (pocas filas).
+-- Los productos se agregan por línea ANTES del JOIN para no duplicar el precio del servicio.
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_ingresos_servicio_mes AS
+WITH productos AS (
+    SELECT id_consulta_servicio, SUM(importe_venta) AS importe_productos
+    FROM consumo_productos
+    GROUP BY id_consulta_servicio
+)
+SELECT
+    date_trunc('month', c.fecha_consulta)::date AS mes,
+    s.id_servicio,
+    s.nombre_servicio,
+    COUNT(*) AS aplicaciones,
+    COALESCE(SUM(cs.precio_servicio), 0) AS ingreso_servicio,
+    COALESCE(SUM(p.importe_productos), 0) AS ingreso_productos
+FROM consultas_servicios cs
+JOIN consultas c ON c.id_consulta = cs.id_consulta
+JOIN servicios_catalogo s ON s.id_servicio = cs.id_servicio
+LEFT JOIN productos p ON p.id_consulta_servicio = cs.id_consulta_servicio
+GROUP BY 1, s.id_servicio, s.nombre_servicio
+WITH DATA;
+
+CREATE UNIQUE INDEX IF NOT EXISTS ux_mv_ingresos_servicio_mes
+    ON mv_ingresos_servicio_mes (mes, id_servicio);
+
+-- PASO 2: EDAD POR SEXO
+-- Misma regla de edad que Paciente.edad (app/models/paciente.py: edad_sql),
+-- evaluada con el CURRENT_DATE del último refresco.
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_edad_por_sexo AS
+WITH edades AS (
+    SELECT
+        COALESCE(NULLIF(sexo, ''), 'SIN_DATO') AS sexo,
+        CASE
+            WHEN COALESCE(nacimiento_year, 0) = 0 THEN NULL
+            ELSE EXTRACT(YEAR FROM CURRENT_DATE)::INT - nacimiento_year
+                 - CASE
+                       WHEN COALESCE(nacimiento_month, 0) <> 0
+                        AND COALESCE(nacimiento_day, 0) <> 0
+                        AND (EXTRACT(MONTH FROM CURRENT_DATE), EXTRACT(DAY FROM CURRENT_DATE))
+                            < (nacimiento_month, nacimiento_day)
+                       THEN 1 ELSE 0
+                   END
+        END AS edad
+    FROM pacientes
+)
+SELECT
+    sexo,
+    COUNT(*) AS pacientes,
+    COUNT(edad) AS pacientes_con_edad,
+    ROUND(AVG(edad), 1) AS edad_promedio,
+    MIN(edad) AS edad_min,
+    MAX(edad) AS edad_max
+FROM edades
+GROUP BY sexo
+WITH DATA;
+
+CREATE UNIQUE INDEX IF NOT EXISTS ux_mv_edad_por_sexo
+    ON mv_edad_por_sexo (sexo);
+
+-- PASO 3: PACIENTES POR DISTRITO
+-- id_distrito = 0 agrupa a los pacientes sin distrito (el índice UNIQUE no admite NULL repetidos)
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_pacientes_por_distrito AS
+SELECT
+    COALESCE(p.id_distrito, 0) AS id_distrito,
+    COALESCE(d.nombre_distrito, 'SIN DISTRITO') AS nombre_distrito,
+    COUNT(*) AS pacientes
+FROM pacientes p
+LEFT JOIN distritos d ON d.id_distrito = p.id_distrito
+GROUP BY 1, 2
+WITH DATA;
+
+CREATE UNIQUE INDEX IF NOT EXISTS ux_mv_pacientes_por_distrito
+    ON mv_pacientes_por_distrito (id_distrito);
+
+-- PASO 4: LA BITÁCORA DE REFRESCOS
+CREATE TABLE IF NOT EXISTS stats_refrescos (
+    nombre_vista TEXT PRIMARY KEY,
+    huella TEXT,
+    refrescada_en TIMESTAMPTZ NOT NULL,
+    ms_ultimo_refresco NUMERIC(12,2)
+);
+
+-- PASO 5: LA HUELLA DE LAS TABLAS FUENTE
+-- Contadores acumulados de filas insertadas/actualizadas/borradas: si no
+-- cambiaron, la vista sigue vigente. Leerlos no toca las tablas.
+-- (Se publican con ~1 s de retraso; `p_max_edad` cubre ese borde.)
+CREATE OR REPLACE FUNCTION fn_huella_tablas(p_tablas TEXT[])
+RETURNS TEXT
+LANGUAGE sql
+STABLE
+AS $BODY$
+    SELECT string_agg(relname || ':' || (n_tup_ins + n_tup_upd + n_tup_del), ',' ORDER BY relname)
+    FROM pg_stat_user_tables
+    WHERE relname = ANY (p_tablas);
+$BODY$;
+
+-- PASO 6: LA FUNCIÓN 'sp_refrescar_estadisticas' (El Trabajo Programado)
+-- Devuelve una fila por vista: si se refrescó y cuánto tardó.
+CREATE OR REPLACE FUNCTION sp_refrescar_estadisticas(
+    p_forzar BOOLEAN DEFAULT FALSE,
+    p_max_edad INTERVAL DEFAULT INTERVAL '1 day'
+)
+RETURNS TABLE (vista TEXT, refrescada BOOLEAN, duracion_ms NUMERIC)
+LANGUAGE plpgsql
+AS $BODY$
+DECLARE
+    v RECORD;
+    v_huella TEXT;
+    v_previa RECORD;
+    v_inicio TIMESTAMPTZ;
+BEGIN
+    FOR v IN
+        SELECT * FROM (VALUES
+            ('mv_ingresos_servicio_mes',
+             ARRAY['consultas', 'consultas_servicios', 'consumo_productos', 'servicios_catalogo']),
+            ('mv_edad_por_sexo', ARRAY['pacientes']),
+            ('mv_pacientes_por_distrito', ARRAY['pacientes', 'distritos'])
+        ) AS t(nombre, tablas)
+    LOOP
+        v_huella := fn_huella_tablas(v.tablas);
+
+        SELECT * INTO v_previa FROM stats_refrescos WHERE nombre_vista = v.nombre;
+
+        vista := v.nombre;
+        IF NOT p_forzar
+           AND FOUND
+           AND v_previa.huella IS NOT DISTINCT FROM v_huella
+           AND v_previa.refrescada_en > NOW() - p_max_edad
+        THEN
+            refrescada := FALSE;
+            duracion_ms := NULL;
+            RETURN NEXT;
+            CONTINUE;
+        END IF;
+
+        v_inicio := clock_timestamp();
+        EXECUTE format('REFRESH MATERIALIZED VIEW CONCURRENTLY %I', v.nombre);
+
+        refrescada := TRUE;
+        duracion_ms := ROUND((EXTRACT(EPOCH FROM clock_timestamp() - v_inicio) * 1000)::NUMERIC, 2);
+
+        INSERT INTO stats_refrescos (nombre_vista, huella, refrescada_en, ms_ultimo_refresco)
+        VALUES (v.nombre, v_huella, NOW(), duracion_ms)
+        ON CONFLICT (nombre_vista) DO UPDATE
+            SET huella = EXCLUDED.huella,
+                refrescada_en = EXCLUDED.refrescada_en,
+                ms_ultimo_refresco = EXCLUDED.ms_ultimo_refresco;
+
+        RETURN NEXT;
+    END LOOP;
+END;
+$BODY$;
+
+COMMIT;